@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Headless benchmark of GUI event-loop latency under a flood of progress events.
+
+Runs on a real Tcl event loop (tkinter.Tcl(), no display needed) and compares
+the previous approach, one `root.after(0, ...)` plus `update idletasks` per
+progress event, with the ProgressPoller draining a queue every 50 ms.
+Latency is measured with a 10 ms timer probe: how late it fires is how long
+a click or redraw would wait in the event queue.
+"""
+
+import statistics
+import sys
+import threading
+import time
+import tkinter as tk
+
+from view.progress_poller import ProgressPoller
+
+DURATION = 3.0 # Seconds per run
+JOBS = 8
+EVENTS_PER_SECOND = 2000 # Across all jobs
+PROBE_MS = 10
+REDRAW_COST_MS = 0.4 # Simulated widget redraw; the legacy path forced one per event
+
+
+def redraw():
+    """Busy-waits REDRAW_COST_MS, standing in for Tk redrawing a progress bar."""
+    deadline = time.perf_counter() + REDRAW_COST_MS / 1000
+    while time.perf_counter() < deadline:
+        pass
+
+
+def apply_progress(root, job, value):
+    """Stand-in for YouTubeDownloaderGUI.update_progress."""
+    root.tk.call("set", f"progress{job}", value)
+
+
+def apply_progress_legacy(root, job, value):
+    """Previous update_progress, which forced a redraw for every event."""
+    apply_progress(root, job, value)
+    root.tk.call("update", "idletasks")
+    redraw()
+
+
+def produce(push, stop):
+    """Emits progress events for JOBS jobs at EVENTS_PER_SECOND."""
+    interval = JOBS / EVENTS_PER_SECOND
+    sent = 0
+    next_time = time.perf_counter()
+    while not stop.is_set():
+        for job in range(JOBS):
+            push(job, sent)
+            sent += 1
+        next_time += interval
+        delay = next_time - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    return sent
+
+
+def run(mode):
+    """
+    Runs one mode on a fresh Tcl interpreter.
+    :return: (probe delays in ms, events pushed, callbacks executed)
+    """
+    root = tk.Tcl()
+    stop = threading.Event()
+    delays = []
+    counters = {"sent": 0, "applied": 0}
+
+    def counted(apply):
+        def wrapper(*args):
+            counters["applied"] += 1
+            apply(*args)
+        return wrapper
+
+    if mode == "poller":
+        poller = ProgressPoller(root)
+        poller.start()
+        drain = poller.drain
+
+        def drain_and_redraw():
+            # The idle loop redraws once for the whole batch
+            applied = drain()
+            if applied:
+                redraw()
+            return applied
+
+        poller.drain = drain_and_redraw
+        apply = counted(apply_progress)
+        push = lambda job, value: poller.push(job, apply, root, job, value)
+    else:
+        apply = counted(apply_progress_legacy)
+        push = lambda job, value: root.after(0, apply, root, job, value)
+
+    def producer():
+        counters["sent"] = produce(push, stop)
+
+    def probe(scheduled):
+        delays.append((time.perf_counter() - scheduled) * 1000 - PROBE_MS)
+        if stop.is_set():
+            root.quit()
+            return
+        root.after(PROBE_MS, probe, time.perf_counter())
+
+    def finish():
+        stop.set()
+
+    thread = threading.Thread(target=producer, daemon=True)
+    root.after(0, thread.start)
+    root.after(PROBE_MS, probe, time.perf_counter())
+    root.after(int(DURATION * 1000), finish)
+    # Tcl without Tk has no windows; a negative threshold keeps the loop running until quit()
+    root.mainloop(-1)
+    thread.join(timeout=5)
+    return delays, counters["sent"], counters["applied"]
+
+
+def main():
+    """Run the benchmark for both modes."""
+    print("GUI Progress Event-Loop Benchmark")
+    print("=" * 70)
+    print(f"{EVENTS_PER_SECOND} events/s over {JOBS} jobs for {DURATION:.0f} s, {PROBE_MS} ms timer probe")
+    print(f"{'mode':<18} {'events':>8} {'callbacks':>10} {'p50 lag (ms)':>13} {'p99 lag (ms)':>13}")
+    for mode in ("after(0) per event", "poller"):
+        delays, sent, applied = run("poller" if mode == "poller" else "legacy")
+        delays.sort()
+        p50 = statistics.median(delays)
+        p99 = delays[min(len(delays) - 1, int(len(delays) * 0.99))]
+        print(f"{mode:<18} {sent:>8} {applied:>10} {p50:>13.2f} {p99:>13.2f}")
+    print("=" * 70)
+
+if __name__ == "__main__":
+    sys.exit(main())
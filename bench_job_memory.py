@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the memory a queued or running job keeps for its video info.
+
+Compares holding the full yt-dlp info dict with holding the JobMetadata
+record that replaces it after format selection. The info dicts are
+synthetic but shaped like YouTube's: ~25 formats with signed URLs and
+headers, thumbnails, automatic captions in ~150 languages, a heatmap and
+a description. Memory is measured with tracemalloc, so the numbers are
+the Python objects only, without allocator overhead.
+"""
+
+import random
+import sys
+import tracemalloc
+
+from model.downloader import DEFAULT_FORMAT, slim_info
+
+JOBS = 200
+FORMATS = 25
+CAPTION_LANGUAGES = 150
+
+
+def _token(rng, length):
+    return rng.randbytes((length + 1) // 2).hex()[:length]
+
+
+def build_info(rng, index):
+    """A processed, YouTube-shaped info dict with its own strings (nothing shared between jobs)."""
+    video_id = _token(rng, 11)
+    headers = {"User-Agent": "Mozilla/5.0 " + _token(rng, 80), "Accept": "*/*", "Accept-Language": "en-us,en;q=0.5",
+               "Sec-Fetch-Mode": "navigate"}
+    formats = []
+    for i in range(FORMATS):
+        height = (144, 240, 360, 480, 720, 1080, 1440, 2160)[i % 8]
+        audio = i % 5 == 0
+        formats.append({
+            "format_id": str(100 + i), "format_note": f"{height}p", "ext": "mp4" if i % 2 else "webm",
+            "url": f"https://rr{i}---sn-{_token(rng, 8)}.googlevideo.com/videoplayback?{_token(rng, 900)}",
+            "protocol": "https", "width": height * 16 // 9, "height": height, "fps": 30,
+            "vcodec": "none" if audio else "avc1.64001F", "acodec": "mp4a.40.2" if audio or i == 18 else "none",
+            "tbr": 100.0 + i * 50, "filesize": 1_000_000 * (i + 1), "quality": i, "has_drm": False,
+            "http_headers": dict(headers), "downloader_options": {"http_chunk_size": 10485760},
+            "format": f"{100 + i} - {height}p", "resolution": f"{height * 16 // 9}x{height}",
+            "dynamic_range": "SDR", "container": "mp4_dash", "aspect_ratio": 1.78,
+        })
+    formats[-1].update(vcodec="avc1.64001F", acodec="mp4a.40.2", height=720, format_id="22") # Combined format
+    captions = {
+        f"{_token(rng, 2)}-{i}": [{"ext": ext, "url": f"https://www.youtube.com/api/timedtext?{_token(rng, 350)}",
+                                   "name": f"Language {i}"} for ext in ("json3", "srv1", "srv2", "srv3", "ttml", "vtt")]
+        for i in range(CAPTION_LANGUAGES)
+    }
+    info = {
+        "id": video_id, "title": f"Video {index} " + _token(rng, 40), "fulltitle": f"Video {index}",
+        "duration": 600 + index, "uploader": _token(rng, 12), "channel_id": "UC" + _token(rng, 22),
+        "upload_date": "20240101", "webpage_url": f"https://www.youtube.com/watch?v={video_id}",
+        "extractor": "youtube", "extractor_key": "Youtube", "description": _token(rng, 2000),
+        "tags": [_token(rng, 10) for _ in range(30)], "categories": ["Music"],
+        "thumbnails": [{"url": f"https://i.ytimg.com/vi/{video_id}/{_token(rng, 60)}.jpg", "preference": -i,
+                        "id": str(i), "height": 90 + i, "width": 120 + i} for i in range(40)],
+        "automatic_captions": captions, "subtitles": {},
+        "heatmap": [{"start_time": i * 6.0, "end_time": i * 6.0 + 6, "value": rng.random()} for i in range(100)],
+        "formats": formats,
+    }
+    info.update(formats[-1]) # What yt-dlp does after selecting DEFAULT_FORMAT (best combined up to 1080p)
+    return info
+
+
+def measure(keep):
+    """
+    Keeps what `keep` returns for JOBS info dicts.
+    :return: Bytes retained per job.
+    """
+    rng = random.Random(1)
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    retained = []
+    for index in range(JOBS):
+        retained.append(keep(build_info(rng, index)))
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return used / JOBS
+
+
+def main():
+    """Run the benchmark for both representations."""
+    print("Per-Job Info Memory Benchmark")
+    print("=" * 60)
+    print(f"{JOBS} jobs, {FORMATS} formats and {CAPTION_LANGUAGES} caption languages per video "
+          f"(selected: {DEFAULT_FORMAT})")
+    full = measure(lambda info: info)
+    slim = measure(slim_info)
+    print(f"{'representation':<20} {'per job (KB)':>14} {f'{JOBS} jobs (MB)':>16}")
+    print(f"{'full info dict':<20} {full / 1024:>14.1f} {full * JOBS / 1024 ** 2:>16.1f}")
+    print(f"{'JobMetadata':<20} {slim / 1024:>14.1f} {slim * JOBS / 1024 ** 2:>16.1f}")
+    print("=" * 60)
+    print(f"{full / slim:.0f}x less memory per job")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Start-up benchmark for the entry points, based on `python -X importtime`.
+Exits with status 1 when an entry point exceeds its import-time budget or
+pulls in a dependency that must only be loaded on first use.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+RUNS = 5
+
+# Entry module -> cumulative import budget in milliseconds
+BUDGETS_MS = {
+    "cli_download": 60,
+    "yt_dlp_downloader": 60,
+    "main": 120,
+    "http_service": 200,
+    "metadata_export": 80,
+    "download_daemon": 40, # The client half runs in every CLI invocation
+}
+
+# Heavy dependencies that no entry point may import at start-up
+LAZY_MODULES = ("yt_dlp", "PIL", "requests", "pyarrow")
+
+
+def measure(module):
+    """
+    Imports `module` in a fresh interpreter with -X importtime.
+    :return: (cumulative import time in ms, set of imported module names)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True,
+    )
+    cumulative_us = 0
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        name = name.strip()
+        imported.add(name)
+        if name == module:
+            cumulative_us = int(cumulative)
+    return cumulative_us / 1000, imported
+
+
+def main():
+    """Run the benchmark for every entry point."""
+    print("Start-up Import Benchmark")
+    print("=" * 60)
+    print(f"{'entry point':<20} {'median (ms)':>12} {'budget (ms)':>12}  status")
+    failed = False
+    for module, budget in BUDGETS_MS.items():
+        samples = []
+        imported = set()
+        for _ in range(RUNS):
+            elapsed, imported = measure(module)
+            samples.append(elapsed)
+        median = statistics.median(samples)
+        eager = sorted(name for name in imported if name.split(".")[0] in LAZY_MODULES)
+        ok = median <= budget and not eager
+        failed |= not ok
+        print(f"{module:<20} {median:>12.1f} {budget:>12}  {'✓' if ok else '✗'}")
+        if eager:
+            print(f"  ✗ imports heavy modules at start-up: {', '.join(eager[:5])}")
+    print("=" * 60)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
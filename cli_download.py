@@ -4,107 +4,482 @@ Command-line interface for the YouTube Downloader.
 This script allows downloading videos without the GUI.
 """
 
+import argparse
 import sys
 import os
-from model.downloader import VideoDownloader
 import threading
 import time
+from model.downloader import VideoDownloader, check_clip, parse_time, video_id
+from download_daemon import DaemonClient
+from view.console import MB, ConsoleRenderer, JsonLinesRenderer
+
+CHANNEL_WATERMARKS_FILE = "channel_watermarks.json" # Newest handled video per synced channel
 
 class CLIDownloader:
-    def __init__(self):
-        self.downloader = VideoDownloader("downloads")
-        self.download_complete = False
-        self.download_success = False
-        self.status_message = ""
-        self.progress_info = {"current": 0, "total": 0}
-        
-        # Set up callbacks
-        self.downloader.set_callbacks(
-            on_progress=self.progress_callback,
-            on_complete=self.completion_callback
-        )
-    
-    def progress_callback(self, bytes_downloaded, total_bytes):
-        """Callback for download progress."""
-        self.progress_info["current"] = bytes_downloaded
-        self.progress_info["total"] = total_bytes
-        
-        if total_bytes > 0:
-            percentage = (bytes_downloaded / total_bytes) * 100
-            mb_downloaded = bytes_downloaded / (1024 * 1024)
-            mb_total = total_bytes / (1024 * 1024)
-            
-            # Clear the line and print progress
-            print(f"\rProgress: {percentage:.1f}% ({mb_downloaded:.1f}/{mb_total:.1f} MB)", end="", flush=True)
-    
-    def completion_callback(self, message, is_success):
-        """Callback for download completion."""
-        self.status_message = message
-        self.download_success = is_success
-        self.download_complete = True
-        print()  # New line after progress
-        
-        if is_success:
-            print(f"✅ {message}")
+    def __init__(self, save_path="downloads", jobs=1, renderer=None, progress_interval=0.5,
+                 audio_only=False, max_abr=None, clip=None, history=None):
+        """
+        :param save_path: Directory the videos are written to.
+        :param jobs: Number of downloads running in parallel.
+        :param renderer: Receives the progress and result events and the status
+                         messages (log()); a ConsoleRenderer
+                         (human-readable) or JsonLinesRenderer. Defaults to the console.
+        :param progress_interval: Minimum seconds between progress events per download.
+        :param audio_only: Download only audio streams.
+        :param max_abr: Audio bitrate ceiling in kbps for audio_only.
+        :param clip: (start, end) seconds to download only that part of each video.
+        :param history: DownloadHistory recording in-process downloads; defaults to
+                        the one in the state directory, opened with the first manager.
+        """
+        self.downloader = VideoDownloader(save_path)
+        self.jobs = max(1, jobs)
+        self.audio_only = audio_only
+        self.max_abr = max_abr
+        self.clip = clip
+        self.renderer = (renderer or ConsoleRenderer()).start()
+        self.progress_interval = progress_interval
+        self._started = {} # URL -> monotonic start time of running downloads
+        self._last_progress = {} # URL -> monotonic time of the last progress event
+        self._history = history
+        self._lock = threading.Lock()
+
+    def close(self):
+        """Draws the remaining output, stops the renderer and writes the pending history."""
+        self.renderer.close()
+        if self._history is not None:
+            self._history.close()
+
+    def _mark_started(self, url):
+        with self._lock:
+            self._started[url] = time.monotonic()
+
+    def progress_callback(self, bytes_downloaded, total_bytes, url=None):
+        """Callback for download progress: emits a throttled progress event."""
+        now = time.monotonic()
+        with self._lock:
+            started = self._started.setdefault(url, now)
+            if now - self._last_progress.get(url, 0.0) < self.progress_interval and bytes_downloaded < total_bytes:
+                return
+            self._last_progress[url] = now
+        elapsed = now - started
+        self.renderer.handle({
+            "event": "progress", "url": url, "bytes": bytes_downloaded, "total": total_bytes,
+            "speed": round(bytes_downloaded / elapsed) if elapsed > 0 else 0, "elapsed": round(elapsed, 3),
+        })
+
+    def result_callback(self, url, success, message, bytes_downloaded=0, total_bytes=0, path=None, error=None,
+                        saved_bytes=None, digest=None):
+        """Callback for download completion: emits the result event."""
+        now = time.monotonic()
+        with self._lock:
+            duration = now - self._started.pop(url, now)
+            self._last_progress.pop(url, None)
+        self.renderer.handle({
+            "event": "result", "url": url, "success": success, "message": message,
+            "bytes": bytes_downloaded, "total": total_bytes, "duration": round(duration, 3),
+            "speed": round(bytes_downloaded / duration) if duration > 0 else 0, "path": path, "error": error,
+            "saved_bytes": saved_bytes, "digest": digest,
+        })
+
+    def download_video(self, url, use_daemon=False):
+        """
+        Download a video with progress tracking.
+        :param use_daemon: Run it in the background daemon (started on demand),
+                           falling back to this process when it's unavailable.
+        :return: True if the download succeeded.
+        """
+        return self.download_all([url], use_daemon=use_daemon)[0]
+
+    def download_all(self, urls, use_daemon=False):
+        """
+        Downloads several videos, at most `self.jobs` at a time. Completion is
+        signalled by the jobs themselves; nothing polls.
+        :param urls: YouTube video links.
+        :param use_daemon: Run them in the background daemon (started on demand),
+                           falling back to this process when it's unavailable.
+        :return: List of booleans, the result of each URL in input order.
+        """
+        self.renderer.log(f"📁 Download path: {os.path.abspath(self.downloader.save_path)}")
+        unique = list(dict.fromkeys(urls))
+
+        results = {}
+        valid = []
+        for url in unique:
+            self.renderer.log(f"🔗 URL: {url}")
+            # Validate URLs first
+            if self.downloader.is_valid_url(url):
+                valid.append(url)
+            else:
+                self.result_callback(url, False, "Invalid YouTube URL format.", error="InvalidURL")
+                results[url] = False
+
+        if valid:
+            self.renderer.log("🚀 Starting download...")
+        if valid and use_daemon:
+            results.update(self._download_with_daemon(valid))
+        remaining = [url for url in valid if results.get(url) is None]
+        if remaining:
+            if use_daemon:
+                self.renderer.log("⚠️  Download daemon unavailable, downloading in this process.")
+            results.update(self._download_in_process(remaining))
+        return [results[url] for url in urls]
+
+    def _download_with_daemon(self, urls):
+        """
+        Runs the downloads in the daemon, one connection per parallel job.
+        :return: Dict URL -> True/False, or None for URLs the daemon didn't take.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        client = DaemonClient(workers=self.jobs)
+        if len(urls) == 1:
+            url = urls[0]
+            return {url: self._daemon_download(client, url)}
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = {url: executor.submit(self._daemon_download, client, url) for url in urls}
+        return {url: future.result() for url, future in futures.items()}
+
+    def _daemon_download(self, client, url):
+        self._mark_started(url)
+        return client.download(
+            url, self.downloader.save_path,
+            on_progress=lambda done, total: self.progress_callback(done, total, url),
+            on_result=lambda event: self.result_callback(
+                url, event["success"], event["message"], event.get("bytes_downloaded", 0),
+                event.get("total_bytes", 0), event.get("path"), event.get("error"), event.get("saved_bytes"),
+                event.get("digest")),
+            audio_only=self.audio_only, max_abr=self.max_abr, clip=self.clip)
+
+    def _create_manager(self):
+        """JobManager for in-process downloads, reporting through this CLI's callbacks."""
+        from model.history import DownloadHistory
+        from model.job_manager import JobManager # Only needed without the daemon
+
+        with self._lock:
+            if self._history is None:
+                self._history = DownloadHistory()
+        # The renderer draws all progress; keep yt-dlp from writing over it
+        manager = JobManager(self.downloader.save_path, max_workers=self.jobs,
+                             options={"quiet": True, "noprogress": True}, history=self._history)
+        manager.add_listener(self._on_job_event)
+        return manager
+
+    def _on_job_event(self, event):
+        from model.job_manager import COMPLETED, FINAL_STATES, RUNNING
+
+        job = event["job"]
+        if event["type"] == "progress":
+            self.progress_callback(job["bytes_downloaded"], job["total_bytes"], job["url"])
+        elif job["state"] == RUNNING:
+            self._mark_started(job["url"])
+        elif job["state"] in FINAL_STATES:
+            self.result_callback(job["url"], job["state"] == COMPLETED, job["message"], job["bytes_downloaded"],
+                                 job["total_bytes"], job["path"], job["error"], job["saved_bytes"],
+                                 job["digest"])
+
+    def _download_in_process(self, urls):
+        """
+        Runs the downloads in this process on a JobManager and waits for
+        each job's completion event.
+        :return: Dict URL -> True/False.
+        """
+        from model.job_manager import COMPLETED
+
+        manager = self._create_manager()
+        try:
+            jobs = [manager.submit(url, audio_only=self.audio_only, max_abr=self.max_abr, clip=self.clip)
+                    for url in urls]
+            for job in jobs:
+                job.wait()
+        finally:
+            # Ctrl+C aborts the downloads still running
+            manager.shutdown(wait=False, cancel_running=True)
+        return {job.url: job.state == COMPLETED for job in jobs}
+
+    def download_stream(self, stream, use_daemon=False, checkpoint_path=None):
+        """
+        Downloads the URLs listed in a stream, one per line, without reading it
+        all at once. `self.jobs` workers pull from a bounded queue, so reading
+        pauses while they are busy.
+        :param stream: Binary stream, e.g. open(path, "rb") or sys.stdin.buffer.
+        :param use_daemon: Run the downloads in the background daemon when available.
+        :param checkpoint_path: File recording how far the input was handled;
+                                an interrupted run resumes from it.
+        :return: Tuple (succeeded, failed, feed statistics dict).
+        """
+        from model.job_manager import COMPLETED
+        from model.url_feed import UrlFeed
+
+        feed = UrlFeed(stream, self.downloader.video_id, max_pending=self.jobs * 4,
+                       checkpoint_path=checkpoint_path)
+        if feed.resumed_from:
+            self.renderer.log(f"↩️  Resuming input after byte {feed.resumed_from}")
+        feed.start()
+        counts = {"succeeded": 0, "failed": 0}
+        lock = threading.Lock()
+        state = {"client": DaemonClient(workers=self.jobs) if use_daemon else None, "manager": None}
+
+        def download_in_process(url):
+            with lock:
+                if state["manager"] is None:
+                    state["manager"] = self._create_manager()
+            job = state["manager"].submit(url, audio_only=self.audio_only, max_abr=self.max_abr, clip=self.clip)
+            job.wait()
+            state["manager"].forget(job.id)
+            return job.state == COMPLETED
+
+        def worker():
+            while True:
+                entry = feed.get()
+                if entry is None:
+                    return
+                success = None
+                client = state["client"]
+                if client is not None:
+                    success = self._daemon_download(client, entry.url)
+                    if success is None and state["client"] is not None:
+                        state["client"] = None
+                        self.renderer.log("⚠️  Download daemon unavailable, downloading in this process.")
+                if success is None:
+                    success = download_in_process(entry.url)
+                with lock:
+                    counts["succeeded" if success else "failed"] += 1
+                feed.mark_done(entry)
+
+        workers = [threading.Thread(target=worker, daemon=True) for _ in range(self.jobs)]
+        try:
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+        finally:
+            # Ctrl+C keeps the checkpoint at the last contiguous finished line
+            feed.close()
+            if state["manager"] is not None:
+                state["manager"].shutdown(wait=False, cancel_running=True)
+        return counts["succeeded"], counts["failed"], feed.stats
+
+    def sync_channel(self, channel_url, use_daemon=False, limit=None, sync=None):
+        """
+        Downloads the channel's uploads that are newer than its stored
+        watermark, then moves the watermark past the ones that succeeded.
+        :param limit: Maximum number of new videos (e.g. for a first sync).
+        :param sync: ChannelSync to use; defaults to the one in the state directory.
+        :return: List of booleans, one per new video, or None if the channel couldn't be listed.
+        """
+        from model.channel_sync import ChannelSync
+
+        if sync is None:
+            from model.state import state_dir
+
+            sync = ChannelSync(os.path.join(state_dir(), CHANNEL_WATERMARKS_FILE))
+        try:
+            entries = sync.new_uploads(channel_url, limit=limit)
+        except Exception as e:
+            self.renderer.log(f"❌ Could not list {channel_url}: {e}")
+            return None
+        self.renderer.log(f"📺 {channel_url}: {len(entries)} new video(s)")
+        if not entries:
+            return []
+        urls = [f"https://www.youtube.com/watch?v={entry['id']}" for entry in entries]
+        results = self.download_all(urls, use_daemon=use_daemon)
+        sync.commit(channel_url, entries, {entry["id"] for entry, ok in zip(entries, results) if ok})
+        return results
+
+def _checkpoint_for(path):
+    """Default checkpoint file of an input file, keyed by its absolute path."""
+    import hashlib
+    from model.state import state_dir
+
+    digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(state_dir("checkpoints"), f"{digest}.json")
+
+def _prewarm():
+    """Populates the shared player cache and prints its size. Returns success."""
+    from model.player_cache import default_player_cache
+
+    cache = default_player_cache()
+    try:
+        stats = cache.prewarm()
+    except Exception as e:
+        print(f"Player cache prewarm failed: {e}")
+        return False
+    print(f"Player cache ready in {stats['last_prewarm']['seconds']:.1f}s: "
+          f"{stats['files']} files, {stats['bytes'] / 1024:.0f} KB in {stats['directory']}")
+    return True
+
+def _verify(paths):
+    """Checks files against their manifests and prints one line each. Returns whether all match."""
+    from model.integrity import verify_manifest
+
+    all_ok = True
+    for path in paths:
+        ok, message = verify_manifest(path)
+        print(f"{'✅' if ok else '❌'} {message}")
+        all_ok = all_ok and ok
+    return all_ok
+
+def _show_history(query, limit, as_json=False):
+    """
+    Prints history rows for a query: recent, failed, stats, errors, or a video.
+    :return: Exit code.
+    """
+    import json
+    from model.history import DownloadHistory
+
+    history = DownloadHistory()
+    try:
+        if query == "stats":
+            day = history.stats(since=time.time() - 86400)
+            total = history.stats()
+            if as_json:
+                print(json.dumps({"last_24h": day, "all": total}))
+                return 0
+            for label, stats in (("Last 24 h", day), ("All time", total)):
+                speed = f", avg {stats['average_speed'] / MB:.1f} MB/s" if stats["average_speed"] else ""
+                print(f"{label}: {stats['count']} downloads ({stats['completed']} completed, "
+                      f"{stats['failed']} failed), {stats['bytes'] / MB:.1f} MB{speed}")
+            return 0
+        if query == "errors":
+            for error, count in history.error_counts(limit):
+                print(json.dumps({"error": error, "count": count}) if as_json else f"{count:>8}  {error}")
+            return 0
+        if query in ("recent", "failed"):
+            rows = history.page(limit=limit, state="failed" if query == "failed" else None)
         else:
-            print(f"❌ {message}")
-    
-    def download_video(self, url):
-        """Download a video with progress tracking."""
-        print(f"🔗 URL: {url}")
-        print(f"📁 Download path: {os.path.abspath(self.downloader.save_path)}")
-        
-        # Validate URL first
-        if not self.downloader.is_valid_url(url):
-            print("❌ Invalid YouTube URL format.")
-            return False
-        
-        print("🚀 Starting download...")
-        
-        # Reset flags
-        self.download_complete = False
-        self.download_success = False
-        
-        # Start download in a separate thread
-        download_thread = threading.Thread(target=self.downloader.download_video, args=(url,))
-        download_thread.start()
-        
-        # Wait for completion
-        while not self.download_complete:
-            time.sleep(0.1)
-        
-        download_thread.join()
-        return self.download_success
+            rows = history.for_video(video_id(query) or query, limit)
+        for row in rows:
+            if as_json:
+                print(json.dumps(row))
+                continue
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(row["finished_at"]))
+            speed = f" {row['speed'] / MB:.1f} MB/s" if row["speed"] else ""
+            outcome = row["path"] or row["error"] or row["state"]
+            print(f"{when}  {row['state']:<9} {(row['bytes'] or 0) / MB:8.1f} MB{speed}  "
+                  f"{row['title'] or row['url']}  ->  {outcome}")
+        if not rows and not as_json:
+            print("No downloads recorded.")
+        return 0
+    finally:
+        history.close()
 
 def main():
     """Main function for CLI downloader."""
-    if len(sys.argv) != 2:
-        print("Usage: python cli_download.py <youtube_url>")
-        print("Example: python cli_download.py 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'")
-        sys.exit(1)
-    
-    url = sys.argv[1]
-    
+    parser = argparse.ArgumentParser(
+        description="YouTube Video Downloader (CLI)",
+        epilog="Example: python cli_download.py 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'")
+    parser.add_argument("urls", nargs="*", metavar="youtube_url", help="Video links to download")
+    parser.add_argument("-i", "--input", metavar="FILE",
+                        help="Read video links from FILE, one per line ('-' for stdin)")
+    parser.add_argument("--checkpoint", metavar="FILE",
+                        help="Resume file for --input (default: kept in the state directory "
+                             "for files, none for stdin)")
+    parser.add_argument("--channel", action="append", default=[], metavar="URL",
+                        help="Download a channel's uploads since the last sync (repeatable)")
+    parser.add_argument("--limit", type=int, metavar="N",
+                        help="With --channel: at most N new videos per channel; with --history: rows shown")
+    parser.add_argument("--audio-only", action="store_true",
+                        help="Download only the audio stream (no video), remuxed without re-encoding")
+    parser.add_argument("--max-abr", type=int, metavar="KBPS",
+                        help="With --audio-only: audio bitrate ceiling (default: 160)")
+    parser.add_argument("--start", type=parse_time, metavar="TIME",
+                        help="Download only from TIME (seconds, MM:SS or HH:MM:SS); needs ffmpeg")
+    parser.add_argument("--end", type=parse_time, metavar="TIME",
+                        help="Download only up to TIME; cuts are made at keyframes without re-encoding")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Number of videos downloaded in parallel (default: 1); also the worker "
+                             "count of a daemon started by this run, a running daemon keeps its own")
+    # --no-daemon forces in-process execution instead of the background daemon
+    parser.add_argument("--no-daemon", action="store_true",
+                        help="Download in this process instead of the background daemon")
+    parser.add_argument("--json", action="store_true",
+                        help="Write progress and results to stdout as JSON lines; other output goes to stderr")
+    parser.add_argument("--prewarm", action="store_true",
+                        help="Load the YouTube player into the shared cache first (alone: only that)")
+    parser.add_argument("--history", nargs="?", const="recent", metavar="QUERY",
+                        help="Show the download history and exit: recent (default), failed, stats, "
+                             "errors, or a video link or ID")
+    parser.add_argument("--verify", nargs="+", metavar="FILE",
+                        help="Check downloaded files (or their .manifest.json) against their checksums and exit")
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    clip = None
+    if args.start is not None or args.end is not None:
+        try:
+            clip = check_clip((args.start or 0.0, args.end))
+        except ValueError as e:
+            parser.error(str(e))
+    if args.verify:
+        sys.exit(0 if _verify(args.verify) else 1)
+    if args.history:
+        sys.exit(_show_history(args.history, args.limit or 20, args.json))
+    if args.prewarm and not (args.urls or args.input or args.channel):
+        sys.exit(0 if _prewarm() else 1)
+    if not args.urls and not args.input and not args.channel:
+        parser.error("give at least one youtube_url, --input FILE or --channel URL")
+
+    renderer = None
+    if args.json:
+        # Keep stdout clean for the JSON lines: everything else printed
+        # (including by yt-dlp) goes to stderr
+        renderer = JsonLinesRenderer(sys.stdout)
+        sys.stdout = sys.stderr
+
     print("YouTube Video Downloader (CLI)")
     print("=" * 50)
-    
+    if args.prewarm:
+        _prewarm()
+
     # Create downloads directory if it doesn't exist
     os.makedirs("downloads", exist_ok=True)
-    
+
     # Initialize downloader
-    cli_downloader = CLIDownloader()
-    
-    # Download the video
-    success = cli_downloader.download_video(url)
-    
+    cli_downloader = CLIDownloader(jobs=args.jobs, renderer=renderer, audio_only=args.audio_only,
+                                   max_abr=args.max_abr, clip=clip)
+
+    # Download the videos
+    stats = None
+    try:
+        results = cli_downloader.download_all(args.urls, use_daemon=not args.no_daemon) if args.urls else []
+        succeeded, failed = results.count(True), results.count(False)
+        if args.input:
+            if args.input == "-":
+                stream, checkpoint = sys.stdin.buffer, args.checkpoint
+            else:
+                stream, checkpoint = open(args.input, "rb"), args.checkpoint or _checkpoint_for(args.input)
+            with stream:
+                done, errors, stats = cli_downloader.download_stream(stream, use_daemon=not args.no_daemon,
+                                                                     checkpoint_path=checkpoint)
+            succeeded, failed = succeeded + done, failed + errors
+        for channel in args.channel:
+            results = cli_downloader.sync_channel(channel, use_daemon=not args.no_daemon, limit=args.limit)
+            if results is None:
+                failed += 1
+            else:
+                succeeded, failed = succeeded + results.count(True), failed + results.count(False)
+    finally:
+        cli_downloader.close()
+    if stats is not None:
+        print(f"📄 Read {stats['lines']} lines: {stats['accepted']} videos, "
+              f"{stats['duplicates']} duplicates, {stats['invalid']} invalid")
+
     print("=" * 50)
-    if success:
-        print("🎉 Download completed successfully!")
+    total = succeeded + failed
+    if not total and args.channel and not args.urls and not args.input:
+        print("✨ Channels are up to date.")
+        return
+    if not total:
+        print("💔 No valid video links found.")
+        sys.exit(1)
+    if not failed:
+        print("🎉 Download completed successfully!" if total == 1
+              else f"🎉 All {total} downloads completed successfully!")
         print(f"📂 Check the 'downloads' folder for your video.")
     else:
-        print("💔 Download failed. Please check the URL and try again.")
+        print("💔 Download failed. Please check the URL and try again." if total == 1
+              else f"💔 {failed} of {total} downloads failed.")
         sys.exit(1)
 
 if __name__ == "__main__":
     main()
-
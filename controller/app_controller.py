@@ -1,8 +1,20 @@
 # controller/app_controller.py
 import tkinter as tk
-from model.downloader import VideoDownloader
+from model.concurrency import ConcurrencyController
+from model.history import DownloadHistory
+from model.job_manager import FINAL_STATES, INFO_MAX_AGE, JobManager
+from model.state import state_dir
+from view.history_panel import HistoryWindow
+from view.progress_poller import ProgressPoller
+from view.thumbnail_cache import ThumbnailCache
 import threading
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PENDING_JOBS_FILE = "pending_jobs.json" # Unfinished jobs saved on close, resumed on next start
+PREVIEW_DELAY_MS = 300 # Wait for typing to pause before loading a preview
+SHUTDOWN_GRACE = 3.0 # Seconds aborted downloads get to finish, so their history rows are written
 
 class AppController:
     def __init__(self, view):
@@ -11,20 +23,42 @@ class AppController:
         :param view: Instance of the GUI class (YouTubeDownloaderGUI)
         """
         self.view = view
-        self.downloader = VideoDownloader(save_path=self.view.get_save_path()) # Initialize with default path from GUI
+        self.poller = ProgressPoller(self.view.root) # Applies thread updates on the Tk loop every 50 ms
+        self.poller.start()
+        self.concurrency = ConcurrencyController() # Adaptive limits shared by all download threads
+        # Bounded queue of download jobs; initialize with default path from GUI
+        self.manager = JobManager(save_path=self.view.get_save_path(),
+                                  max_workers=self.view.get_max_parallel(),
+                                  concurrency=self.concurrency,
+                                  history=DownloadHistory())
+        self.downloader = self.manager.downloader
+        self.manager.add_listener(self._on_job_event)
+        self._active = {} # Latest state of running jobs by ID, for the overall progress bar
+        self._active_lock = threading.Lock()
+
+        # Preview: extraction and thumbnails load off the Tk thread
+        self.thumbnails = ThumbnailCache(state_dir("thumbnails"))
+        self._preview_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="preview")
+        self._preview_after_id = None
+        self._preview_url = None
+        self._preview_info = None # (url, info dict, extraction time) of the current preview
+        self._history_window = None
 
         # Connect the GUI's Download button to this controller's method
         self.view.set_download_callback(self.handle_download)
-
-        # Set up downloader callbacks
-        self.downloader.set_callbacks(
-            on_progress=self.update_progress_ui,
-            on_complete=self.on_download_complete
-        )
+        self.view.set_parallel_callback(self._on_max_parallel_change)
+        self.view.set_close_callback(self.shutdown)
+        self.view.set_url_change_callback(self._on_url_change)
+        self.view.set_history_callback(self.show_history)
 
         # Link the save path variable in GUI to downloader's save path
         self.view.save_path.trace_add("write", self._on_save_path_change)
 
+        self._pending_jobs_path = os.path.join(state_dir(), PENDING_JOBS_FILE)
+        restored = self.manager.restore_jobs(self._pending_jobs_path)
+        if restored:
+            self.view.update_status(f"Resumed {len(restored)} unfinished download(s).", color="blue")
+
     def _on_save_path_change(self, *args):
         """
         Callback for when the save path in the GUI changes.
@@ -38,11 +72,17 @@ class AppController:
             except IOError as e:
                 self.view.update_status(f"Error setting path: {e}", color="red")
 
+    def _on_max_parallel_change(self):
+        """
+        Callback for when the parallel download limit in the GUI changes.
+        """
+        self.manager.max_workers = self.view.get_max_parallel()
 
     def handle_download(self):
         """
         This method is triggered when the user clicks the 'Download' button.
-        It retrieves the URL from the GUI and starts the download in a new thread.
+        It retrieves the URL from the GUI and queues it; the job manager runs at
+        most the selected number of downloads at once.
         """
         url = self.view.get_video_url()
         save_path = self.view.get_save_path()
@@ -51,35 +91,162 @@ class AppController:
             self.view.update_status("Please enter a YouTube video URL.", color="orange")
             return
 
-        self.view.update_status("Initiating download...", color="blue")
-        self.view.reset_progress() # Reset progress bar for new download
+        existing = self.manager.find_unfinished(url)
+        if existing is not None:
+            self.view.update_status(f"Already {existing.state}: {url}", color="orange")
+            return
+
+        info, info_time = self._take_preview_info(url)
+        self.manager.submit(url, save_path, info=info, info_time=info_time)
+        self.view.update_status("Download queued.", color="blue")
+
+    def _on_url_change(self):
+        """
+        Callback for when the URL entry changes. Loads the preview once the
+        user stops typing for PREVIEW_DELAY_MS.
+        """
+        if self._preview_after_id is not None:
+            self.view.root.after_cancel(self._preview_after_id)
+        self._preview_after_id = self.view.root.after(PREVIEW_DELAY_MS, self._start_preview)
+
+    def _start_preview(self):
+        """Starts loading the preview of the entered URL (Tk thread)."""
+        self._preview_after_id = None
+        url = self.view.get_video_url().strip()
+        if url == self._preview_url:
+            return
+        self._preview_url = url
+        if not self.downloader.is_valid_url(url):
+            self.view.preview.clear()
+            return
+        self.view.preview.show_loading()
+        # A thumbnail decoded before needs no disk read or JPEG decode
+        photo = self.thumbnails.get_photo(self.downloader.video_id(url))
+        if photo is not None:
+            self.view.preview.show_image(photo)
+        self._preview_executor.submit(self._load_preview, url, photo is None)
+
+    def _load_preview(self, url, load_thumbnail=True):
+        """
+        Extracts the video and loads its thumbnail (preview thread).
+        Results are handed to the Tk thread through the poller.
+        :param load_thumbnail: False when the thumbnail is already shown from memory.
+        """
+        try:
+            info = self.downloader.extract_info(url)
+        except Exception as e:
+            self.poller.push("preview", self._show_preview_error, url, f"Preview unavailable: {e}")
+            return
+        self._preview_info = (url, info, time.monotonic())
+        self.poller.push("preview", self._show_preview_info, url, info.get("title", "Unknown"),
+                         info.get("duration"), info.get("uploader"))
+
+        video_id = info.get("id") or self.downloader.video_id(url)
+        thumbnail_url = info.get("thumbnail")
+        if not load_thumbnail or not thumbnail_url:
+            return
+        try:
+            image = self.thumbnails.load_image(video_id, thumbnail_url)
+        except Exception as e:
+            print(f"Could not load thumbnail: {e}")
+            return
+        self.poller.push("preview-image", self._show_preview_image, url, video_id, image)
+
+    def _show_preview_info(self, url, title, duration, uploader):
+        """Shows title and duration if the URL is still the one entered (Tk thread)."""
+        if url == self._preview_url:
+            self.view.preview.show_info(title, duration, uploader)
+
+    def _show_preview_error(self, url, message):
+        """Shows a preview error if the URL is still the one entered (Tk thread)."""
+        if url == self._preview_url:
+            self.view.preview.show_error(message)
+
+    def _show_preview_image(self, url, video_id, image):
+        """Shows the thumbnail, decoding it once into the in-memory cache (Tk thread)."""
+        if url != self._preview_url:
+            return
+        photo = self.thumbnails.get_photo(video_id) or self.thumbnails.put_photo(video_id, image)
+        self.view.preview.show_image(photo)
 
-        # Run the download in a separate thread to prevent GUI freeze
-        download_thread = threading.Thread(target=self._run_download_in_thread, args=(url,))
-        download_thread.start()
+    def _take_preview_info(self, url):
+        """
+        Hands out the preview's extraction result for the download of `url`,
+        so the video isn't extracted twice.
+        The job checks the age again when it starts, since it may wait in the queue.
+        :return: (info dict, extraction time), or (None, None) if there's no
+                 fresh preview for this URL.
+        """
+        preview = self._preview_info
+        if preview is None or preview[0] != url.strip():
+            return None, None
+        if time.monotonic() - preview[2] > INFO_MAX_AGE:
+            return None, None
+        self._preview_info = None
+        return preview[1], preview[2]
 
-    def _run_download_in_thread(self, url):
+    def _on_job_event(self, event):
         """
-        Internal method to be run in a separate thread.
-        Calls the model's download method.
+        JobManager listener, called from worker threads.
+        Schedules the job's row and the progress bar to update on the Tk thread.
         """
-        self.downloader.download_video(url)
+        job = event["job"]
+        with self._active_lock:
+            if job["state"] == "running":
+                self._active[job["id"]] = job
+            else:
+                self._active.pop(job["id"], None)
+        # Queued for the Tk thread; only the latest value per job is drawn each tick
+        self.poller.push(job["id"], self.view.update_job, job)
+        self.poller.push("progress", self._update_overall_progress)
+        if event["type"] == "state" and job["state"] in FINAL_STATES:
+            self.on_download_complete(job["message"], job["state"] == "completed")
 
-    def update_progress_ui(self, bytes_downloaded, total_bytes):
+    def _update_overall_progress(self):
         """
-        Callback from the downloader model to update the GUI progress bar.
-        Schedules the update to run on the main Tkinter thread.
+        Shows the combined progress of all running downloads in the progress bar.
+        Runs on the Tk thread.
         """
-        # Ensure GUI updates happen on the main thread
-        self.view.root.after(0, self.view.update_progress, bytes_downloaded, total_bytes)
+        with self._active_lock:
+            jobs = list(self._active.values())
+        total_bytes = sum(job["total_bytes"] for job in jobs)
+        if total_bytes:
+            self.view.update_progress(sum(job["bytes_downloaded"] for job in jobs), total_bytes)
+        else:
+            self.view.reset_progress()
 
     def on_download_complete(self, message, is_success):
         """
-        Callback from the downloader model when a download is complete (success or failure).
+        Called when a download is complete (success or failure).
         Schedules the status update to run on the main Tkinter thread.
         """
         color = "green" if is_success else "red"
-        # Ensure GUI updates happen on the main thread
-        self.view.root.after(0, self.view.update_status, message, color)
-        # Also reset progress bar on completion
-        self.view.root.after(0, self.view.reset_progress)
\ No newline at end of file
+        self.poller.push("status", self.view.update_status, message, color)
+
+    def show_history(self):
+        """Opens the download history window, or refreshes it if it is already open."""
+        window = self._history_window
+        if window is not None and window.window.winfo_exists():
+            window.reload()
+            window.window.lift()
+            return
+        self.manager.history.flush(timeout=2) # Include the downloads that just finished
+        self._history_window = HistoryWindow(self.view.root, self.manager.history)
+
+    def shutdown(self):
+        """
+        Window close handler: saves unfinished jobs so they resume on the next
+        start, aborts the running downloads and closes the window.
+        """
+        self.manager.save_jobs(self._pending_jobs_path, self.manager.unfinished_jobs())
+        self.manager.remove_listener(self._on_job_event)
+        running = self.manager.unfinished_jobs()
+        self.manager.shutdown(wait=False, cancel_running=True)
+        self._preview_executor.shutdown(wait=False, cancel_futures=True)
+        # Cancelled downloads record their final state as they stop
+        deadline = time.monotonic() + SHUTDOWN_GRACE
+        for job in running:
+            job.wait(max(0.0, deadline - time.monotonic()))
+        self.manager.history.close()
+        self.poller.stop()
+        self.view.root.destroy()
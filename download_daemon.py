@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Background download daemon and its client.
+
+The daemon keeps a warm JobManager (yt-dlp imported, extractor state and
+caches populated) behind a Unix domain socket so short CLI invocations don't
+pay interpreter and yt-dlp start-up for every video. The client side is kept
+free of heavy imports; it is what cli_download.py loads.
+
+Protocol: one JSON object per line.
+    client -> daemon  {"cmd": "download", "url": "...", "save_path": "...",
+                       "audio_only": false, "max_abr": null, "clip": null}
+    daemon -> client  {"type": "accepted", "job_id": "..."}
+                      {"type": "progress", "bytes_downloaded": n, "total_bytes": n}
+                      {"type": "complete", "message": "...", "success": true,
+                       "bytes_downloaded": n, "total_bytes": n, "path": "...", "error": null,
+                       "saved_bytes": null, "digest": "sha256:..."}
+    client -> daemon  {"cmd": "ping"}  ->  {"type": "pong"}
+
+With --watch DIR the daemon also downloads the URL lists dropped into DIR
+(see model.watch_folder) and stays up while idle.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from model.state import state_dir
+
+CONNECT_TIMEOUT = 5.0 # Seconds to wait for a freshly spawned daemon
+DISCONNECTED_MESSAGE = "Error: The download daemon stopped responding during the download."
+IDLE_TIMEOUT = 600 # Seconds without jobs or clients before the daemon exits
+
+
+def socket_path():
+    """Path of the daemon's Unix domain socket."""
+    return os.path.join(state_dir(), "daemon.sock")
+
+
+class DaemonClient:
+    def __init__(self, path=None, autostart=True, workers=None):
+        """
+        :param path: Socket path, defaults to socket_path().
+        :param autostart: Spawn the daemon when nobody is listening.
+        :param workers: Parallel downloads of a daemon spawned by this client;
+                        a daemon that is already running keeps its own limit.
+        """
+        self.path = path or socket_path()
+        self.autostart = autostart
+        self.workers = workers
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            return None
+        return sock
+
+    def connect(self):
+        """
+        Connects to the daemon, starting it if necessary.
+        :return: A connected socket, or None when no daemon is available.
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            return None
+        sock = self._connect()
+        if sock is not None or not self.autostart:
+            return sock
+        self._spawn_daemon()
+        deadline = time.monotonic() + CONNECT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            sock = self._connect()
+            if sock is not None:
+                return sock
+        return None
+
+    def _spawn_daemon(self):
+        log = open(os.path.join(state_dir(), "daemon.log"), "ab")
+        command = [sys.executable, os.path.abspath(__file__), "--socket", self.path]
+        if self.workers:
+            command += ["--workers", str(self.workers)]
+        subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL, stdout=log, stderr=log,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            start_new_session=True, # Survive the CLI process that started it
+        )
+        log.close()
+
+    def download(self, url, save_path, on_progress=None, on_complete=None, on_result=None,
+                 audio_only=False, max_abr=None, clip=None):
+        """
+        Runs a download in the daemon and streams its progress back.
+        :param on_progress: Called as (bytes_downloaded, total_bytes).
+        :param on_complete: Called as (status_message, is_success).
+        :param on_result: Called with the whole "complete" event (adds bytes, path and error).
+        :param audio_only: Fetch only audio, with `max_abr` kbps as bitrate ceiling.
+        :param clip: (start, end) seconds to download only that part.
+        :return: True/False for the download result, or None when the daemon
+                 is unavailable and the caller should fall back to in-process.
+                 Once the daemon accepted the job, losing the connection (or an
+                 unreadable reply) is a failure: the daemon may still be
+                 writing the file, so downloading it again here could clash.
+        """
+        sock = self.connect()
+        if sock is None:
+            return None
+        accepted = False
+        progress = (0, 0)
+        with sock, sock.makefile("rb") as responses:
+            request = {"cmd": "download", "url": url, "save_path": os.path.abspath(save_path),
+                       "audio_only": audio_only, "max_abr": max_abr, "clip": clip}
+            try:
+                sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+                for line in responses:
+                    event = json.loads(line)
+                    if event["type"] == "accepted":
+                        accepted = True
+                    elif event["type"] == "progress":
+                        progress = (event["bytes_downloaded"], event["total_bytes"])
+                        if on_progress:
+                            on_progress(*progress)
+                    elif event["type"] == "complete":
+                        success = bool(event["success"])
+                        if on_result:
+                            on_result(event)
+                        if on_complete:
+                            on_complete(event["message"], success)
+                        return success
+            except (OSError, ValueError, KeyError, TypeError):
+                pass
+        if not accepted:
+            return None # The daemon never took the job; the caller may run it in-process
+        event = {"type": "complete", "message": DISCONNECTED_MESSAGE, "success": False,
+                 "bytes_downloaded": progress[0], "total_bytes": progress[1], "path": None,
+                 "error": "DaemonDisconnected", "saved_bytes": None, "digest": None}
+        if on_result:
+            on_result(event)
+        if on_complete:
+            on_complete(event["message"], False)
+        return False
+
+
+class DownloadDaemon:
+    def __init__(self, path=None, save_path="downloads", max_workers=4, idle_timeout=IDLE_TIMEOUT,
+                 watch=None, poll=False, prewarm=True):
+        """
+        :param path: Socket path, defaults to socket_path().
+        :param idle_timeout: Exit after this many idle seconds (0 disables).
+        :param watch: Inbox directory to take URL list files from.
+        :param poll: Watch the inbox by polling instead of inotify.
+        :param prewarm: Load the YouTube player into the cache at start.
+        When another daemon already serves `path`, nothing is set up (manager
+        is None) and serve_forever() returns at once.
+        """
+        from model.concurrency import ConcurrencyController
+        from model.history import DownloadHistory
+        from model.job_manager import JobManager
+
+        self.path = path or socket_path()
+        self.idle_timeout = idle_timeout
+        self.prewarm = prewarm
+        self._clients = 0
+        self._last_activity = time.monotonic()
+        self.manager = None
+        self.watch_folder = None
+        # Only one daemon per socket; a racing second instance must not open
+        # the history or start workers before it finds out and exits
+        self._lock = self._take_lock()
+        if self._lock is None:
+            return
+        self.manager = JobManager(save_path, max_workers=max_workers, concurrency=ConcurrencyController(),
+                                  history=DownloadHistory())
+        if watch:
+            from model.watch_folder import WatchFolder
+            self.watch_folder = WatchFolder(watch, self.manager, polling=poll)
+
+    def _take_lock(self):
+        """
+        :return: The open lock file, held until the daemon exits, or None when
+                 another daemon holds it.
+        """
+        import fcntl
+
+        lock = open(self.path + ".lock", "w")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            return None
+        return lock
+
+    def serve_forever(self):
+        """Binds the socket and serves until idle for `idle_timeout` seconds."""
+        import asyncio
+
+        if self._lock is None:
+            print("Another daemon is already running.")
+            return
+        if os.path.exists(self.path):
+            os.unlink(self.path) # Stale socket from a daemon that died
+        # Warm up yt-dlp and the player cache in the background while the first client connects
+        if self.prewarm:
+            self.manager.downloader.player_cache.start_prewarm()
+        if self.watch_folder is not None:
+            self.watch_folder.start()
+            print(f"Watching {self.watch_folder.inbox} ({self.watch_folder.mode})", flush=True)
+        try:
+            asyncio.run(self._serve())
+        finally:
+            if self.watch_folder is not None:
+                self.watch_folder.stop()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            self.manager.shutdown(wait=False)
+            self.manager.history.close()
+            self._lock.close()
+
+    async def _serve(self):
+        import asyncio
+
+        server = await asyncio.start_unix_server(self._handle_client, path=self.path)
+        os.chmod(self.path, 0o600)
+        print(f"Download daemon listening on {self.path}", flush=True)
+        async with server:
+            while not self._idle():
+                await asyncio.sleep(1)
+
+    def _idle(self):
+        if not self.idle_timeout or self._clients or self.watch_folder is not None:
+            return False
+        return time.monotonic() - self._last_activity > self.idle_timeout
+
+    async def _handle_client(self, reader, writer):
+        self._clients += 1
+        try:
+            line = await reader.readline()
+            request = json.loads(line or b"{}")
+            if request.get("cmd") == "ping":
+                writer.write(b'{"type": "pong"}\n')
+            elif request.get("cmd") == "download":
+                await self._run_download(request, reader, writer)
+            else:
+                writer.write(json.dumps({"type": "complete", "success": False,
+                                         "message": "Unknown daemon command."}).encode("utf-8") + b"\n")
+            await writer.drain()
+        except (ValueError, ConnectionError):
+            pass
+        finally:
+            self._clients -= 1
+            self._last_activity = time.monotonic()
+            writer.close()
+
+    async def _run_download(self, request, reader, writer):
+        import asyncio
+        from model.job_manager import FINAL_STATES
+
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+        job = None
+
+        def listener(event):
+            # The job can finish before submit() returns, so until its ID is
+            # known every event is passed on and filtered below
+            if job is None or event["job"]["id"] == job.id:
+                loop.call_soon_threadsafe(events.put_nowait, event)
+
+        self.manager.add_listener(listener)
+        try:
+            job = self.manager.submit(request["url"], request.get("save_path"),
+                                      audio_only=bool(request.get("audio_only")), max_abr=request.get("max_abr"),
+                                      clip=request.get("clip"))
+            writer.write(json.dumps({"type": "accepted", "job_id": job.id}).encode("utf-8") + b"\n")
+            await writer.drain()
+            disconnected = asyncio.ensure_future(reader.read()) # Resolves when the client goes away
+            # Events arrive in order, so every progress update is sent before the final state
+            finished = False
+            while not finished:
+                getter = asyncio.ensure_future(events.get())
+                done, _ = await asyncio.wait({getter, disconnected}, timeout=1, return_when=asyncio.FIRST_COMPLETED)
+                if disconnected in done:
+                    getter.cancel()
+                    self.manager.cancel(job.id)
+                    return
+                if getter not in done:
+                    getter.cancel()
+                    continue
+                event = getter.result()
+                if event["job"]["id"] != job.id:
+                    continue
+                if event["type"] == "progress":
+                    payload = {"type": "progress", "bytes_downloaded": event["job"]["bytes_downloaded"],
+                               "total_bytes": event["job"]["total_bytes"]}
+                    writer.write(json.dumps(payload).encode("utf-8") + b"\n")
+                    await writer.drain()
+                else:
+                    finished = event["job"]["state"] in FINAL_STATES
+            disconnected.cancel()
+            payload = {"type": "complete", "message": job.message, "success": job.state == "completed",
+                       "bytes_downloaded": job.bytes_downloaded, "total_bytes": job.total_bytes,
+                       "path": job.path, "error": job.error, "saved_bytes": job.saved_bytes,
+                       "digest": job.digest}
+            writer.write(json.dumps(payload).encode("utf-8") + b"\n")
+        finally:
+            self.manager.remove_listener(listener)
+
+def main():
+    """Main function for running the daemon in the foreground."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="YouTube download daemon (Unix socket).")
+    parser.add_argument("--socket", default=None, help="Socket path (default: daemon.sock in the state dir)")
+    parser.add_argument("--workers", type=int, default=4, help="Maximum parallel downloads")
+    parser.add_argument("--idle-timeout", type=int, default=IDLE_TIMEOUT,
+                        help="Exit after this many idle seconds, 0 to run forever")
+    parser.add_argument("--save-path", default="downloads", help="Directory for downloaded files")
+    parser.add_argument("--watch", metavar="DIR", default=None,
+                        help="Download the URL list files dropped into DIR; they are moved to "
+                             "DIR/processed or DIR/failed when done (keeps the daemon running)")
+    parser.add_argument("--poll", action="store_true",
+                        help="Watch DIR by polling instead of inotify")
+    args = parser.parse_args()
+
+    DownloadDaemon(args.socket, save_path=args.save_path, max_workers=args.workers,
+                   idle_timeout=args.idle_timeout, watch=args.watch, poll=args.poll).serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Headless HTTP service for the YouTube Downloader.
+Keeps one warm process (yt-dlp imported, caches populated) that other systems
+can submit downloads to instead of starting a new Python process per video.
+
+Endpoints:
+    POST   /jobs          {"url": "..."} or {"urls": [...]}, optional "save_path",
+                          "audio_only" and "max_abr" (audio bitrate ceiling in kbps),
+                          "clip": [start, end] in seconds (end null for the rest)
+    GET    /jobs          list all jobs
+    GET    /jobs/<id>     status of one job
+    DELETE /jobs/<id>     cancel a job
+    GET    /events        progress stream (Server-Sent Events), optional ?job=<id>
+    GET    /metrics       concurrency limits, per-host/extractor limit usage,
+                          player cache stats, reserved disk space
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+from model.concurrency import (DEFAULT_EXTRACTOR_LIMITS, DEFAULT_HOST_LIMITS, ConcurrencyController,
+                               SemaphoreRegistry, parse_limit)
+from model.downloader import check_clip
+from model.history import DownloadHistory
+from model.integrity import ALGORITHMS, DEFAULT_CHECKSUM
+from model.job_manager import FINAL_STATES, JobManager
+
+MAX_BODY_SIZE = 1024 * 1024
+EVENT_QUEUE_SIZE = 1000 # Per SSE client; progress events are dropped when a client falls behind
+
+REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error",
+           503: "Service Unavailable"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class DownloadService:
+    def __init__(self, manager, host="127.0.0.1", port=8765):
+        """
+        :param manager: JobManager running the downloads.
+        """
+        self.manager = manager
+        self.host = host
+        self.port = port
+        self._subscribers = set() # (loop, queue, job_id filter)
+        self._subscribers_lock = threading.Lock() # Events arrive from worker threads
+        self.manager.add_listener(self._on_job_event)
+
+    async def serve_forever(self):
+        """Starts the HTTP server and serves until cancelled."""
+        server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        print(f"🌐 Download service listening on http://{self.host}:{self.port}")
+        async with server:
+            await server.serve_forever()
+
+    def _on_job_event(self, event):
+        """JobManager listener: forwards events to SSE clients (called from worker threads)."""
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for loop, queue, job_id in subscribers:
+            if job_id is None or event["job"]["id"] == job_id:
+                loop.call_soon_threadsafe(self._enqueue, queue, event)
+
+    @staticmethod
+    def _enqueue(queue, event):
+        if queue.full():
+            if event["type"] == "progress":
+                return
+            queue.get_nowait() # Make room for the state change, it must not be lost
+        queue.put_nowait(event)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            method, path, query, body = await self._read_request(reader)
+            if method == "GET" and path == "/events":
+                await self._stream_events(writer, query.get("job", [None])[0])
+                return
+            status, payload = self._route(method, path, body)
+        except HttpError as e:
+            status, payload = e.status, {"error": str(e)}
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        except Exception as e:
+            # Still answer (and close the connection) instead of leaving the client hanging
+            print(f"Request failed: {e!r}")
+            status, payload = 500, {"error": "Internal server error."}
+        await self._send_json(writer, status, payload)
+
+    async def _read_request(self, reader):
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        try:
+            method, target, _ = request_line.split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Malformed request line.")
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise HttpError(400, "Content-Length must be a non-negative integer.")
+        if length > MAX_BODY_SIZE:
+            raise HttpError(413, "Request body too large.")
+        body = await reader.readexactly(length) if length else b""
+        url = urlsplit(target)
+        return method.upper(), url.path.rstrip("/") or "/", parse_qs(url.query), body
+
+    def _route(self, method, path, body):
+        parts = path.strip("/").split("/")
+        if parts[0] == "jobs" and len(parts) == 1:
+            if method == "POST":
+                return 202, self._submit(body)
+            if method == "GET":
+                return 200, {"jobs": [job.to_dict() for job in self.manager.jobs()]}
+            raise HttpError(405, "Use GET or POST on /jobs.")
+        if parts[0] == "jobs" and len(parts) == 2:
+            job = self.manager.get(parts[1])
+            if job is None:
+                raise HttpError(404, f"Unknown job: {parts[1]}")
+            if method == "GET":
+                return 200, job.to_dict()
+            if method == "DELETE":
+                self.manager.cancel(job.id)
+                return 202, job.to_dict()
+            raise HttpError(405, "Use GET or DELETE on /jobs/<id>.")
+        if path == "/metrics" and method == "GET":
+            concurrency = self.manager.downloader.concurrency
+            disk_space = self.manager.disk_space
+            return 200, {"concurrency": concurrency.metrics() if concurrency else None,
+                         "limits": self.manager.downloader.limits.metrics(),
+                         "player_cache": self.manager.downloader.player_cache.stats(),
+                         "disk_reserved": disk_space.outstanding() if disk_space else None}
+        raise HttpError(404, f"No such endpoint: {path}")
+
+    def _submit(self, body):
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            raise HttpError(400, "Body must be JSON.")
+        if not isinstance(request, dict):
+            raise HttpError(400, "Body must be a JSON object.")
+        urls = request.get("urls") or ([request["url"]] if request.get("url") else [])
+        if not urls or not all(isinstance(url, str) for url in urls):
+            raise HttpError(400, "Provide \"url\" or a list of \"urls\".")
+        invalid = [url for url in urls if not self.manager.downloader.is_valid_url(url)]
+        if invalid:
+            raise HttpError(400, f"Invalid YouTube URL format: {', '.join(invalid)}")
+        max_abr = request.get("max_abr")
+        if max_abr is not None and (not isinstance(max_abr, int) or isinstance(max_abr, bool) or max_abr <= 0):
+            raise HttpError(400, "\"max_abr\" must be a positive integer (kbps).")
+        save_path = request.get("save_path")
+        if save_path is not None and (not isinstance(save_path, str) or not save_path.strip()):
+            raise HttpError(400, "\"save_path\" must be a non-empty string.")
+        clip = request.get("clip")
+        if clip is not None:
+            try:
+                clip = check_clip(clip)
+            except ValueError as e:
+                raise HttpError(400, str(e))
+        try:
+            jobs = self.manager.submit_batch(urls, save_path, audio_only=bool(request.get("audio_only")),
+                                             max_abr=max_abr, clip=clip)
+        except RuntimeError:
+            raise HttpError(503, "The service is shutting down.")
+        return {"jobs": [job.to_dict() for job in jobs]}
+
+    async def _stream_events(self, writer, job_id):
+        if job_id is not None and self.manager.get(job_id) is None:
+            await self._send_json(writer, 404, {"error": f"Unknown job: {job_id}"})
+            return
+        queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+        subscriber = (asyncio.get_running_loop(), queue, job_id)
+        with self._subscribers_lock:
+            self._subscribers.add(subscriber)
+        try:
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                         b"Cache-Control: no-cache\r\nConnection: close\r\n\r\n")
+            # Start with the current state so clients don't miss what happened before
+            jobs = [self.manager.get(job_id)] if job_id else self.manager.jobs()
+            event = None
+            for job in jobs:
+                event = {"type": "state", "job": job.to_dict()}
+                writer.write(self._format_event(event))
+            await writer.drain()
+            # A stream for a single job ends with its final state
+            while not (job_id and event["job"]["state"] in FINAL_STATES):
+                event = await queue.get()
+                writer.write(self._format_event(event))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            with self._subscribers_lock:
+                self._subscribers.discard(subscriber)
+            writer.close()
+
+    @staticmethod
+    def _format_event(event):
+        return f"event: {event['type']}\ndata: {json.dumps(event['job'])}\n\n".encode("utf-8")
+
+    @staticmethod
+    async def _send_json(writer, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        writer.write(f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                     f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                     f"Connection: close\r\n\r\n".encode("latin-1") + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+def main():
+    """Main function for the download service."""
+    parser = argparse.ArgumentParser(description="Headless YouTube download service.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    parser.add_argument("--save-path", default="downloads", help="Default download directory")
+    parser.add_argument("--workers", type=int, default=4, help="Maximum parallel downloads")
+    parser.add_argument("--checksum", choices=ALGORITHMS + ("none",), default=DEFAULT_CHECKSUM,
+                        help=f"Checksum stored in a manifest next to each file (default: {DEFAULT_CHECKSUM})")
+    parser.add_argument("--no-prewarm", action="store_true",
+                        help="Don't load the YouTube player into the cache at start")
+    parser.add_argument("--host-limit", type=parse_limit, action="append", default=[], metavar="HOST=N",
+                        help="Maximum parallel connections to HOST and its subdomains, repeatable "
+                             f"(defaults: {', '.join(f'{k}={v}' for k, v in DEFAULT_HOST_LIMITS.items())})")
+    parser.add_argument("--extractor-limit", type=parse_limit, action="append", default=[], metavar="NAME=N",
+                        help="Maximum parallel extractions by extractor NAME, repeatable "
+                             f"(defaults: {', '.join(f'{k}={v}' for k, v in DEFAULT_EXTRACTOR_LIMITS.items())})")
+    args = parser.parse_args()
+
+    limits = SemaphoreRegistry({**DEFAULT_HOST_LIMITS, **dict(args.host_limit)},
+                               {**DEFAULT_EXTRACTOR_LIMITS, **dict(args.extractor_limit)})
+    manager = JobManager(args.save_path, max_workers=args.workers, concurrency=ConcurrencyController(),
+                         checksum=None if args.checksum == "none" else args.checksum,
+                         history=DownloadHistory(), limits=limits)
+    if not args.no_prewarm:
+        manager.downloader.player_cache.start_prewarm()
+    service = DownloadService(manager, args.host, args.port)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        manager.shutdown(wait=False)
+        manager.history.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Bulk metadata export: extracts video information without downloading media
+and streams the selected fields to JSON lines plus a columnar file (Parquet
+when pyarrow is installed, CSV otherwise).
+
+Usage:
+    python metadata_export.py -i urls.txt -o metadata
+    python metadata_export.py -o metadata --fields id,title,duration,filesize <url> ...
+"""
+
+import argparse
+import io
+import os
+import sys
+import threading
+import time
+
+from model.concurrency import DEFAULT_HOST_LIMITS, AIMDLimiter, ConcurrencyController, SemaphoreRegistry
+from model.downloader import EXTRACTOR, VideoDownloader
+from model.metadata import DEFAULT_FIELDS, FIELD_TYPES, JsonLinesWriter, open_columnar_writer, select_fields
+from model.url_feed import UrlFeed
+
+
+class MetadataExporter:
+    """
+    Runs extraction for a stream of URLs under an adaptive concurrency limit
+    and writes one row per video. Each info dict is reduced to the selected
+    fields as soon as it arrives, so memory stays flat however long the list is.
+    """
+
+    def __init__(self, output, fields=DEFAULT_FIELDS, file_format="auto", max_concurrency=16):
+        """
+        :param output: Output path without extension; writes <output>.jsonl and
+                       <output>.parquet / .arrow / .csv.
+        :param fields: Fields kept per video (see model.metadata.FIELD_TYPES).
+        :param file_format: Columnar format: "auto", "parquet", "arrow" or "csv".
+        :param max_concurrency: Upper bound of the adaptive extraction limit. It
+                                also sizes the exporter's own per-host and
+                                per-extractor limits, which would otherwise cap
+                                extraction at the process-wide defaults.
+        """
+        self.fields = tuple(fields)
+        self.columns = ("url",) + self.fields + ("error",)
+        self.max_concurrency = max_concurrency
+        # Extraction starts at a few parallel requests and backs off on rate limits
+        self.limiter = AIMDLimiter("extraction", initial=min(4, max_concurrency), maximum=max_concurrency)
+        limits = SemaphoreRegistry({**DEFAULT_HOST_LIMITS, "youtube.com": max_concurrency},
+                                   {EXTRACTOR: max_concurrency})
+        self.downloader = VideoDownloader(os.path.dirname(os.path.abspath(output)),
+                                          concurrency=ConcurrencyController(extraction=self.limiter), limits=limits)
+        self.jsonl = JsonLinesWriter(f"{output}.jsonl")
+        self.columnar = open_columnar_writer(output, self.columns, file_format)
+        self.counts = {"exported": 0, "failed": 0}
+        self._lock = threading.Lock()
+
+    def run(self, stream, on_status=None):
+        """
+        Exports every URL listed in `stream`.
+        :param stream: Binary stream with one URL per line.
+        :param on_status: Called about twice a second with the counts dict and the current limit.
+        :return: The counts dict.
+        """
+        feed = UrlFeed(stream, self.downloader.video_id, max_pending=self.max_concurrency * 4).start()
+        # One thread per possible slot; the limiter decides how many extract at once
+        workers = [threading.Thread(target=self._work, args=(feed,), daemon=True)
+                   for _ in range(self.max_concurrency)]
+        try:
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                while thread.is_alive():
+                    thread.join(timeout=0.5)
+                    if on_status:
+                        on_status(dict(self.counts, **feed.stats), self.limiter.limit)
+        finally:
+            feed.close()
+            self.jsonl.close()
+            self.columnar.close()
+        return self.counts
+
+    def _work(self, feed):
+        while True:
+            entry = feed.get()
+            if entry is None:
+                return
+            try:
+                row = select_fields(self.downloader.extract_info(entry.url), self.fields)
+                row["error"] = None
+            except Exception as e:
+                row = dict.fromkeys(self.fields)
+                row["error"] = type(e).__name__
+            row = {"url": entry.url, **row}
+            with self._lock:
+                self.jsonl.write(row)
+                self.columnar.write(row)
+                self.counts["failed" if row["error"] else "exported"] += 1
+            feed.mark_done(entry)
+
+
+def main():
+    """Main function for the metadata export."""
+    parser = argparse.ArgumentParser(description="Export YouTube video metadata without downloading.")
+    parser.add_argument("urls", nargs="*", metavar="youtube_url", help="Video links")
+    parser.add_argument("-i", "--input", metavar="FILE", help="Read video links from FILE ('-' for stdin)")
+    parser.add_argument("-o", "--output", required=True, metavar="BASE",
+                        help="Output path without extension (BASE.jsonl and BASE.parquet/.csv)")
+    parser.add_argument("--fields", default=",".join(DEFAULT_FIELDS),
+                        help=f"Comma-separated fields to keep, out of {','.join(FIELD_TYPES)} "
+                             f"(default: {','.join(DEFAULT_FIELDS)})")
+    parser.add_argument("--format", choices=("auto", "parquet", "arrow", "csv"), default="auto",
+                        help="Columnar output format; auto uses Parquet if pyarrow is installed, else CSV")
+    parser.add_argument("--max-concurrency", type=int, default=16,
+                        help="Upper bound of parallel extractions (default: 16)")
+    args = parser.parse_args()
+    if not args.urls and not args.input:
+        parser.error("give at least one youtube_url or --input FILE")
+
+    fields = [field.strip() for field in args.fields.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in FIELD_TYPES]
+    if unknown:
+        parser.error(f"unknown field(s) {','.join(unknown)}; choose from {','.join(FIELD_TYPES)}")
+    if not fields:
+        parser.error("--fields needs at least one field")
+    exporter = MetadataExporter(args.output, fields, args.format, max(1, args.max_concurrency))
+
+    streams = []
+    if args.urls:
+        streams.append(io.BytesIO("\n".join(args.urls).encode("utf-8")))
+    if args.input:
+        streams.append(sys.stdin.buffer if args.input == "-" else open(args.input, "rb"))
+
+    def on_status(counts, limit):
+        print(f"\rExported {counts['exported']}, failed {counts['failed']}, "
+              f"skipped {counts['invalid'] + counts['duplicates']} (concurrency {limit})",
+              end="", file=sys.stderr, flush=True)
+
+    started = time.monotonic()
+    counts = exporter.run(_chain(streams), on_status=on_status)
+    print(file=sys.stderr)
+    print(f"Exported {counts['exported']} videos ({counts['failed']} failed) in "
+          f"{time.monotonic() - started:.1f}s to {exporter.jsonl.path} and {exporter.columnar.path}",
+          file=sys.stderr)
+    sys.exit(1 if counts["failed"] else 0)
+
+
+def _chain(streams):
+    """Iterates the lines of several binary streams in order."""
+    for stream in streams:
+        with stream:
+            yield from stream
+
+
+if __name__ == "__main__":
+    main()
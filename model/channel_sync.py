@@ -0,0 +1,141 @@
+# model/channel_sync.py
+import json
+import os
+import re
+import threading
+
+RECENT_IDS = 20 # Handled video IDs kept per channel in case the newest get deleted
+
+_CHANNEL_URL = re.compile(
+    r"^(?:https?://)?(?:www\.|m\.)?youtube\.com/"
+    r"(@[\w.-]+|channel/UC[\w-]{22}|c/[\w.-]+|user/[\w.-]+)"
+    r"(?:/(?:videos|shorts|streams|featured|playlists)?)?/?(?:[?#].*)?$"
+)
+
+
+def channel_key(url):
+    """
+    Normalizes a channel URL to https://www.youtube.com/<handle or id>, which
+    identifies the channel in the watermark store.
+    :return: The normalized URL, or None if it isn't a channel URL.
+    """
+    match = _CHANNEL_URL.match(url.strip())
+    return f"https://www.youtube.com/{match.group(1)}" if match else None
+
+
+def list_uploads(channel_url):
+    """
+    Yields the channel's uploads newest first as flat entries (id, url, title,
+    and upload date when YouTube provides it). yt-dlp fetches the next page of
+    the list only when iteration gets there, so stopping early saves the
+    remaining requests.
+    """
+    import yt_dlp # Imported on first use, it dominates start-up time
+
+    opts = {"extract_flat": "in_playlist", "lazy_playlist": True, "quiet": True, "no_warnings": True}
+    with yt_dlp.YoutubeDL(opts) as ydl:
+        result = ydl.extract_info(f"{channel_url}/videos", download=False, process=False)
+        while result.get("_type") == "url": # Handles and legacy URLs redirect to the channel ID
+            result = ydl.extract_info(result["url"], download=False, process=False)
+        for entry in result.get("entries") or ():
+            if entry and entry.get("id"):
+                yield entry
+
+
+class ChannelSync:
+    """
+    Incremental channel sync. For every channel the newest video ID and upload
+    date that were fully handled are stored as a watermark; the next sync
+    walks the upload list (newest first) only until it reaches the watermark,
+    so two new uploads cost a page of listing instead of the whole history.
+
+    Flat upload lists usually carry no upload date, so the watermark also
+    keeps the RECENT_IDS most recent handled IDs: if the newest one was
+    deleted, listing stops at the next one still there. The date is only the
+    last resort.
+    """
+
+    def __init__(self, store_path, lister=list_uploads):
+        """
+        :param store_path: JSON file holding the watermarks.
+        :param lister: Callable(channel_url) yielding upload entries newest
+                       first; defaults to paging the channel with yt-dlp.
+        """
+        self.store_path = store_path
+        self.lister = lister
+        self._lock = threading.Lock()
+
+    def watermark(self, channel_url):
+        """
+        :return: The stored watermark dict {"video_id", "upload_date", "recent_ids"}, or None.
+        """
+        return self._load().get(channel_key(channel_url) or channel_url)
+
+    def new_uploads(self, channel_url, limit=None):
+        """
+        Lists the uploads newer than the channel's watermark.
+        :param channel_url: Channel URL (@handle, /channel/UC…, /c/…, /user/…).
+        :param limit: Stop after this many new entries (e.g. for a first sync).
+        :return: New entries, oldest first, ready to be queued in order.
+        :raises ValueError: If the URL isn't a channel URL.
+        """
+        key = channel_key(channel_url)
+        if key is None:
+            raise ValueError(f"Not a YouTube channel URL: {channel_url}")
+        mark = self._load().get(key) or {}
+        known = set(mark.get("recent_ids") or ())
+        if mark.get("video_id"):
+            known.add(mark["video_id"])
+        new = []
+        for entry in self.lister(key):
+            if entry["id"] in known:
+                break
+            # The watermark video may have been deleted: stop at anything older
+            upload_date = entry.get("upload_date")
+            if upload_date and mark.get("upload_date") and upload_date < mark["upload_date"]:
+                break
+            new.append(entry)
+            if limit is not None and len(new) >= limit:
+                break
+        new.reverse()
+        return new
+
+    def commit(self, channel_url, entries, succeeded):
+        """
+        Moves the watermark forward over the new entries that were handled.
+        It stops before the first failure, so failed videos are listed again
+        on the next sync.
+        :param entries: Entries returned by new_uploads(), oldest first.
+        :param succeeded: Set of video IDs that were downloaded.
+        :return: The new watermark, or None if it didn't move.
+        """
+        mark = None
+        handled = []
+        for entry in entries:
+            if entry["id"] not in succeeded:
+                break
+            handled.append(entry["id"])
+            mark = {"video_id": entry["id"], "upload_date": entry.get("upload_date")}
+        if mark is None:
+            return None
+        key = channel_key(channel_url) or channel_url
+        with self._lock:
+            store = self._load()
+            previous = store.get(key) or {}
+            if not mark["upload_date"]:
+                mark["upload_date"] = previous.get("upload_date")
+            recent = handled[::-1] + (previous.get("recent_ids") or [previous.get("video_id")])
+            mark["recent_ids"] = [video_id for video_id in recent if video_id][:RECENT_IDS]
+            store[key] = mark
+            tmp_path = self.store_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(store, f, indent=1)
+            os.replace(tmp_path, self.store_path)
+        return mark
+
+    def _load(self):
+        try:
+            with open(self.store_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
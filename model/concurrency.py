@@ -0,0 +1,344 @@
+# model/concurrency.py
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+
+def classify_error(error):
+    """
+    Classifies an exception raised by yt-dlp for the concurrency controller.
+    :param error: The exception (or error message) to inspect.
+    :return: "rate_limited", "timeout" or None when the error says nothing about load.
+    """
+    if isinstance(error, (socket.timeout, TimeoutError)):
+        return "timeout"
+    message = str(error).lower()
+    if "429" in message or "too many requests" in message:
+        return "rate_limited"
+    if "timed out" in message or "timeout" in message:
+        return "timeout"
+    return None
+
+
+class AIMDLimiter:
+    """
+    Additive-increase / multiplicative-decrease concurrency limit.
+
+    The limit grows by `increase` once per full window of healthy completions
+    (like a TCP congestion window) and is multiplied by `decrease_factor` on
+    overload signals. Decreases are rate limited by `cooldown` seconds so a
+    burst of in-flight failures only counts as one congestion event.
+
+    The latency and throughput baselines are EWMAs that follow every sample,
+    unhealthy ones included, so a lasting change of conditions becomes the
+    new normal and the limit can grow again.
+    """
+
+    def __init__(self, name, initial=2, minimum=1, maximum=16, increase=1.0,
+                 decrease_factor=0.5, latency_tolerance=2.0, collapse_ratio=0.3,
+                 cooldown=5.0):
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance # Allowed latency vs. baseline before we stop growing
+        self.collapse_ratio = collapse_ratio # Throughput below this share of baseline counts as collapse
+        self.cooldown = cooldown
+
+        self._limit = float(max(minimum, min(initial, maximum)))
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._last_decrease = 0.0
+
+        self._latency_baseline = None # EWMA of healthy latencies
+        self._throughput_baseline = None # EWMA of per-slot throughput (bytes/s)
+        self._counters = {"success": 0, "rate_limited": 0, "timeout": 0, "collapse": 0, "error": 0}
+
+    @property
+    def limit(self):
+        """Current integer concurrency limit."""
+        with self._cond:
+            return int(self._limit)
+
+    @property
+    def in_flight(self):
+        """Number of currently held slots."""
+        with self._cond:
+            return self._in_flight
+
+    def acquire(self):
+        """Blocks until a slot is available under the current limit."""
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self):
+        """Returns a slot and wakes up a waiter."""
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify()
+
+    def on_success(self, latency=None, throughput=None):
+        """
+        Records a healthy completion and grows the limit additively.
+        :param latency: Duration of the operation in seconds.
+        :param throughput: Achieved bytes/s, used to detect throughput collapse.
+        """
+        with self._cond:
+            collapsed = throughput is not None and self._throughput_collapsed(throughput)
+            if throughput is not None:
+                self._throughput_baseline = _ewma(self._throughput_baseline, throughput)
+            if collapsed:
+                self._decrease("collapse")
+                return
+            self._counters["success"] += 1
+            healthy = True
+            if latency is not None:
+                if self._latency_baseline is not None:
+                    healthy = latency <= self._latency_baseline * self.latency_tolerance
+                self._latency_baseline = _ewma(self._latency_baseline, latency)
+            if healthy and self._limit < self.maximum:
+                # One full window of successes adds `increase` to the limit
+                self._limit = min(self.maximum, self._limit + self.increase / int(self._limit))
+                self._cond.notify_all()
+
+    def on_overload(self, reason):
+        """
+        Records an overload signal (429, timeout, ...) and cuts the limit.
+        :param reason: Counter name, usually the result of classify_error().
+        """
+        with self._cond:
+            self._decrease(reason)
+
+    def on_error(self):
+        """Records a failure that says nothing about load (e.g. a removed video)."""
+        with self._cond:
+            self._counters["error"] += 1
+
+    def _throughput_collapsed(self, throughput):
+        return (self._throughput_baseline is not None
+                and throughput < self._throughput_baseline * self.collapse_ratio)
+
+    def _decrease(self, reason):
+        self._counters[reason] = self._counters.get(reason, 0) + 1
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._limit = max(float(self.minimum), self._limit * self.decrease_factor)
+
+    @contextmanager
+    def slot(self):
+        """
+        Context manager that holds a slot for the duration of the block and
+        feeds the outcome back into the limit. Bytes transferred inside the
+        block can be reported through `slot.bytes`; the outcome is then judged
+        by throughput alone, since the duration of a transfer grows with its
+        size and says nothing about load.
+        """
+        self.acquire()
+        slot = _Slot()
+        started = time.monotonic()
+        try:
+            yield slot
+        except Exception as e:
+            reason = classify_error(e)
+            if reason:
+                self.on_overload(reason)
+            else:
+                self.on_error()
+            raise
+        else:
+            latency = time.monotonic() - started
+            if slot.bytes and latency > 0:
+                self.on_success(throughput=slot.bytes / latency)
+            else:
+                self.on_success(latency=latency)
+        finally:
+            self.release()
+
+    def metrics(self):
+        """
+        Snapshot of the limiter state.
+        :return: Dictionary with limit, in-flight count, baselines and counters.
+        """
+        with self._cond:
+            return {
+                "limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "latency_baseline": self._latency_baseline,
+                "throughput_baseline": self._throughput_baseline,
+                **self._counters,
+            }
+
+
+def _ewma(baseline, sample, weight=0.2):
+    """Moves `baseline` toward `sample`; the first sample becomes the baseline."""
+    return sample if baseline is None else (1 - weight) * baseline + weight * sample
+
+
+class _Slot:
+    """Per-operation scratch space handed out by AIMDLimiter.slot()."""
+    __slots__ = ("bytes",)
+
+    def __init__(self):
+        self.bytes = 0
+
+
+class ConcurrencyController:
+    """
+    Pair of AIMD limiters in front of VideoDownloader. Extraction talks to the
+    YouTube API endpoints and media transfer to the CDN, so they are tuned
+    independently.
+    """
+
+    def __init__(self, extraction=None, download=None):
+        self.extraction = extraction or AIMDLimiter("extraction", initial=2, maximum=8)
+        self.download = download or AIMDLimiter("download", initial=2, maximum=16)
+
+    def metrics(self):
+        """
+        Current limits of both stages.
+        :return: Dictionary keyed by stage name.
+        """
+        return {
+            "extraction": self.extraction.metrics(),
+            "download": self.download.metrics(),
+        }
+
+
+# Static caps in front of the adaptive limits: the API endpoints throttle
+# after a few parallel extractions, while the media CDN serves many streams
+DEFAULT_HOST_LIMITS = {"youtube.com": 4, "googlevideo.com": 32}
+DEFAULT_EXTRACTOR_LIMITS = {"youtube": 4}
+
+
+class _CountingSemaphore:
+    """Semaphore whose acquisitions may take several units at once."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._in_use = 0
+        self._waiting = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, units):
+        with self._cond:
+            self._waiting += 1
+            while self._in_use + units > self.limit:
+                self._cond.wait()
+            self._waiting -= 1
+            self._in_use += units
+
+    def release(self, units):
+        with self._cond:
+            self._in_use -= units
+            self._cond.notify_all()
+
+    def metrics(self):
+        with self._cond:
+            return {"limit": self.limit, "in_use": self._in_use, "waiting": self._waiting}
+
+
+class SemaphoreRegistry:
+    """
+    Fixed concurrency limits keyed by host and by extractor, shared by every
+    job of the process. Extractor limits count extractions running at once;
+    host limits count connections, so a download fetching N fragments in
+    parallel takes N units of its CDN host's limit. A host limit also covers
+    its subdomains: "googlevideo.com" applies to rr3---sn-abc.googlevideo.com.
+    Hosts and extractors without a configured limit are not limited.
+    """
+
+    def __init__(self, hosts=None, extractors=None):
+        """
+        :param hosts: {host: limit}, defaults to DEFAULT_HOST_LIMITS.
+        :param extractors: {extractor name: limit}, defaults to DEFAULT_EXTRACTOR_LIMITS.
+        """
+        self.hosts = dict(DEFAULT_HOST_LIMITS if hosts is None else hosts)
+        self.extractors = dict(DEFAULT_EXTRACTOR_LIMITS if extractors is None else extractors)
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def host_key(self, host):
+        """
+        :return: The configured host (or parent domain) limiting `host`, or None.
+        """
+        labels = (host or "").lower().split(":")[0].rstrip(".").split(".")
+        for i in range(len(labels) - 1):
+            candidate = ".".join(labels[i:])
+            if candidate in self.hosts:
+                return candidate
+        return None
+
+    @contextmanager
+    def slot(self, extractor=None, hosts=(), units=1):
+        """
+        Context manager holding one unit of the extractor's limit and `units`
+        units of each host's limit (capped at the limit) for the block.
+        :param extractor: Extractor name, e.g. "youtube".
+        :param hosts: Host names the block connects to.
+        :param units: Parallel connections per host, e.g. concurrent fragment downloads.
+        """
+        wanted = []
+        if extractor in self.extractors:
+            wanted.append((f"extractor:{extractor}", self.extractors[extractor], 1))
+        for key in {self.host_key(host) for host in hosts} - {None}:
+            wanted.append((f"host:{key}", self.hosts[key], units))
+        # One global order, so two jobs never wait on each other's semaphores
+        wanted.sort()
+        held = []
+        try:
+            for name, limit, count in wanted:
+                semaphore = self._semaphore(name, limit)
+                count = max(1, min(count, limit))
+                semaphore.acquire(count)
+                held.append((semaphore, count))
+            yield
+        finally:
+            for semaphore, count in reversed(held):
+                semaphore.release(count)
+
+    def _semaphore(self, name, limit):
+        with self._lock:
+            semaphore = self._semaphores.get(name)
+            if semaphore is None:
+                semaphore = self._semaphores[name] = _CountingSemaphore(limit)
+            return semaphore
+
+    def metrics(self):
+        """
+        Usage of every limit used so far.
+        :return: Dictionary keyed by "host:<host>" / "extractor:<name>".
+        """
+        with self._lock:
+            semaphores = dict(self._semaphores)
+        return {name: semaphore.metrics() for name, semaphore in sorted(semaphores.items())}
+
+
+def parse_limit(text):
+    """
+    Parses a NAME=N command-line limit.
+    :return: (name, limit) tuple.
+    :raises ValueError: When the text isn't NAME=N with N >= 1.
+    """
+    name, sep, value = text.partition("=")
+    if not sep or not name.strip() or int(value) < 1:
+        raise ValueError(f"Expected NAME=N with N >= 1, got {text!r}")
+    return name.strip().lower(), int(value)
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def default_semaphore_registry():
+    """The process-wide SemaphoreRegistry used when none is passed explicitly."""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = SemaphoreRegistry()
+        return _default_registry
@@ -0,0 +1,112 @@
+# model/disk_space.py
+import itertools
+import os
+import shutil
+import threading
+
+DEFAULT_KEEP_FREE = 512 * 1024 * 1024 # Never plan to fill the disk beyond this much free space
+MERGE_OVERHEAD = 1.0 # A merge or remux writes its output next to the inputs, deleted only afterwards
+
+
+def expected_bytes(info, clip=None, postprocess=False):
+    """
+    Expected disk usage of downloading the selected format(s).
+    :param info: Processed info dict (format selected): a single format, or
+                 a merge listing them in `requested_formats`.
+    :param clip: (start, end) seconds when only a window is downloaded; the
+                 section_start/section_end of a section download take precedence.
+    :param postprocess: The download is remuxed afterwards (e.g. audio extraction).
+    :return: Bytes including merge overhead, or None when no size is known.
+    """
+    formats = info.get("requested_formats") or [info]
+    duration = info.get("duration")
+    size = 0
+    for fmt in formats:
+        fmt_size = fmt.get("filesize") or fmt.get("filesize_approx")
+        if not fmt_size and fmt.get("tbr") and duration:
+            fmt_size = fmt["tbr"] * 1000 / 8 * duration
+        if not fmt_size:
+            return None
+        size += fmt_size
+    start, end = info.get("section_start"), info.get("section_end")
+    if start is None and clip is not None:
+        start, end = clip
+    if start is not None and duration:
+        end = duration if end is None else min(end, duration)
+        size *= max(0.0, end - start) / duration
+    if len(formats) > 1 or postprocess:
+        size *= 1 + MERGE_OVERHEAD
+    return int(size)
+
+
+def _existing(path):
+    """Nearest existing directory at or above `path` (it may not be created yet)."""
+    path = os.path.abspath(path)
+    while not os.path.exists(path) and os.path.dirname(path) != path:
+        path = os.path.dirname(path)
+    return path
+
+
+class DiskReservations:
+    """
+    Disk-space admission control. Every job reserves its expected size on the
+    filesystem of its target directory. A reservation fits if the free space,
+    minus what admitted jobs have yet to write, minus `keep_free`, covers it.
+    Bytes a job has written already show up in the free space, so reporting
+    progress with update() shrinks its outstanding part.
+    """
+
+    def __init__(self, keep_free=DEFAULT_KEEP_FREE, disk_usage=shutil.disk_usage):
+        """
+        :param keep_free: Bytes that must stay free after all reservations.
+        :param disk_usage: Callable(path) returning an object with `free`;
+                           replaceable for tests.
+        """
+        self.keep_free = keep_free
+        self._disk_usage = disk_usage
+        self._reservations = {} # Token -> [device, reserved bytes, written bytes]
+        self._tokens = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def available(self, path):
+        """Bytes that can still be reserved on the filesystem holding `path`."""
+        path = _existing(path)
+        device = os.stat(path).st_dev
+        with self._lock:
+            return self._available(path, device)
+
+    def reserve(self, path, nbytes):
+        """
+        Reserves `nbytes` on the filesystem holding `path` if they fit.
+        :return: A token for update() and release(), or None if they don't fit.
+        """
+        path = _existing(path)
+        device = os.stat(path).st_dev
+        with self._lock:
+            if nbytes > self._available(path, device):
+                return None
+            token = next(self._tokens)
+            self._reservations[token] = [device, nbytes, 0]
+            return token
+
+    def update(self, token, written):
+        """Records how many of the reserved bytes have been written."""
+        with self._lock:
+            reservation = self._reservations.get(token)
+            if reservation is not None:
+                reservation[2] = written
+
+    def release(self, token):
+        """Drops a reservation once its job finished."""
+        with self._lock:
+            self._reservations.pop(token, None)
+
+    def outstanding(self):
+        """Total bytes reserved and not yet written, over all filesystems."""
+        with self._lock:
+            return sum(max(0, reserved - written) for _, reserved, written in self._reservations.values())
+
+    def _available(self, path, device):
+        outstanding = sum(max(0, reserved - written)
+                          for dev, reserved, written in self._reservations.values() if dev == device)
+        return self._disk_usage(path).free - outstanding - self.keep_free
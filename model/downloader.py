@@ -1,18 +1,187 @@
 # model/downloader.py
-import yt_dlp
 import os
 import re
-import threading # Used for progress callback
+import shutil
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
+from urllib.parse import urlparse
+
+from model.concurrency import default_semaphore_registry
+from model.integrity import DEFAULT_CHECKSUM, StreamHasher, write_manifest
+from model.disk_space import expected_bytes
+from model.job_context import JobCancelled, JobContext, JobDeferred
+from model.job_metadata import JobMetadata
+from model.player_cache import default_player_cache
+
+DEFAULT_FORMAT = 'best[height<=1080]/best' # Best quality up to 1080p
+DEFAULT_MAX_ABR = 160 # kbps ceiling of the audio-only mode; covers YouTube's opus and AAC streams
+EXTRACTOR = 'youtube' # Extractor of every URL is_valid_url() accepts
+EXTRACTION_HOSTS = ('www.youtube.com',) # Hosts extraction talks to, whatever the URL's host
+
+_URL_PATTERNS = [
+    # Standard YouTube URLs
+    r"^(https?://)?(www\.)?(youtube\.com|youtu\.be|m\.youtube\.com)/(watch\?v=|embed/|v/)([a-zA-Z0-9_-]{11})(.*)?$",
+    # YouTube Shorts URLs
+    r"^(https?://)?(www\.)?(youtube\.com|youtu\.be|m\.youtube\.com)/shorts/([a-zA-Z0-9_-]{11})(.*)?$",
+    # youtu.be short URLs
+    r"^(https?://)?(www\.)?youtu\.be/([a-zA-Z0-9_-]{11})(.*)?$"
+]
+
+
+def is_valid_url(url):
+    """
+    Checks that `url` is a YouTube video link (regular, shorts, embed or youtu.be).
+    Needs no VideoDownloader, so callers that only look at URLs don't create one.
+    """
+    return any(re.match(pattern, url) for pattern in _URL_PATTERNS)
+
+
+def video_id(url):
+    """
+    Extracts the 11-character video ID from a YouTube URL.
+    :return: The video ID, or None if the URL isn't recognized.
+    """
+    match = re.search(r"(?:v=|/embed/|/v/|/shorts/|youtu\.be/)([a-zA-Z0-9_-]{11})", url)
+    return match.group(1) if match and is_valid_url(url) else None
+
+
+def audio_format(max_abr=None):
+    """
+    Format selector for the audio-only mode: the best audio-only stream at or
+    below `max_abr` kbps, or the smallest audio-only stream if none is.
+    Video streams are never selected.
+    """
+    return f'bestaudio[abr<={max_abr or DEFAULT_MAX_ABR}]/worstaudio'
+
+
+def parse_time(text):
+    """
+    Parses a time position: seconds ("90", "12.5"), "MM:SS" or "HH:MM:SS".
+    Only the last part may have a fraction, and the parts after the first
+    must be below 60.
+    :return: Seconds as a float.
+    :raises ValueError: If the text isn't a time.
+    """
+    parts = text.strip().split(':')
+    if not 1 <= len(parts) <= 3:
+        raise ValueError(f"Invalid time: {text!r}")
+    seconds = 0.0
+    for i, part in enumerate(parts):
+        last = i == len(parts) - 1
+        if not re.fullmatch(r'\d+(?:\.\d+)?' if last else r'\d+', part):
+            raise ValueError(f"Invalid time: {text!r}")
+        if i and float(part) >= 60:
+            raise ValueError(f"Invalid time: {text!r} (minutes and seconds must be below 60)")
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def check_clip(clip):
+    """
+    Validates a clip window.
+    :param clip: (start, end) in seconds; end may be None for "to the end".
+    :return: The window as a (start, end) tuple of floats.
+    :raises ValueError: If the window is malformed or empty.
+    """
+    try:
+        start, end = clip
+        start = float(start)
+        end = float(end) if end is not None else None
+    except (TypeError, ValueError):
+        raise ValueError("Clip must be [start, end] in seconds.")
+    if start < 0 or (end is not None and end <= start):
+        raise ValueError("Clip end must come after its start.")
+    return start, end
+
+
+def format_time(seconds):
+    """Formats seconds as H:MM:SS(.s) for messages and file names."""
+    tenths = round(seconds * 10) # Rounded once, so 59.96 becomes 0:01:00
+    total, tenth = divmod(tenths, 10)
+    minutes, secs = divmod(total, 60)
+    hours, minutes = divmod(minutes, 60)
+    text = f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{text}.{tenth}" if tenth else text
+
+
+def estimate_video_size(info):
+    """
+    Estimates the bytes the default video mode would have fetched: the best
+    combined audio+video format up to 1080p, as DEFAULT_FORMAT selects.
+    :return: Size in bytes, or None when the formats don't say.
+    """
+    candidates = [f for f in info.get('formats') or ()
+                  if f.get('vcodec') not in (None, 'none') and f.get('acodec') not in (None, 'none')
+                  and (f.get('height') or 0) <= 1080]
+    if not candidates:
+        return None
+    best = candidates[-1] # yt-dlp sorts formats worst to best
+    size = best.get('filesize') or best.get('filesize_approx')
+    if not size and best.get('tbr') and info.get('duration'):
+        size = best['tbr'] * 1000 / 8 * info['duration']
+    return int(size) if size else None
+
+
+def slim_info(info):
+    """
+    Reduces a processed info dict (format selected) to a JobMetadata, so the
+    full dict can be released.
+    """
+    return JobMetadata.from_info(info, full_size=estimate_video_size(info))
+
+class _AdmissionCheck:
+    """
+    yt-dlp 'before_dl' hook: hands the expected size of the selected format to
+    JobContext.admit right before the first byte is written.
+    """
+
+    def __init__(self, context, postprocess):
+        self._context = context
+        self._postprocess = postprocess
+        self._admitted = False
+
+    def set_downloader(self, downloader):
+        pass
+
+    def add_progress_hook(self, hook):
+        pass
+
+    def run(self, info):
+        if not self._admitted: # Clips run it once per section; the first decides
+            self._admitted = True
+            self._context.admit(expected_bytes(info, self._context.clip, self._postprocess))
+        return [], info
 
 class VideoDownloader:
-    def __init__(self, save_path="downloads"):
+    def __init__(self, save_path="downloads", concurrency=None, process_pool=None, process_jobs=False,
+                 player_cache=None, checksum=DEFAULT_CHECKSUM, limits=None):
         """
         Initialize the downloader with a default save path.
+        :param concurrency: Optional ConcurrencyController that gates extraction
+                            and media transfer with adaptive limits.
+        :param process_pool: Optional ProcessPool; extraction then runs in its
+                             warm worker processes instead of this thread.
+        :param process_jobs: Run whole downloads (not only extraction) in the pool.
+        :param player_cache: PlayerCache shared by every YoutubeDL this downloader
+                             creates; defaults to the process-wide one.
+        :param checksum: Algorithm of the checksum computed while downloading and
+                         stored in a manifest next to each file (see
+                         model.integrity); None disables both.
+        :param limits: SemaphoreRegistry with the per-host and per-extractor
+                       limits; defaults to the process-wide one.
         """
         self._save_path = save_path # Private attribute for internal use
         self._on_progress_callback = None
         self._on_complete_callback = None
+        self._concurrency = concurrency
+        self._process_pool = process_pool
+        self._process_jobs = process_jobs and process_pool is not None
+        self._player_cache = player_cache or default_player_cache()
+        self._checksum = checksum
+        self._limits = limits or default_semaphore_registry()
+        if checksum:
+            StreamHasher(checksum) # Reject an unknown algorithm up front
 
         self._ensure_save_path_exists()
 
@@ -39,15 +208,61 @@ class VideoDownloader:
 
     def set_callbacks(self, on_progress=None, on_complete=None):
         """
-        Sets the progress and completion callback functions.
+        Sets the default progress and completion callback functions, used by
+        download_video() when no JobContext is given.
         :param on_progress: A function to call during download progress.
-                            Signature: (stream, chunk, bytes_remaining)
+                            Signature: (bytes_downloaded, total_bytes)
         :param on_complete: A function to call when download is complete.
                             Signature: (status_message, is_success)
         """
         self._on_progress_callback = on_progress
         self._on_complete_callback = on_complete
 
+    @property
+    def concurrency(self):
+        """The ConcurrencyController in use, or None when unlimited."""
+        return self._concurrency
+
+    @property
+    def limits(self):
+        """The SemaphoreRegistry holding the per-host and per-extractor limits."""
+        return self._limits
+
+    @property
+    def checksum(self):
+        """Checksum algorithm of the download manifests, or None."""
+        return self._checksum
+
+    @property
+    def player_cache(self):
+        """The PlayerCache holding solved player JS data."""
+        return self._player_cache
+
+    @property
+    def process_pool(self):
+        """The ProcessPool used for extraction, or None when running in-process."""
+        return self._process_pool
+
+    @contextmanager
+    def _stage_slot(self, stage, hosts=(), units=1):
+        """
+        Holds the limits of the given stage ("extraction" or "download") for
+        the block: first the fixed per-extractor and per-host limits, then a
+        slot of the ConcurrencyController, if any. Yields that slot or None.
+        :param hosts: Hosts a download connects to; extraction always counts
+                      against EXTRACTOR and EXTRACTION_HOSTS.
+        :param units: Parallel connections per host.
+        """
+        if stage == 'extraction':
+            limits = self._limits.slot(EXTRACTOR, EXTRACTION_HOSTS)
+        else:
+            limits = self._limits.slot(hosts=hosts, units=units)
+        with limits:
+            if self._concurrency is None:
+                yield None
+            else:
+                with getattr(self._concurrency, stage).slot() as slot:
+                    yield slot
 
     def is_valid_url(self, url):
         """
@@ -55,68 +270,227 @@ class VideoDownloader:
         This provides a preliminary check; pytube will do a more robust one.
         Supports regular videos, shorts, and various YouTube URL formats.
         """
-        # Updated regex to support YouTube Shorts and other formats
-        patterns = [
-            # Standard YouTube URLs
-            r"^(https?://)?(www\.)?(youtube\.com|youtu\.be|m\.youtube\.com)/(watch\?v=|embed/|v/)([a-zA-Z0-9_-]{11})(.*)?$",
-            # YouTube Shorts URLs
-            r"^(https?://)?(www\.)?(youtube\.com|youtu\.be|m\.youtube\.com)/shorts/([a-zA-Z0-9_-]{11})(.*)?$",
-            # youtu.be short URLs
-            r"^(https?://)?(www\.)?youtu\.be/([a-zA-Z0-9_-]{11})(.*)?$"
-        ]
-        
-        return any(re.match(pattern, url) for pattern in patterns)
+        return is_valid_url(url)
+
+    def video_id(self, url):
+        """
+        Extracts the 11-character video ID from a YouTube URL.
+        :return: The video ID, or None if the URL isn't recognized.
+        """
+        return video_id(url)
 
-    def _yt_dlp_progress_callback(self, d):
+    def create_context(self, url, **kwargs):
+        """
+        Creates a JobContext from the downloader's current defaults. The save
+        path is captured now, so later changes don't affect the job.
+        :param kwargs: Overrides for JobContext arguments.
+        :return: A new JobContext.
+        """
+        kwargs.setdefault('on_progress', self._on_progress_callback)
+        kwargs.setdefault('on_complete', self._on_complete_callback)
+        return JobContext(url, kwargs.pop('save_path', None) or self._save_path, **kwargs)
+
+    def extract_info(self, url):
+        """
+        Extracts video information without downloading, e.g. for a preview.
+        Pass the result to the download as JobContext.info so the video isn't
+        extracted a second time.
+        :param url: YouTube video link
+        :return: The yt-dlp info dict.
+        """
+        import yt_dlp # Imported on first use, it dominates start-up time
+
+        with self._stage_slot('extraction'):
+            if self._process_pool is not None:
+                return self._process_pool.extract(url).result()
+            opts = {'format': DEFAULT_FORMAT, 'quiet': True, 'no_warnings': True, **self._player_cache.options()}
+            with yt_dlp.YoutubeDL(opts) as ydl:
+                return ydl.extract_info(url, download=False)
+
+    def _yt_dlp_progress_callback(self, context, d):
         """
         Progress callback for yt-dlp.
         """
+        for sink in context.sinks:
+            sink(d)
         if d['status'] == 'downloading':
             if 'total_bytes' in d and d['total_bytes']:
-                bytes_downloaded = d.get('downloaded_bytes', 0)
-                total_bytes = d['total_bytes']
-                
-                if self._on_progress_callback:
-                    self._on_progress_callback(bytes_downloaded, total_bytes)
+                context.report_progress(d.get('downloaded_bytes', 0), d['total_bytes'])
             elif 'total_bytes_estimate' in d and d['total_bytes_estimate']:
-                bytes_downloaded = d.get('downloaded_bytes', 0)
-                total_bytes = d['total_bytes_estimate']
-
-                if self._on_progress_callback:
-                    self._on_progress_callback(bytes_downloaded, total_bytes)
-        elif d['status'] == 'finished':
+                context.report_progress(d.get('downloaded_bytes', 0), d['total_bytes_estimate'])
+        elif d['status'] == 'finished' and not context.options.get('quiet'):
             # Here we can use the filename for confirmation, printing or logging purposes
             print(f"\n✅ Download completed: {d['filename']}")
 
-    def download_video(self, url):
+    def download_video(self, url, context=None):
         """
         Downloads the video from the provided URL using yt-dlp.
+        Safe to call from many threads at once: all per-job state lives in the context.
         :param url: YouTube video link
-        :return: None (result is communicated via callbacks)
+        :param context: Optional JobContext; built from the downloader defaults when omitted.
+        :return: None (result is communicated via the context's callbacks)
         """
+        if context is None:
+            context = self.create_context(url)
+        url = context.url
+
         if not self.is_valid_url(url):
-            if self._on_complete_callback:
-                self._on_complete_callback("Invalid YouTube URL format.", False)
+            context.error = "InvalidURL"
+            context.report_complete("Invalid YouTube URL format.", False)
+            return
+
+        if context.clip is not None and not shutil.which('ffmpeg'):
+            context.error = "FFmpegNotFound"
+            context.report_complete("Clipping needs ffmpeg, which was not found on PATH.", False)
             return
 
+        if self._process_jobs:
+            self._download_in_process_pool(context)
+            return
+
+        import yt_dlp # Imported on first use, it dominates start-up time
+
+        transferred = {'bytes': 0}
+
+        def track_transfer(d):
+            # Final byte count of the job, used for throughput-collapse detection
+            if d['status'] == 'finished':
+                transferred['bytes'] += d.get('total_bytes') or d.get('downloaded_bytes') or 0
+
         try:
-            ydl_opts = {
-                'format': 'best[height<=1080]/best',  # Best quality up to 1080p
-                'outtmpl': str(Path(self._save_path) / '%(title)s.%(ext)s'),
-                'progress_hooks': [self._yt_dlp_progress_callback]
-            }
+            ydl_opts = self._ydl_options(context)
+            ydl_opts['progress_hooks'] = [partial(self._yt_dlp_progress_callback, context), track_transfer]
+            hasher = StreamHasher(self._checksum) if self._checksum else None
+            if hasher is not None:
+                ydl_opts['progress_hooks'].append(hasher)
 
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info_dict = ydl.extract_info(url, download=False)
-                video_title = info_dict.get('title', 'Unknown')
-                ydl.download([url])
+                if context.admit is not None:
+                    ydl.add_post_processor(_AdmissionCheck(context, 'postprocessors' in ydl_opts), when='before_dl')
+                # Extraction and media transfer are limited separately, so
+                # the extracted info is reused instead of calling ydl.download()
+                # A preview may already have extracted the video, and a job
+                # put back in the queue keeps the record of its first attempt
+                meta = context.info
+                if not isinstance(meta, JobMetadata):
+                    info_dict = meta
+                    if info_dict is None and self._process_pool is None:
+                        with self._stage_slot('extraction'):
+                            info_dict = ydl.extract_info(url, download=False) # Selected for this job
+                    else:
+                        if info_dict is None:
+                            with self._stage_slot('extraction'):
+                                info_dict = self._process_pool.extract(url).result()
+                        if ydl_opts.get('format') != DEFAULT_FORMAT:
+                            # Previews and the pool select the default video format
+                            info_dict = ydl.process_ie_result(info_dict, download=False)
+                    # From here on only the selected format is needed
+                    meta = slim_info(info_dict)
+                    context.info = info_dict = None
+                video_title = meta.get('title', 'Unknown')
+                if context.cancelled:
+                    raise JobCancelled("Download cancelled.")
+                download_info = meta.to_info()
+                hosts = [urlparse(f.get('url') or '').hostname for f in meta.formats]
+                units = ydl_opts.get('concurrent_fragment_downloads') or 1
+                with self._stage_slot('download', hosts, units) as slot:
+                    download_info = ydl.process_ie_result(download_info, download=True)
+                    if slot is not None:
+                        slot.bytes = transferred['bytes']
+                downloads = download_info.get('requested_downloads') or [{}]
+                context.filepath = downloads[0].get('filepath') or download_info.get('filepath')
+                if hasher is not None and context.filepath and os.path.isfile(context.filepath):
+                    manifest = write_manifest(context.filepath, hasher, download_info)
+                    context.digest = f"{manifest['algorithm']}:{manifest['digest']}"
 
-                if self._on_complete_callback:
-                    self._on_complete_callback(f"Successfully downloaded: \"{video_title}\"", True)
+                if context.clip is not None:
+                    context.report_complete(self._clip_summary(context, meta, video_title, transferred['bytes']), True)
+                elif context.audio_only:
+                    context.report_complete(self._audio_summary(context, meta, video_title, transferred['bytes']), True)
+                else:
+                    context.report_complete(f"Successfully downloaded: \"{video_title}\"", True)
 
+        except JobDeferred:
+            context.info = meta # Kept so the retry doesn't extract again
+            raise
+        except JobCancelled:
+            context.error = "JobCancelled"
+            context.report_complete("Download cancelled.", False)
         except yt_dlp.DownloadError as e:
-            if self._on_complete_callback:
-                self._on_complete_callback(f"Error: Download failed - {str(e)}", False)
+            context.error = type(e).__name__
+            context.report_complete(f"Error: Download failed - {str(e)}", False)
+        except Exception as e:
+            context.error = type(e).__name__
+            context.report_complete(f"An unexpected error occurred: {str(e)}", False)
+        finally:
+            self._player_cache.trim() # Throttled, usually a no-op
+
+    def _audio_summary(self, context, meta, video_title, audio_bytes):
+        """Records the savings of an audio-only job and returns its completion message."""
+        message = f"Successfully downloaded audio: \"{video_title}\" ({audio_bytes / (1024 * 1024):.1f} MB"
+        video_bytes = meta.full_size
+        if video_bytes and audio_bytes:
+            context.saved_bytes = max(0, video_bytes - audio_bytes)
+            message += f", saved {context.saved_bytes / (1024 * 1024):.1f} MB vs. video"
+        return message + ")"
+
+    def _ydl_options(self, context):
+        """
+        Builds the yt-dlp options of a job: format, output template, and the
+        audio-only and clip settings. Progress hooks are added by the caller.
+        """
+        import yt_dlp
+
+        ydl_opts = {
+            'format': DEFAULT_FORMAT,
+            'outtmpl': str(Path(context.save_path) / '%(title)s.%(ext)s'),
+            **self._player_cache.options(),
+        }
+        if context.audio_only:
+            ydl_opts['format'] = audio_format(context.max_abr)
+            if shutil.which('ffmpeg'):
+                # 'best' keeps the codec: the stream is copied into an audio
+                # container (opus, m4a), never re-encoded
+                ydl_opts['postprocessors'] = [{'key': 'FFmpegExtractAudio', 'preferredcodec': 'best'}]
+        if context.clip is not None:
+            start, end = context.clip
+            # ffmpeg seeks through the container index and fetches only the
+            # byte ranges covering the window; cuts land on keyframes, so
+            # nothing is re-encoded
+            ydl_opts['download_ranges'] = yt_dlp.utils.download_range_func(
+                None, [(start, end if end is not None else float('inf'))])
+            ydl_opts['force_keyframes_at_cuts'] = False
+            ydl_opts['outtmpl'] = str(Path(context.save_path) / '%(title)s [%(section_start)s-%(section_end)s].%(ext)s')
+        ydl_opts.update(context.options)
+        return ydl_opts
+
+    def _clip_summary(self, context, meta, video_title, clip_bytes):
+        """Returns the completion message of a clip job, with the transfer compared to the full video."""
+        start, end = context.clip
+        window = f"{format_time(start)}-{format_time(end) if end is not None else 'end'}"
+        message = f"Successfully downloaded clip {window} of \"{video_title}\" ({clip_bytes / (1024 * 1024):.1f} MB"
+        full_bytes = meta.full_size
+        if full_bytes:
+            message += f" of ~{full_bytes / (1024 * 1024):.1f} MB for the whole video"
+        return message + ")"
+
+    def _download_in_process_pool(self, context):
+        """
+        Runs the whole download in a worker of the process pool and reports the
+        result through the context's callbacks. Progress is streamed back by the pool.
+        """
+        try:
+            with self._stage_slot('download'):
+                future = self._process_pool.run_job(context.url, context.save_path, on_progress=context.report_progress,
+                                                    audio_only=context.audio_only, max_abr=context.max_abr,
+                                                    clip=context.clip, checksum=self._checksum)
+                result = future.result()
+            message, is_success = result['message'], result['success']
+            context.filepath = result['filepath']
+            context.error = result['error']
+            context.saved_bytes = result['saved_bytes']
+            context.digest = result['digest']
         except Exception as e:
-            if self._on_complete_callback:
-                self._on_complete_callback(f"An unexpected error occurred: {str(e)}", False)
+            message, is_success = f"An unexpected error occurred: {str(e)}", False
+            context.error = type(e).__name__
+        context.report_complete(message, is_success)
@@ -0,0 +1,272 @@
+# model/history.py
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from model.state import state_dir
+
+HISTORY_FILE = "history.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS downloads (
+    id INTEGER PRIMARY KEY, -- Insertion order, used for keyset paging
+    finished_at REAL NOT NULL,
+    video_id TEXT,
+    url TEXT NOT NULL,
+    title TEXT,
+    state TEXT NOT NULL,
+    path TEXT,
+    bytes INTEGER,
+    duration REAL,
+    speed REAL,
+    error TEXT,
+    digest TEXT
+);
+CREATE INDEX IF NOT EXISTS downloads_video_id ON downloads (video_id);
+CREATE INDEX IF NOT EXISTS downloads_state ON downloads (state, id);
+CREATE INDEX IF NOT EXISTS downloads_finished_at ON downloads (finished_at);
+CREATE INDEX IF NOT EXISTS downloads_error ON downloads (error) WHERE error IS NOT NULL;
+-- Running all-time totals, updated with every batch of inserted rows
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    count INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    bytes INTEGER NOT NULL,
+    speed_sum REAL NOT NULL,
+    speed_count INTEGER NOT NULL
+);
+"""
+
+# Sums up databases from before the totals table; run only when it has no row,
+# since the aggregate reads every row before any conflict could be detected
+_BACKFILL_TOTALS = """
+INSERT OR IGNORE INTO totals
+    SELECT 1, count(*), coalesce(sum(state = 'completed'), 0), coalesce(sum(state = 'failed'), 0),
+           coalesce(sum(bytes), 0), coalesce(sum(speed), 0), count(speed)
+    FROM downloads
+"""
+
+COLUMNS = ("id", "finished_at", "video_id", "url", "title", "state", "path", "bytes", "duration", "speed",
+           "error", "digest")
+
+_STOP = object()
+
+_STATE = COLUMNS.index("state") - 1 # Positions in a history_row() tuple
+_BYTES = COLUMNS.index("bytes") - 1
+_SPEED = COLUMNS.index("speed") - 1
+
+_UPDATE_TOTALS = """
+UPDATE totals SET count = count + ?, completed = completed + ?, failed = failed + ?, bytes = bytes + ?,
+                  speed_sum = speed_sum + ?, speed_count = speed_count + ?
+WHERE id = 1
+"""
+
+
+def history_row(job, video_id=None):
+    """
+    Turns a finished job into a history row (without the ID).
+    :param job: Job dictionary as returned by Job.to_dict().
+    :param video_id: The job's video ID, if known.
+    :return: Tuple in COLUMNS order, minus "id".
+    """
+    finished_at = job.get("finished_at") or time.time()
+    duration = finished_at - job["started_at"] if job.get("started_at") else None
+    # The last progress event may lag behind the end of a completed download
+    size = job.get("total_bytes") if job["state"] == "completed" else job.get("bytes_downloaded")
+    size = size or job.get("bytes_downloaded") or 0
+    speed = size / duration if duration and size else None
+    return (finished_at, video_id, job["url"], job.get("title"), job["state"], job.get("path"), size,
+            duration, speed, job.get("error"), job.get("digest"))
+
+
+def _totals(rows):
+    """Increments of the totals row for a batch of history rows, in _UPDATE_TOTALS order."""
+    speeds = [row[_SPEED] for row in rows if row[_SPEED] is not None]
+    return (len(rows), sum(row[_STATE] == "completed" for row in rows),
+            sum(row[_STATE] == "failed" for row in rows), sum(row[_BYTES] or 0 for row in rows),
+            sum(speeds), len(speeds))
+
+
+class DownloadHistory:
+    """
+    SQLite record of every finished job. record() only puts the row on a
+    queue; a background thread writes whatever has accumulated in one
+    transaction every `flush_interval` seconds, so downloads never wait for
+    the disk. Queries page by row ID (keyset pagination) and go through
+    indexes, and all-time totals are kept in a one-row table updated with
+    each batch, so they cost the same with millions of rows as with a few.
+    """
+
+    def __init__(self, path=None, flush_interval=1.0, batch_size=1000):
+        """
+        :param path: Database file, defaults to history.sqlite3 in the state directory.
+        :param flush_interval: Maximum seconds a row waits before it is written.
+        :param batch_size: Maximum rows per transaction.
+        """
+        self.path = path or os.path.join(state_dir(), HISTORY_FILE)
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._close_lock = threading.Lock() # Orders record() against the stop marker
+        self._local = threading.local() # Read connection per thread
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+            if db.execute("SELECT 1 FROM totals").fetchone() is None:
+                db.execute(_BACKFILL_TOTALS)
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self._writer.start()
+
+    def record(self, job, video_id=None):
+        """
+        Queues a finished job for writing. Safe to call from any thread.
+        After close() the row can't be written any more; that is reported.
+        :param job: Job dictionary as returned by Job.to_dict().
+        :param video_id: The job's video ID, if known.
+        :return: False if the history was already closed.
+        """
+        with self._close_lock:
+            if not self._closed:
+                self._queue.put(history_row(job, video_id))
+                return True
+        print(f"Download history closed, not recorded: {job['url']} ({job['state']})")
+        return False
+
+    def flush(self, timeout=10):
+        """
+        Blocks until everything recorded so far is written.
+        :return: False on timeout.
+        """
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Writes the pending rows and stops the writer thread."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._writer.join()
+
+    def page(self, before_id=None, limit=50, state=None):
+        """
+        Rows newest first, starting below `before_id`.
+        :param before_id: ID of the last row of the previous page; None for the newest.
+        :param state: Only rows in this state ("completed", "failed", "cancelled").
+        :return: List of row dicts.
+        """
+        where, params = self._filter(state)
+        if before_id is not None:
+            where.append("id < ?")
+            params.append(before_id)
+        return self._query(f"SELECT * FROM downloads {self._where(where)} ORDER BY id DESC LIMIT ?",
+                           params + [limit])
+
+    def page_after(self, after_id, limit=50, state=None):
+        """
+        Rows just newer than `after_id`, newest first (for scrolling back up).
+        """
+        where, params = self._filter(state)
+        where.append("id > ?")
+        params.append(after_id)
+        rows = self._query(f"SELECT * FROM downloads {self._where(where)} ORDER BY id LIMIT ?", params + [limit])
+        rows.reverse()
+        return rows
+
+    def last_id(self):
+        """ID of the newest row (0 when empty); IDs grow by one per row, so it approximates the count."""
+        return self._execute("SELECT max(id) FROM downloads", ()).fetchone()[0] or 0
+
+    def for_video(self, video_id, limit=100):
+        """Every download of one video, newest first."""
+        return self._query("SELECT * FROM downloads WHERE video_id = ? ORDER BY id DESC LIMIT ?", [video_id, limit])
+
+    def stats(self, since=None):
+        """
+        Totals of the downloads finished after `since` (epoch seconds; None for all).
+        All-time totals come from the running totals, not from the rows.
+        :return: Dict with count, completed, failed, bytes and average speed.
+        """
+        if since is None:
+            row = self._execute("SELECT count, completed, failed, bytes, speed_sum / nullif(speed_count, 0) "
+                                "FROM totals", ()).fetchone()
+        else:
+            row = self._execute(
+                "SELECT count(*), sum(state = 'completed'), sum(state = 'failed'), sum(bytes), avg(speed) "
+                "FROM downloads WHERE finished_at >= ?", (since,)).fetchone()
+        return {"count": row[0], "completed": row[1] or 0, "failed": row[2] or 0, "bytes": row[3] or 0,
+                "average_speed": row[4]}
+
+    def error_counts(self, limit=20):
+        """
+        :return: [(error class, count)] of failed downloads, most frequent first.
+        """
+        return self._execute(
+            "SELECT error, count(*) AS n FROM downloads WHERE error IS NOT NULL "
+            "GROUP BY error ORDER BY n DESC LIMIT ?", (limit,)).fetchall()
+
+    def _filter(self, state):
+        return (["state = ?"], [state]) if state else ([], [])
+
+    def _where(self, conditions):
+        return "WHERE " + " AND ".join(conditions) if conditions else ""
+
+    def _query(self, sql, params):
+        return [dict(zip(COLUMNS, row)) for row in self._execute(sql, params)]
+
+    def _execute(self, sql, params):
+        """Runs a read query on the calling thread's connection."""
+        return self._connect().execute(sql, params)
+
+    def _connect(self):
+        """The calling thread's connection."""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL") # Readers don't block the writer
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def _write_loop(self):
+        db = self._connect()
+        stopping = False
+        while not stopping:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            # Wait a moment so one transaction covers whatever arrives meanwhile
+            if first is not _STOP and not isinstance(first, threading.Event):
+                time.sleep(self.flush_interval)
+            rows, waiters = [], []
+            item = first
+            while True:
+                if item is _STOP:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    rows.append(item)
+                if len(rows) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if rows:
+                try:
+                    with db:
+                        db.executemany(f"INSERT INTO downloads ({', '.join(COLUMNS[1:])}) "
+                                       f"VALUES ({', '.join('?' * (len(COLUMNS) - 1))})", rows)
+                        db.execute(_UPDATE_TOTALS, _totals(rows))
+                except sqlite3.Error as e:
+                    print(f"Could not write download history: {e}")
+            for waiter in waiters:
+                waiter.set()
+        db.close()
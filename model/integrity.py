@@ -0,0 +1,156 @@
+# model/integrity.py
+import hashlib
+import json
+import os
+import time
+
+ALGORITHMS = ("sha256", "blake2b", "xxh64", "xxh3_128") # xxh* need the optional xxhash package
+DEFAULT_CHECKSUM = "sha256"
+MANIFEST_SUFFIX = ".manifest.json"
+CHUNK_SIZE = 1024 * 1024
+
+
+def new_hash(algorithm):
+    """
+    Creates an incremental hash object with update() and hexdigest().
+    :raises ValueError: If the algorithm isn't one of ALGORITHMS.
+    :raises ImportError: For xxh* when xxhash isn't installed.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown checksum algorithm: {algorithm} (use one of {', '.join(ALGORITHMS)})")
+    if algorithm.startswith("xxh"):
+        import xxhash # Optional dependency, only needed for the xxh* checksums
+
+        return getattr(xxhash, algorithm)()
+    return hashlib.new(algorithm)
+
+
+def hash_file(path, algorithm=DEFAULT_CHECKSUM):
+    """
+    Hashes a whole file.
+    :return: (size, hex digest).
+    """
+    digest = new_hash(algorithm)
+    size = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+
+class StreamHasher:
+    """
+    yt-dlp progress hook that hashes files while they are written. On every
+    progress update the bytes appended to the partial file since the last
+    update are read back, while still in the page cache, and fed to the hash;
+    when the file is finished its digest is ready without another pass.
+    """
+
+    def __init__(self, algorithm=DEFAULT_CHECKSUM):
+        """
+        :param algorithm: One of ALGORITHMS.
+        """
+        new_hash(algorithm) # Fail before the download starts
+        self.algorithm = algorithm
+        self.results = {} # Absolute path of a finished file -> {"format_id", "size", "digest"}
+        self._active = {} # Path being written -> [hash object, bytes hashed]
+
+    def __call__(self, d):
+        if d['status'] == 'downloading':
+            path = d.get('tmpfilename') or d.get('filename')
+            if path:
+                self._feed(path, path, d.get('downloaded_bytes'))
+        elif d['status'] == 'finished' and d.get('filename'):
+            path = d['filename']
+            # The partial file was renamed to its final name just before this update
+            key = d.get('tmpfilename') or (path + ".part" if path + ".part" in self._active else path)
+            state = self._feed(key, path)
+            self._active.pop(key, None)
+            if state is not None:
+                self.results[os.path.abspath(path)] = {
+                    "format_id": (d.get('info_dict') or {}).get('format_id'),
+                    "size": state[1],
+                    "digest": state[0].hexdigest(),
+                }
+
+    def _feed(self, key, path, written=None):
+        """Hashes the bytes of `path` past what was hashed for `key` so far."""
+        state = self._active.get(key)
+        if state is None or (written is not None and written < state[1]):
+            # New file, or yt-dlp couldn't resume and started over
+            state = self._active[key] = [new_hash(self.algorithm), 0]
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size < state[1]:
+                    state[0], state[1] = new_hash(self.algorithm), 0
+                f.seek(state[1])
+                while chunk := f.read(CHUNK_SIZE):
+                    state[0].update(chunk)
+                    state[1] += len(chunk)
+        except OSError:
+            return None # Not on disk (yet), e.g. written by an external downloader
+        return state
+
+
+def manifest_path(filepath):
+    """Path of the manifest stored next to a downloaded file."""
+    return filepath + MANIFEST_SUFFIX
+
+
+def write_manifest(filepath, hasher, info=None):
+    """
+    Writes the manifest of a finished download next to it: size, checksum
+    and the source format. The streamed digest is used when the file is the
+    one that was downloaded; files produced by post-processing (a merge, an
+    audio remux) are hashed once here, and their downloaded inputs are
+    listed as parts.
+    :param filepath: Final file of the download.
+    :param hasher: The StreamHasher that watched the download.
+    :param info: The processed info dict, for the video and format IDs.
+    :return: The manifest dict.
+    """
+    info = info or {}
+    size = os.path.getsize(filepath)
+    entry = hasher.results.get(os.path.abspath(filepath))
+    streamed = entry is not None and entry["size"] == size
+    digest = entry["digest"] if streamed else hash_file(filepath, hasher.algorithm)[1]
+    manifest = {
+        "file": os.path.basename(filepath),
+        "size": size,
+        "algorithm": hasher.algorithm,
+        "digest": digest,
+        "streamed": streamed,
+        "video_id": info.get("id"),
+        "format_id": info.get("format_id") or (entry or {}).get("format_id"),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+    if not streamed and hasher.results:
+        manifest["parts"] = [dict(part, file=os.path.basename(path)) for path, part in hasher.results.items()]
+    path = manifest_path(filepath)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, path)
+    return manifest
+
+
+def verify_manifest(path):
+    """
+    Checks a downloaded file against its manifest.
+    :param path: The manifest, or the file it describes.
+    :return: (ok, message).
+    """
+    if not path.endswith(MANIFEST_SUFFIX):
+        path = manifest_path(path)
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        filepath = os.path.join(os.path.dirname(path), manifest["file"])
+        if os.path.getsize(filepath) != manifest["size"]:
+            return False, f"{manifest['file']}: size differs from the manifest"
+        if hash_file(filepath, manifest["algorithm"])[1] != manifest["digest"]:
+            return False, f"{manifest['file']}: {manifest['algorithm']} checksum mismatch"
+    except (OSError, ValueError, KeyError) as e:
+        return False, f"{path}: {e}"
+    return True, f"{manifest['file']}: OK"
@@ -0,0 +1,84 @@
+# model/job_context.py
+import itertools
+import threading
+
+_job_ids = itertools.count(1)
+
+
+class JobCancelled(Exception):
+    """Raised inside the download path once a job's cancel event is set."""
+
+
+class JobDeferred(Exception):
+    """
+    Raised by JobContext.admit when the job can't start yet (e.g. not enough
+    disk space). The download stops before writing anything and reports no
+    result, so the caller can queue the job again.
+    """
+
+
+class JobContext:
+    """
+    Everything a single download needs, passed through the download path
+    instead of being stored on the VideoDownloader. One downloader can then
+    run many jobs in parallel, each with its own save path, options and
+    callbacks.
+    """
+
+    def __init__(self, url, save_path, job_id=None, options=None, on_progress=None,
+                 on_complete=None, sinks=None, cancel_event=None, info=None,
+                 audio_only=False, max_abr=None, clip=None, admit=None):
+        """
+        :param url: YouTube video link.
+        :param save_path: Directory the file is written to (fixed for the job).
+        :param job_id: Identifier of the job; generated when omitted.
+        :param options: Extra yt-dlp options overriding the downloader defaults.
+        :param on_progress: Called as (bytes_downloaded, total_bytes).
+        :param on_complete: Called as (status_message, is_success).
+        :param sinks: Callables receiving every raw yt-dlp progress dict.
+        :param cancel_event: threading.Event that aborts the job when set.
+        :param info: Already extracted info dict (e.g. from a preview), or the
+                     JobMetadata of an earlier attempt; skips extraction. The
+                     downloader replaces it with a JobMetadata once the format is selected.
+        :param audio_only: Fetch only an audio stream instead of the video.
+        :param max_abr: Audio bitrate ceiling in kbps for audio_only; None uses the default.
+        :param clip: (start, end) in seconds to download only that part; end None means to the end.
+        :param admit: Called with the expected size in bytes (or None if unknown)
+                      once the format is selected, before anything is written.
+                      May raise JobDeferred to hold the job back.
+        """
+        self.job_id = job_id if job_id is not None else str(next(_job_ids))
+        self.url = url
+        self.save_path = save_path
+        self.options = dict(options or {})
+        self.on_progress = on_progress
+        self.on_complete = on_complete
+        self.sinks = list(sinks or [])
+        self.cancel_event = cancel_event or threading.Event()
+        self.info = info
+        self.audio_only = audio_only
+        self.max_abr = max_abr
+        self.clip = tuple(clip) if clip else None
+        self.admit = admit
+        # Outcome details, set by the downloader before report_complete()
+        self.filepath = None # Path of the downloaded file
+        self.error = None # Class name of the error that failed the job
+        self.saved_bytes = None # Audio-only: bytes saved compared with the video download
+        self.digest = None # "<algorithm>:<hex>" checksum of the file, also in its manifest
+
+    @property
+    def cancelled(self):
+        """True once the cancel event is set."""
+        return self.cancel_event.is_set()
+
+    def report_progress(self, bytes_downloaded, total_bytes):
+        """Forwards progress to on_progress, aborting if the job was cancelled."""
+        if self.cancelled:
+            raise JobCancelled("Download cancelled.")
+        if self.on_progress:
+            self.on_progress(bytes_downloaded, total_bytes)
+
+    def report_complete(self, message, is_success):
+        """Forwards the final result to on_complete."""
+        if self.on_complete:
+            self.on_complete(message, is_success)
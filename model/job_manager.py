@@ -0,0 +1,539 @@
+# model/job_manager.py
+import collections
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from model.disk_space import DiskReservations, expected_bytes
+from model.downloader import VideoDownloader, slim_info
+from model.integrity import DEFAULT_CHECKSUM
+from model.job_context import JobCancelled # Re-exported, raised when a job is cancelled mid-download
+from model.job_context import JobDeferred
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINAL_STATES = (COMPLETED, FAILED, CANCELLED)
+
+MAX_THREADS = 64 # Hard cap on worker threads; max_workers can be changed at runtime below it
+INFO_MAX_AGE = 1800 # Seconds pre-extracted info stays usable; its media URLs expire
+
+
+class Job:
+    """
+    State of a single download submitted to the JobManager.
+    """
+
+    def __init__(self, url, save_path, info=None, audio_only=False, max_abr=None, clip=None, info_time=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.url = url
+        self.save_path = save_path
+        self.audio_only = audio_only
+        self.max_abr = max_abr # Audio bitrate ceiling in kbps, None for the default
+        self.clip = list(clip) if clip else None # [start, end] seconds, end None for the rest
+        self.title = info.get("title") if info else None
+        self.expected_bytes = expected_bytes(info, clip, audio_only) if info else None # Disk space needed
+        # Pre-extracted info, handed to the download. A preview selected the
+        # default video format, so for video jobs only that format is kept
+        if info and not audio_only and info.get("format_id"):
+            info = slim_info(info)
+        self.info = info
+        # Monotonic time `info` was extracted; checked again when the job starts
+        self.info_time = (info_time or time.monotonic()) if info else None
+        self.state = QUEUED
+        self.message = ""
+        self.bytes_downloaded = 0
+        self.total_bytes = 0
+        self.speed = 0.0 # Smoothed bytes/s
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.path = None # Downloaded file, once completed
+        self.error = None # Error class name, once failed
+        self.saved_bytes = None # Audio-only: bytes saved compared with the video download
+        self.digest = None # "<algorithm>:<hex>" checksum of the file, once completed
+
+        self._lock = threading.Lock()
+        self._cancel_event = threading.Event()
+        self._done_event = threading.Event()
+        self._last_sample = None # (monotonic time, bytes) of the previous progress event
+        self._reservation = None # Disk-space reservation token while running
+
+    @property
+    def done(self):
+        """True once the job reached a final state."""
+        return self._done_event.is_set()
+
+    @property
+    def cancel_requested(self):
+        """True once cancel() was called for this job."""
+        return self._cancel_event.is_set()
+
+    @property
+    def eta(self):
+        """Estimated seconds until completion, or None when unknown."""
+        if self.speed > 0 and self.total_bytes > self.bytes_downloaded:
+            return (self.total_bytes - self.bytes_downloaded) / self.speed
+        return None
+
+    def wait(self, timeout=None):
+        """
+        Blocks until the job finished.
+        :return: True when the job is done, False on timeout.
+        """
+        return self._done_event.wait(timeout)
+
+    def record_progress(self, bytes_downloaded, total_bytes):
+        """
+        Updates the byte counters and the smoothed speed.
+        :param bytes_downloaded: Bytes downloaded so far.
+        :param total_bytes: Total (or estimated) size in bytes.
+        """
+        now = time.monotonic()
+        if self._last_sample is not None:
+            elapsed = now - self._last_sample[0]
+            if elapsed > 0:
+                sample = max(0, bytes_downloaded - self._last_sample[1]) / elapsed
+                self.speed = sample if not self.speed else 0.7 * self.speed + 0.3 * sample
+        self._last_sample = (now, bytes_downloaded)
+        self.bytes_downloaded = bytes_downloaded
+        self.total_bytes = total_bytes
+
+    def mark_running(self):
+        """
+        Moves a queued job to the running state.
+        :return: False if the job already finished (e.g. was cancelled).
+        """
+        with self._lock:
+            if self.done:
+                return False
+            self.state = RUNNING
+            self.started_at = time.time()
+            return True
+
+    def mark_queued(self):
+        """
+        Moves a running job back to the queue, e.g. while it waits for disk space.
+        :return: False if the job already finished.
+        """
+        with self._lock:
+            if self.done:
+                return False
+            self.state = QUEUED
+            self.started_at = None
+            return True
+
+    def mark_finished(self, state, message):
+        """
+        Moves the job to a final state and wakes up waiters.
+        :return: False if the job had already finished.
+        """
+        with self._lock:
+            if self.done:
+                return False
+            self.state = state
+            self.message = message
+            self.finished_at = time.time()
+            self._done_event.set()
+            return True
+
+    def to_dict(self):
+        """
+        JSON-serializable snapshot of the job.
+        :return: Dictionary with the public job fields.
+        """
+        return {
+            "id": self.id,
+            "url": self.url,
+            "title": self.title,
+            "save_path": self.save_path,
+            "audio_only": self.audio_only,
+            "clip": self.clip,
+            "expected_bytes": self.expected_bytes,
+            "state": self.state,
+            "message": self.message,
+            "bytes_downloaded": self.bytes_downloaded,
+            "total_bytes": self.total_bytes,
+            "speed": self.speed,
+            "eta": self.eta,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "path": self.path,
+            "error": self.error,
+            "saved_bytes": self.saved_bytes,
+            "digest": self.digest,
+        }
+
+
+class JobManager:
+    """
+    Runs downloads on a bounded pool of worker threads and keeps track of their
+    state. Jobs wait in a FIFO queue until one of `max_workers` slots is free
+    and the disk has room for their expected size (see DiskReservations). A job
+    whose size is only known after extraction is put back at the head of the
+    queue when it doesn't fit, before writing anything.
+    Listeners receive an event dict for every state change and (throttled)
+    progress update:
+        {"type": "state" | "progress", "job": <Job.to_dict()>}
+    Listeners are called from worker threads.
+    """
+
+    def __init__(self, save_path="downloads", max_workers=4, concurrency=None,
+                 process_pool=None, progress_interval=0.1, options=None, checksum=DEFAULT_CHECKSUM,
+                 disk_space=None, history=None, limits=None):
+        """
+        :param save_path: Default save path for submitted jobs.
+        :param max_workers: Maximum number of downloads running at once.
+        :param concurrency: Optional ConcurrencyController shared by all jobs.
+        :param process_pool: Optional ProcessPool used for extraction.
+        :param progress_interval: Minimum seconds between progress events per job.
+        :param options: Extra yt-dlp options applied to every job.
+        :param checksum: Checksum algorithm of the per-file manifests, None for none.
+        :param disk_space: DiskReservations used for admission control; a
+                           default one is created when omitted, False disables it.
+        :param history: Optional DownloadHistory receiving every finished job.
+        :param limits: SemaphoreRegistry with per-host and per-extractor limits,
+                       defaults to the process-wide one.
+        """
+        self.downloader = VideoDownloader(save_path, concurrency=concurrency, process_pool=process_pool,
+                                          checksum=checksum, limits=limits)
+        self.progress_interval = progress_interval
+        self.options = dict(options or {})
+        self.disk_space = DiskReservations() if disk_space is None else disk_space or None
+        self.history = history
+
+        self._max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=MAX_THREADS, thread_name_prefix="download")
+        self._jobs = {}
+        self._unfinished = {} # Video ID (or URL) -> queued or running Jobs, oldest first, for dedupe
+        self._pending = collections.deque() # Queued jobs in submission order
+        self._running = 0
+        self._closed = False
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    @property
+    def max_workers(self):
+        """Maximum number of downloads running at once."""
+        return self._max_workers
+
+    @max_workers.setter
+    def max_workers(self, value):
+        """Changes the limit; raising it starts queued jobs right away. 0 pauses the queue."""
+        with self._lock:
+            self._max_workers = max(0, min(int(value), MAX_THREADS))
+        self._dispatch()
+
+    def add_listener(self, listener):
+        """Registers a callable receiving job event dicts."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Unregisters a listener added with add_listener()."""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def submit(self, url, save_path=None, dedupe=False, info=None, audio_only=False, max_abr=None, clip=None,
+               info_time=None):
+        """
+        Queues a download.
+        :param url: YouTube video link.
+        :param save_path: Target directory, defaults to the manager's save path.
+        :param dedupe: Return the existing unfinished job for the same video
+                       instead of queueing a duplicate.
+        :param info: Info dict from VideoDownloader.extract_info(), reused
+                     instead of extracting the video again.
+        :param audio_only: Download only the audio stream.
+        :param max_abr: Audio bitrate ceiling in kbps for audio_only.
+        :param clip: (start, end) seconds to download only that part of the video.
+        :param info_time: time.monotonic() of the extraction of `info`, defaults
+                          to now. Info older than INFO_MAX_AGE when the job
+                          starts is dropped and the video extracted again.
+        :return: The queued (or existing) Job.
+        """
+        key = self._dedupe_key(url)
+        job = Job(url, save_path or self.downloader.save_path, info, audio_only, max_abr, clip, info_time)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("JobManager has been shut down.")
+            existing = self._unfinished.get(key)
+            if dedupe and existing:
+                return existing[0]
+            self._jobs[job.id] = job
+            self._unfinished.setdefault(key, []).append(job)
+            self._pending.append(job)
+        self._emit("state", job)
+        self._dispatch()
+        return job
+
+    def submit_batch(self, urls, save_path=None, dedupe=False, audio_only=False, max_abr=None, clip=None):
+        """
+        Queues several downloads.
+        :return: List of queued Jobs in input order.
+        """
+        return [self.submit(url, save_path, dedupe, audio_only=audio_only, max_abr=max_abr, clip=clip)
+                for url in urls]
+
+    def find_unfinished(self, url):
+        """
+        Looks for a queued or running job downloading the same video.
+        :return: The Job, or None.
+        """
+        with self._lock:
+            jobs = self._unfinished.get(self._dedupe_key(url))
+            return jobs[0] if jobs else None
+
+    def _dedupe_key(self, url):
+        return self.downloader.video_id(url) or url.strip()
+
+    def get(self, job_id):
+        """
+        :return: The Job with the given ID, or None.
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self):
+        """
+        :return: List of all known Jobs, oldest first.
+        """
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id):
+        """
+        Cancels a queued or running job.
+        :return: True if the job existed and was not finished yet.
+        """
+        job = self.get(job_id)
+        if job is None or job.done:
+            return False
+        job._cancel_event.set()
+        if job.state == QUEUED:
+            # Worker skips it when dequeued; report the final state right away
+            job.error = "JobCancelled"
+            self._finish(job, CANCELLED, "Cancelled before start.")
+        return True
+
+    def forget(self, job_id):
+        """
+        Drops a finished job from the manager's records, so long-running
+        batches don't accumulate every Job ever submitted.
+        :return: True if the job was known and finished.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or not job.done:
+                return False
+            del self._jobs[job_id]
+            self._drop_unfinished(job)
+            return True
+
+    def unfinished_jobs(self):
+        """
+        :return: Jobs that are queued or running, oldest first.
+        """
+        return [job for job in self.jobs() if not job.done]
+
+    def save_jobs(self, path, jobs):
+        """
+        Writes jobs to a JSON file so they can be resumed with restore_jobs().
+        :param path: Target file; removed when `jobs` is empty.
+        """
+        entries = [{"url": job.url, "save_path": job.save_path, "audio_only": job.audio_only,
+                    "max_abr": job.max_abr, "clip": job.clip} for job in jobs]
+        if not entries:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, path)
+
+    def restore_jobs(self, path):
+        """
+        Queues the jobs stored by save_jobs() and removes the file.
+        :return: List of queued Jobs.
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return []
+        os.remove(path)
+        return [self.submit(entry["url"], entry.get("save_path"), dedupe=True,
+                            audio_only=entry.get("audio_only", False), max_abr=entry.get("max_abr"),
+                            clip=entry.get("clip"))
+                for entry in entries]
+
+    def shutdown(self, wait=True, cancel_pending=True, cancel_running=False):
+        """
+        Stops accepting jobs.
+        :param wait: Block until every job that wasn't cancelled has finished
+                     (queued ones included). Without waiting, queued jobs are
+                     always cancelled since nothing would start them.
+        :param cancel_pending: Cancel jobs that have not started yet.
+        :param cancel_running: Also abort downloads in progress.
+        """
+        with self._lock:
+            self._closed = True
+        cancel_pending = cancel_pending or not wait
+        for job in self.unfinished_jobs():
+            if (cancel_pending and job.state == QUEUED) or (cancel_running and job.state == RUNNING):
+                self.cancel(job.id)
+        if wait:
+            for job in self.unfinished_jobs():
+                job.wait()
+        self._executor.shutdown(wait=wait)
+
+    def _dispatch(self):
+        """Starts queued jobs while there are free worker slots and disk space."""
+        to_start, too_large = [], []
+        with self._lock:
+            while self._pending and self._running < self._max_workers:
+                job = self._pending[0]
+                if job.done: # Cancelled while queued
+                    self._pending.popleft()
+                    continue
+                if not self._reserve(job, job.expected_bytes):
+                    if self._running:
+                        break # Held, in order, until a running job releases its space
+                    # Nothing is running that could free space: it will never fit
+                    self._pending.popleft()
+                    too_large.append(job)
+                    continue
+                self._pending.popleft()
+                self._running += 1
+                to_start.append(job)
+        for job in too_large:
+            job.error = "InsufficientDiskSpace"
+            self._finish(job, FAILED, f"Not enough disk space in {job.save_path}: "
+                                      f"{job.expected_bytes / 1024 ** 2:.0f} MB needed.")
+        for job in to_start:
+            self._executor.submit(self._run, job)
+
+    def _reserve(self, job, nbytes):
+        """
+        Reserves disk space for a job unless it already holds a reservation.
+        Jobs of unknown size are admitted; they reserve once extraction knows it.
+        :return: False if the space isn't available.
+        """
+        if self.disk_space is None or nbytes is None or job._reservation is not None:
+            return True
+        job._reservation = self.disk_space.reserve(job.save_path, nbytes)
+        return job._reservation is not None
+
+    def _admit(self, job, nbytes):
+        """JobContext.admit of a running job: reserves the space or defers the job."""
+        if nbytes is not None and job._reservation is None:
+            job.expected_bytes = nbytes
+        if not self._reserve(job, nbytes):
+            raise JobDeferred(f"Waiting for {nbytes / 1024 ** 2:.0f} MB of disk space.")
+
+    def _context_for(self, job):
+        """
+        Creates the JobContext for `job`: callbacks report into the Job and its
+        cancel event aborts the download. All jobs share self.downloader.
+        """
+        last_emit = [0.0]
+
+        def on_progress(bytes_downloaded, total_bytes):
+            job.record_progress(bytes_downloaded, total_bytes)
+            if job._reservation is not None:
+                self.disk_space.update(job._reservation, bytes_downloaded)
+            now = time.monotonic()
+            if now - last_emit[0] >= self.progress_interval or bytes_downloaded >= total_bytes:
+                last_emit[0] = now
+                self._emit("progress", job)
+
+        def on_complete(message, is_success):
+            job.path = context.filepath
+            job.error = context.error
+            job.saved_bytes = context.saved_bytes
+            job.digest = context.digest
+            if job.cancel_requested:
+                job.error = "JobCancelled"
+                self._finish(job, CANCELLED, "Download cancelled.")
+            else:
+                self._finish(job, COMPLETED if is_success else FAILED, message)
+
+        info, job.info = job.info, None
+        context = self.downloader.create_context(job.url, job_id=job.id, save_path=job.save_path,
+                                                 on_progress=on_progress, on_complete=on_complete,
+                                                 cancel_event=job._cancel_event, info=info,
+                                                 options=self.options, audio_only=job.audio_only,
+                                                 max_abr=job.max_abr, clip=job.clip,
+                                                 admit=lambda nbytes: self._admit(job, nbytes))
+        return context
+
+    def _run(self, job):
+        try:
+            if not job.mark_running():
+                return
+            if job.info is not None and time.monotonic() - job.info_time > INFO_MAX_AGE:
+                job.info = job.info_time = None # Waited too long in the queue: extract again
+            self._emit("state", job)
+            context = self._context_for(job)
+            try:
+                self.downloader.download_video(job.url, context)
+            except JobDeferred as e:
+                # Back to the head of the queue with the extracted info, to
+                # start again once running jobs have freed enough space
+                if job.info_time is None:
+                    job.info_time = time.monotonic() # Extracted by this attempt
+                job.info = context.info
+                if job.mark_queued():
+                    job.message = str(e)
+                    with self._lock:
+                        self._pending.appendleft(job)
+                    self._emit("state", job)
+                    return
+            except Exception as e:
+                job.error = type(e).__name__
+                self._finish(job, FAILED, f"An unexpected error occurred: {str(e)}")
+            if not job.done:
+                self._finish(job, FAILED, "Download did not report a result.")
+        finally:
+            if job._reservation is not None:
+                self.disk_space.release(job._reservation)
+                job._reservation = None
+            with self._lock:
+                self._running -= 1
+            self._dispatch()
+
+    def _finish(self, job, state, message):
+        if job.mark_finished(state, message):
+            with self._lock:
+                self._drop_unfinished(job)
+            if self.history is not None:
+                self.history.record(job.to_dict(), self.downloader.video_id(job.url))
+            self._emit("state", job)
+
+    def _drop_unfinished(self, job):
+        """Removes a finished job from the dedupe index. Call with self._lock held."""
+        key = self._dedupe_key(job.url)
+        jobs = self._unfinished.get(key, [])
+        if job in jobs:
+            jobs.remove(job)
+            if not jobs:
+                del self._unfinished[key]
+
+    def _emit(self, event_type, job):
+        event = {"type": event_type, "job": job.to_dict()}
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                print(f"Job listener failed: {e}")
@@ -0,0 +1,63 @@
+# model/job_metadata.py
+
+# Top-level info dict fields kept: what the pipeline reads (title, duration,
+# sizes) and what yt-dlp needs to name, download and archive the file
+INFO_FIELDS = (
+    "id", "title", "fulltitle", "display_id", "duration", "uploader", "uploader_id", "channel",
+    "channel_id", "upload_date", "timestamp", "live_status", "is_live", "was_live",
+    "webpage_url", "original_url", "extractor", "extractor_key",
+)
+
+
+class JobMetadata:
+    """
+    Compact stand-in for a yt-dlp info dict once the format is selected. A
+    full info dict carries every format with its URL and headers, thumbnails,
+    subtitles in every language and more, usually hundreds of KB per video;
+    this record keeps only INFO_FIELDS and the chosen format dicts, so the
+    full dict can be dropped while the job waits or downloads.
+    """
+
+    __slots__ = INFO_FIELDS + ("format_id", "formats", "full_size")
+
+    def __init__(self, format_id=None, formats=(), full_size=None, **fields):
+        """
+        :param format_id: Selected format, "137+140" for a merge.
+        :param formats: The selected format dicts.
+        :param full_size: Estimated size of the whole video download, for
+                          comparisons in audio-only and clip results.
+        :param fields: Values of INFO_FIELDS; missing ones are None.
+        """
+        for name in INFO_FIELDS:
+            setattr(self, name, fields.get(name))
+        self.format_id = format_id
+        self.formats = tuple(formats)
+        self.full_size = full_size
+
+    @classmethod
+    def from_info(cls, info, full_size=None):
+        """
+        :param info: Processed info dict, i.e. with the format selected.
+        :param full_size: See __init__.
+        :return: A JobMetadata holding the selected format(s) only.
+        """
+        formats = info.get("requested_formats")
+        if not formats:
+            formats = [f for f in info.get("formats") or () if f.get("format_id") == info.get("format_id")]
+        return cls(info.get("format_id"), formats, full_size, **{name: info.get(name) for name in INFO_FIELDS})
+
+    def get(self, name, default=None):
+        """Dict-style access to a field, for code written against info dicts."""
+        value = getattr(self, name, None) if name in self.__slots__ else None
+        return default if value is None else value
+
+    def to_info(self):
+        """
+        Rebuilds a minimal info dict yt-dlp can download from: applying the
+        job's format selection again picks the same format(s), since they
+        are the only ones left.
+        """
+        info = {name: getattr(self, name) for name in INFO_FIELDS if getattr(self, name) is not None}
+        info["_type"] = "video"
+        info["formats"] = [dict(f) for f in self.formats]
+        return info
@@ -0,0 +1,155 @@
+# model/metadata.py
+import csv
+import json
+
+# Column types of the known fields; everything else is stored as a string
+FIELD_TYPES = {
+    "id": "string",
+    "title": "string",
+    "uploader": "string",
+    "channel_id": "string",
+    "upload_date": "string",
+    "duration": "int",
+    "view_count": "int",
+    "like_count": "int",
+    "webpage_url": "string",
+    "format_id": "string",
+    "ext": "string",
+    "width": "int",
+    "height": "int",
+    "filesize": "int",
+    "format_count": "int",
+    "formats": "string",
+}
+
+DEFAULT_FIELDS = ("id", "title", "uploader", "duration", "upload_date", "view_count",
+                  "format_id", "filesize", "format_count")
+
+# Fields computed from the info dict instead of copied from it
+_DERIVED = {
+    # Size of the selected format, exact when known, estimated otherwise
+    "filesize": lambda info: info.get("filesize") or info.get("filesize_approx"),
+    "format_count": lambda info: len(info.get("formats") or ()),
+    "formats": lambda info: ",".join(f.get("format_id", "") for f in info.get("formats") or ()),
+}
+
+
+def select_fields(info, fields):
+    """
+    Copies only the wanted fields out of a yt-dlp info dict, so the (large)
+    dict can be dropped right away.
+    :param info: Info dict from extract_info().
+    :param fields: Field names, see FIELD_TYPES for the known ones.
+    :return: Dict field -> scalar value (or None).
+    """
+    row = {}
+    for field in fields:
+        value = _DERIVED[field](info) if field in _DERIVED else info.get(field)
+        if isinstance(value, (list, dict)):
+            value = json.dumps(value, separators=(",", ":"))
+        row[field] = value
+    return row
+
+
+class JsonLinesWriter:
+    """Appends one JSON object per row."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, row):
+        self._file.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+    def close(self):
+        self._file.close()
+
+
+class CsvWriter:
+    """Writes rows as CSV with a fixed header."""
+
+    def __init__(self, path, columns):
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=list(columns), extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, row):
+        self._writer.writerow(row)
+
+    def close(self):
+        self._file.close()
+
+
+class ArrowWriter:
+    """
+    Writes rows to a Parquet or Arrow IPC file in record batches of
+    `batch_size` rows, so only one batch is held in memory. Needs pyarrow.
+    """
+
+    def __init__(self, path, columns, file_format="parquet", batch_size=1000):
+        import pyarrow as pa # Optional dependency, only needed for columnar output
+
+        self.path = path
+        self.batch_size = batch_size
+        types = {"int": pa.int64(), "string": pa.string()}
+        self._schema = pa.schema([(column, types[FIELD_TYPES.get(column, "string")]) for column in columns])
+        self._rows = []
+        if file_format == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(path, self._schema)
+        else:
+            self._writer = pa.ipc.new_file(path, self._schema)
+
+    def write(self, row):
+        self._rows.append(row)
+        if len(self._rows) >= self.batch_size:
+            self._flush()
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        import pyarrow as pa
+
+        rows = [{column: self._coerce(column, row.get(column)) for column in self._schema.names}
+                for row in self._rows]
+        self._writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=self._schema))
+        self._rows = []
+
+    def _coerce(self, column, value):
+        if value is None:
+            return None
+        if FIELD_TYPES.get(column) == "int":
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return None
+        return str(value)
+
+
+def open_columnar_writer(base_path, columns, file_format="auto"):
+    """
+    Opens the columnar output: Parquet (or Arrow IPC) when pyarrow is
+    installed, CSV otherwise.
+    :param base_path: Output path without extension.
+    :param columns: Column names in order.
+    :param file_format: "auto", "parquet", "arrow" or "csv".
+    :return: A writer with write(row) and close(); its `path` has the extension.
+    """
+    if file_format in ("auto", "parquet", "arrow"):
+        try:
+            import pyarrow # noqa: F401
+        except ImportError:
+            if file_format != "auto":
+                raise
+            file_format = "csv"
+        else:
+            file_format = "parquet" if file_format == "auto" else file_format
+    if file_format == "csv":
+        return CsvWriter(f"{base_path}.csv", columns)
+    return ArrowWriter(f"{base_path}.{file_format}", columns, file_format)
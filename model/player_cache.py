@@ -0,0 +1,157 @@
+# model/player_cache.py
+import os
+import threading
+import time
+
+from model.state import state_dir
+
+PREWARM_URL = "https://www.youtube.com/watch?v=jNQXAC9IVRw" # Long-lived public video used to load the player
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+TRIM_INTERVAL = 60.0 # Minimum seconds between size checks after downloads
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_player_cache():
+    """
+    The PlayerCache shared by every downloader in this process.
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = PlayerCache()
+        return _default_cache
+
+
+class PlayerCache:
+    """
+    Managed yt-dlp cache directory (`cachedir`) for YouTube player data: the
+    solved signature functions (youtube-sigfuncs) and n-challenge code
+    (youtube-nsig), keyed by player version. Every YoutubeDL the app creates
+    points here, so a fresh instance loads what another one already solved
+    instead of fetching and solving the player JS again. The directory is kept
+    under `max_bytes` by removing the least recently written files.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        :param directory: Cache directory, defaults to "yt-dlp" in the state directory.
+        :param max_bytes: Size cap of the directory.
+        """
+        self.directory = directory or state_dir("yt-dlp")
+        self.max_bytes = max_bytes
+        self.last_prewarm = None # {"url", "seconds", "at"} of the last prewarm()
+        self._lock = threading.Lock()
+        self._last_trim = 0.0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def options(self):
+        """yt-dlp options pointing a YoutubeDL at this cache."""
+        return {'cachedir': self.directory}
+
+    def stats(self):
+        """
+        :return: Dict with the total and per-section file count and size, the
+                 cap and the last prewarm.
+        """
+        sections = {}
+        for section, size, _, _ in self._files():
+            entry = sections.setdefault(section, {"files": 0, "bytes": 0})
+            entry["files"] += 1
+            entry["bytes"] += size
+        return {
+            "directory": self.directory,
+            "max_bytes": self.max_bytes,
+            "files": sum(entry["files"] for entry in sections.values()),
+            "bytes": sum(entry["bytes"] for entry in sections.values()),
+            "sections": sections,
+            "last_prewarm": self.last_prewarm,
+        }
+
+    def trim(self, force=False):
+        """
+        Removes the oldest files until the cache is under 90% of its cap.
+        Without `force` this runs at most every TRIM_INTERVAL seconds, so it can
+        be called after every job.
+        :return: Number of files removed.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_trim < TRIM_INTERVAL:
+                return 0
+            self._last_trim = now
+            files = sorted(self._files(), key=lambda entry: entry[2])
+            total = sum(entry[1] for entry in files)
+            if total <= self.max_bytes:
+                return 0
+            removed = 0
+            for _, size, _, path in files:
+                if total <= self.max_bytes * 0.9:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+            return removed
+
+    def clear(self):
+        """Removes every cached file."""
+        with self._lock:
+            for _, _, _, path in self._files():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def prewarm(self, url=PREWARM_URL):
+        """
+        Extracts one video so the current player JS is fetched and its
+        signature and n-challenge functions are solved and cached. Run it at
+        service start so the first real jobs don't pay for it.
+        :return: The cache stats afterwards.
+        :raises yt_dlp.DownloadError: If the extraction fails.
+        """
+        import yt_dlp # Imported on first use, it dominates start-up time
+
+        started = time.monotonic()
+        with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True, **self.options()}) as ydl:
+            ydl.extract_info(url, download=False)
+        self.last_prewarm = {"url": url, "seconds": round(time.monotonic() - started, 3), "at": time.time()}
+        self.trim(force=True)
+        return self.stats()
+
+    def start_prewarm(self, url=PREWARM_URL):
+        """
+        Runs prewarm() on a background thread, for services that shouldn't
+        wait for it. A failure (e.g. no network yet) only leaves the cache cold.
+        :return: The started thread.
+        """
+        def run():
+            try:
+                self.prewarm(url)
+            except Exception as e:
+                self.last_prewarm = {"url": url, "error": type(e).__name__, "at": time.time()}
+
+        thread = threading.Thread(target=run, name="player-cache-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def _files(self):
+        """Yields (section, size, mtime, path) for every cached file."""
+        try:
+            sections = list(os.scandir(self.directory))
+        except OSError:
+            return
+        for section in sections:
+            if not section.is_dir():
+                continue
+            for entry in os.scandir(section.path):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                if entry.is_file():
+                    yield section.name, stat.st_size, stat.st_mtime, entry.path
@@ -0,0 +1,229 @@
+# model/process_pool.py
+import itertools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+
+# Per-worker state, created once by _init_worker and reused by every task
+_worker_ydl = None
+_worker_events = None
+
+PROGRESS_INTERVAL = 0.1 # Seconds between progress events sent back from a worker
+
+
+def _init_worker(event_queue):
+    """
+    Runs once in every worker process: imports yt-dlp and keeps one YoutubeDL
+    alive so extractor instances (and their player JS caches) stay warm. Solved
+    player functions also go to the shared on-disk PlayerCache, so a restarted
+    worker doesn't solve them again.
+    """
+    global _worker_ydl, _worker_events
+    import yt_dlp
+
+    from model.downloader import DEFAULT_FORMAT
+    from model.player_cache import default_player_cache
+    # Same format selection as an in-process preview, so downloads can reuse the result
+    _worker_ydl = yt_dlp.YoutubeDL({'format': DEFAULT_FORMAT, 'quiet': True, 'no_warnings': True,
+                                    **default_player_cache().options()})
+    _worker_events = event_queue
+
+
+def _ping():
+    """No-op task used to spawn and warm up the workers."""
+    return True
+
+
+def _extract(url, ydl_opts):
+    """
+    Extracts video information in the worker.
+    :return: A picklable (sanitized) info dict.
+    """
+    if ydl_opts:
+        import yt_dlp
+        from model.player_cache import default_player_cache
+        opts = {'quiet': True, 'no_warnings': True, **default_player_cache().options(), **ydl_opts}
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            return ydl.sanitize_info(ydl.extract_info(url, download=False))
+    return _worker_ydl.sanitize_info(_worker_ydl.extract_info(url, download=False))
+
+
+def _run_job(job_id, url, save_path, audio_only=False, max_abr=None, clip=None, checksum=None):
+    """
+    Runs a whole download in the worker. Progress is streamed back to the
+    parent through the shared event queue, followed by an end marker
+    (job_id, None, None) once the job sends no more.
+    :return: Dict with message and success (as passed to on_complete) and the
+             context's filepath, error, saved_bytes and digest.
+    """
+    from model.downloader import VideoDownloader
+
+    result = {'message': "Download did not report a result.", 'success': False}
+    last_sent = [0.0]
+
+    def on_progress(bytes_downloaded, total_bytes):
+        now = time.monotonic()
+        if now - last_sent[0] >= PROGRESS_INTERVAL or bytes_downloaded >= total_bytes:
+            last_sent[0] = now
+            _worker_events.put((job_id, bytes_downloaded, total_bytes))
+
+    def on_complete(message, is_success):
+        result['message'] = message
+        result['success'] = is_success
+
+    try:
+        downloader = VideoDownloader(save_path, checksum=checksum)
+        context = downloader.create_context(url, job_id=job_id, on_progress=on_progress, on_complete=on_complete,
+                                            audio_only=audio_only, max_abr=max_abr, clip=clip)
+        downloader.download_video(url, context)
+    finally:
+        _worker_events.put((job_id, None, None))
+    result.update(filepath=context.filepath, error=context.error, saved_bytes=context.saved_bytes,
+                  digest=context.digest)
+    return result
+
+
+class _PoolJob:
+    """Parent-side state of a job run by run_job()."""
+
+    __slots__ = ("on_progress", "on_complete", "future", "result", "ended")
+
+    def __init__(self, on_progress, on_complete):
+        self.on_progress = on_progress
+        self.on_complete = on_complete
+        self.future = Future() # Resolved after the job's last progress event
+        self.result = None # Worker result, once its future is done
+        self.ended = False # End marker received
+
+
+class ProcessPool:
+    """
+    Pool of warm worker processes for CPU-heavy extraction (JS signature and
+    n-parameter solving, large JSON player responses) that would otherwise
+    serialize on the GIL when many download threads share one process.
+    """
+
+    def __init__(self, max_workers=None):
+        """
+        :param max_workers: Number of worker processes (defaults to the CPU count).
+        """
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        context = multiprocessing.get_context()
+        self._events = context.Queue()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self._events,),
+        )
+        self._job_ids = itertools.count(1)
+        self._jobs = {} # job ID -> _PoolJob
+        self._lock = threading.Lock()
+        self._pump = threading.Thread(target=self._pump_events, name="process-pool-events", daemon=True)
+        self._pump.start()
+
+    def prewarm(self):
+        """Starts all workers now instead of on the first submitted job."""
+        futures = [self._executor.submit(_ping) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def submit(self, fn, *args):
+        """
+        Runs an arbitrary picklable callable in a warm worker.
+        :return: Future resolving to the callable's result.
+        """
+        return self._executor.submit(fn, *args)
+
+    def extract(self, url, ydl_opts=None):
+        """
+        Extracts video information in a worker process.
+        :param url: Video URL.
+        :param ydl_opts: Optional extra YoutubeDL options; the warm per-worker
+                         instance is used when omitted.
+        :return: Future resolving to a sanitized info dict.
+        """
+        return self._executor.submit(_extract, url, ydl_opts)
+
+    def run_job(self, url, save_path, on_progress=None, on_complete=None, audio_only=False, max_abr=None,
+                clip=None, checksum=None):
+        """
+        Runs a complete download in a worker process.
+        :param on_progress: Called in the parent as (bytes_downloaded, total_bytes).
+        :param on_complete: Called in the parent as (status_message, is_success).
+        :param audio_only: Fetch only audio, with `max_abr` as bitrate ceiling (see JobContext).
+        :param clip: (start, end) seconds to download only that part (see JobContext).
+        :param checksum: Checksum algorithm of the file's manifest, None for no manifest.
+        :return: Future resolving to the result dict of _run_job (message,
+                 success, filepath, error, saved_bytes, digest), after every
+                 progress event of the job was delivered.
+        """
+        job_id = next(self._job_ids)
+        job = _PoolJob(on_progress, on_complete)
+        with self._lock:
+            self._jobs[job_id] = job
+        future = self._executor.submit(_run_job, job_id, url, save_path, audio_only, max_abr, clip,
+                                       checksum)
+
+        def finished(done):
+            try:
+                result = done.result()
+            except Exception as e:
+                # The worker died: no end marker will come
+                result = {'message': f"An unexpected error occurred: {str(e)}", 'success': False,
+                          'filepath': None, 'error': type(e).__name__, 'saved_bytes': None, 'digest': None}
+                with self._lock:
+                    job.ended = True
+            with self._lock:
+                job.result = result
+                complete = job.ended
+            if complete:
+                self._complete(job_id)
+
+        future.add_done_callback(finished)
+        return job.future
+
+    def _complete(self, job_id):
+        """Resolves a job once both its result and its end marker arrived."""
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job is None:
+            return
+        if job.on_complete:
+            try:
+                job.on_complete(job.result['message'], job.result['success'])
+            except Exception as e:
+                print(f"Completion callback failed: {e}")
+        job.future.set_result(job.result)
+
+    def _pump_events(self):
+        """Dispatches progress events from the workers to parent-side callbacks."""
+        while True:
+            event = self._events.get()
+            if event is None:
+                return
+            job_id, bytes_downloaded, total_bytes = event
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is not None and bytes_downloaded is None:
+                    job.ended = True
+                    complete = job.result is not None
+            if job is None:
+                continue
+            if bytes_downloaded is None:
+                if complete:
+                    self._complete(job_id)
+                continue
+            callback = job.on_progress
+            if callback:
+                try:
+                    callback(bytes_downloaded, total_bytes)
+                except Exception as e:
+                    # A failing parent-side callback must not stop the pump for other jobs
+                    print(f"Progress callback failed: {e}")
+
+    def shutdown(self, wait=True):
+        """Stops the workers and the event pump."""
+        self._executor.shutdown(wait=wait)
+        self._events.put(None)
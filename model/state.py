@@ -0,0 +1,20 @@
+# model/state.py
+import os
+
+APP_NAME = "youtube_downloader"
+
+
+def state_dir(*parts):
+    """
+    Returns (and creates) the per-user directory for runtime state such as the
+    daemon socket and caches. Override the location with YTD_STATE_DIR.
+    :param parts: Optional sub-directory components.
+    :return: Absolute path of the directory.
+    """
+    base = os.environ.get("YTD_STATE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+        APP_NAME,
+    )
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,214 @@
+# model/url_feed.py
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+CHECKPOINT_INTERVAL = 1.0 # Minimum seconds between checkpoint writes
+MAX_SEEN = 100_000 # Video IDs remembered for de-duplication (about 10 MB)
+_END = object() # Queue sentinel: the input is exhausted
+
+
+class FeedEntry:
+    """A validated, normalized URL read from the input."""
+
+    __slots__ = ("seq", "url", "video_id", "end_offset")
+
+    def __init__(self, seq, url, video_id, end_offset):
+        self.seq = seq # Position among the accepted entries
+        self.url = url
+        self.video_id = video_id
+        self.end_offset = end_offset # Input offset right after this entry's line
+
+
+class UrlFeed:
+    """
+    Streams video URLs from a text stream (file or stdin) into a bounded queue.
+
+    A reader thread parses one line at a time: blank lines and '#' comments
+    are skipped, URLs are validated and normalized to
+    https://www.youtube.com/watch?v=<id>, and videos already seen are dropped.
+    The queue holds at most `max_pending` entries, so the reader blocks when
+    consumers fall behind and the input is never loaded as a whole.
+
+    Consumers call get() and report each entry with mark_done(). The checkpoint
+    records the input offset up to which every entry is done; a new feed over
+    the same input resumes from there.
+
+    De-duplication keeps the `max_seen` most recently seen video IDs (about
+    100 bytes each), so memory stays flat on unbounded input; a repeat further
+    apart than that is downloaded again. IDs seen before a resume point are
+    not remembered.
+    """
+
+    def __init__(self, stream, video_id, max_pending=1000, checkpoint_path=None, max_seen=MAX_SEEN):
+        """
+        :param stream: Binary stream, e.g. open(path, "rb") or sys.stdin.buffer.
+        :param video_id: Callable returning the video ID of a URL, or None if invalid.
+        :param max_pending: Capacity of the queue between reader and consumers.
+        :param checkpoint_path: JSON file holding the resume offset; None disables it.
+        :param max_seen: Recent video IDs kept for de-duplication; None keeps
+                         all of them, 0 turns de-duplication off.
+        """
+        self.stream = stream
+        self.video_id = video_id
+        self.checkpoint_path = checkpoint_path
+        self.max_seen = max_seen
+        self.stats = {"lines": 0, "accepted": 0, "invalid": 0, "duplicates": 0}
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._seen = OrderedDict() # video ID -> None, least recently seen first
+        self._stopped = threading.Event()
+        self._exhausted = False
+        self._lock = threading.Lock()
+        self._offset = self._load_checkpoint() # Offset at which reading starts
+        self._resumed_from = self._offset
+        self._done = {} # seq -> end offset, finished entries above the watermark
+        self._next_done = 0 # Lowest seq not finished yet
+        self._watermark = self._offset # Input offset up to which everything is done
+        self._last_save = 0.0
+        self._reader = threading.Thread(target=self._read, name="url-feed", daemon=True)
+
+    @property
+    def resumed_from(self):
+        """Input offset the feed resumed from (0 on a fresh start)."""
+        return self._resumed_from
+
+    def start(self):
+        """Starts the reader thread."""
+        self._reader.start()
+        return self
+
+    def get(self):
+        """
+        Blocks until the next entry is available.
+        :return: A FeedEntry, or None once the input is exhausted (or the feed stopped).
+        """
+        while not self._stopped.is_set():
+            try:
+                entry = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if entry is _END:
+                self._queue.put(_END) # Wake up the other consumers too
+                return None
+            return entry
+        return None
+
+    def mark_done(self, entry):
+        """
+        Records that an entry was handled (successfully or not) and advances
+        the checkpoint past every contiguous finished entry.
+        """
+        with self._lock:
+            self._done[entry.seq] = entry.end_offset
+            while self._next_done in self._done:
+                self._watermark = self._done.pop(self._next_done)
+                self._next_done += 1
+            if time.monotonic() - self._last_save >= CHECKPOINT_INTERVAL:
+                self._save_checkpoint()
+
+    def close(self):
+        """
+        Stops reading and writes the final checkpoint. When the whole input was
+        handled the checkpoint is removed, so the next run starts fresh.
+        :return: True if the input was fully handled.
+        """
+        self._stopped.set()
+        with self._lock:
+            complete = self._exhausted and self._next_done == self.stats["accepted"]
+            if complete:
+                if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+                    os.remove(self.checkpoint_path)
+            else:
+                self._save_checkpoint()
+        return complete
+
+    def _read(self):
+        seq = 0
+        offset = self._skip_to(self._offset)
+        try:
+            for line in self.stream:
+                offset += len(line)
+                self.stats["lines"] += 1
+                text = line.decode("utf-8", errors="replace").strip()
+                if not text or text.startswith("#"):
+                    continue
+                video_id = self.video_id(text)
+                if video_id is None:
+                    self.stats["invalid"] += 1
+                    continue
+                if self._is_duplicate(video_id):
+                    self.stats["duplicates"] += 1
+                    continue
+                entry = FeedEntry(seq, f"https://www.youtube.com/watch?v={video_id}", video_id, offset)
+                if not self._put(entry):
+                    return
+                seq += 1
+                self.stats["accepted"] = seq
+        finally:
+            with self._lock:
+                self._exhausted = not self._stopped.is_set()
+                if self._exhausted and self._next_done == seq:
+                    self._watermark = offset # Trailing skipped lines are done too
+            self._put(_END)
+
+    def _is_duplicate(self, video_id):
+        """Checks `video_id` against the recent IDs and remembers it as the most recent."""
+        if self.max_seen == 0:
+            return False
+        if video_id in self._seen:
+            self._seen.move_to_end(video_id)
+            return True
+        self._seen[video_id] = None
+        if self.max_seen is not None and len(self._seen) > self.max_seen:
+            self._seen.popitem(last=False)
+        return False
+
+    def _put(self, item):
+        """Blocks while the queue is full (backpressure). False if the feed stopped."""
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _skip_to(self, offset):
+        """Positions the stream at `offset`: seeks in files, discards lines from pipes."""
+        if not offset:
+            return 0
+        try:
+            self.stream.seek(offset)
+            return offset
+        except (AttributeError, OSError, ValueError):
+            pass
+        skipped = 0
+        while skipped < offset:
+            line = self.stream.readline()
+            if not line:
+                break
+            skipped += len(line)
+        return skipped
+
+    def _load_checkpoint(self):
+        if not self.checkpoint_path:
+            return 0
+        try:
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                return int(json.load(f)["offset"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return 0
+
+    def _save_checkpoint(self):
+        """Writes the watermark atomically. Call with self._lock held."""
+        self._last_save = time.monotonic()
+        if not self.checkpoint_path:
+            return
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"offset": self._watermark}, f)
+        os.replace(tmp_path, self.checkpoint_path)
@@ -0,0 +1,343 @@
+# model/watch_folder.py
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+
+PROCESSING_DIR = "processing" # Claimed lists whose jobs are still running
+PROCESSED_DIR = "processed" # Lists whose downloads all completed
+FAILED_DIR = "failed" # Lists with failed downloads or no valid URL, next to a .errors report
+POLL_INTERVAL = 1.0 # Seconds between directory checks without inotify
+MAX_PENDING = 1000 # Unfinished watch-folder jobs before reading a list pauses
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII") # wd, mask, cookie, len; the name follows
+
+
+def is_list_name(name):
+    """
+    Whether a directory entry is a finished URL list. Producers write to a
+    dot-file or a .tmp/.part name and rename it when done.
+    """
+    return not name.startswith(".") and not name.endswith((".tmp", ".part"))
+
+
+class InotifyWatcher:
+    """
+    Reports files closed after writing or moved into a directory, as soon as
+    the kernel signals them. Linux only; raises OSError elsewhere.
+    """
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available.")
+        self._fd = libc.inotify_init1(IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"Cannot watch {directory}")
+        self.directory = directory
+        self._wake_r, self._wake_w = os.pipe()
+        self._closed = False
+        self._close_lock = threading.Lock()
+
+    def names(self):
+        """
+        Blocks until files arrive.
+        :return: List of new file names, or None once closed. An event queue
+                 overflow is reported as every list in the directory.
+        """
+        while True:
+            ready, _, _ = select.select([self._fd, self._wake_r], [], [])
+            if self._wake_r in ready:
+                for fd in (self._fd, self._wake_r, self._wake_w):
+                    os.close(fd)
+                return None
+            data = os.read(self._fd, 64 * 1024)
+            names, offset = [], 0
+            while offset < len(data):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                if mask & IN_Q_OVERFLOW:
+                    return sorted(os.listdir(self.directory))
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                if name:
+                    names.append(name)
+            if names:
+                return names
+
+    def close(self):
+        """
+        Makes names() return None; it releases the descriptors. Only the first
+        call wakes it: later ones would write to a closed (or reused) descriptor.
+        """
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        os.write(self._wake_w, b"x")
+
+
+class PollingWatcher:
+    """
+    Fallback for systems without inotify: checks the directory's mtime every
+    `interval` seconds and only lists it when it changed. A file is reported
+    once its size and mtime held still for one interval, since there is no
+    close event telling when a writer is done.
+    """
+
+    def __init__(self, directory, interval=POLL_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._dir_mtime = None
+        self._candidates = {} # name -> (size, mtime) at the last check
+
+    def names(self):
+        """
+        Blocks until files arrive.
+        :return: List of new file names, or None once closed.
+        """
+        while not self._stopped.wait(self.interval):
+            try:
+                mtime = os.stat(self.directory).st_mtime_ns
+            except OSError:
+                continue
+            if mtime == self._dir_mtime and not self._candidates:
+                continue
+            self._dir_mtime = mtime
+            ready, candidates = [], {}
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if not is_list_name(entry.name) or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    signature = (stat.st_size, stat.st_mtime_ns)
+                    if self._candidates.get(entry.name) == signature:
+                        ready.append(entry.name)
+                    else:
+                        candidates[entry.name] = signature
+            self._candidates = candidates
+            if ready:
+                return ready
+        return None
+
+    def close(self):
+        """Wakes up names()."""
+        self._stopped.set()
+
+
+class _Batch:
+    """Jobs submitted from one list file."""
+
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path # Claimed file in processing/
+        self.pending = set() # IDs of unfinished jobs
+        self.failed = [] # (url, error) of failed jobs and invalid lines
+        self.submitted = 0
+        self.parsed = False # All lines submitted
+
+
+class WatchFolder:
+    """
+    Turns URL list files dropped into an inbox directory into downloads.
+
+    A watcher thread waits for new files (inotify, or PollingWatcher where
+    inotify is missing), claims each one by renaming it into processing/ and
+    reads it line by line, submitting every valid URL to the JobManager as it
+    goes. When the last of a file's jobs finishes the file is renamed into
+    processed/, or into failed/ with a .errors report listing the failed URLs.
+    Renames stay within the inbox's file system, so every move is atomic and
+    a file is never claimed twice. Lists left in processing/ by a previous run
+    are submitted again on start.
+
+    Reading pauses while `max_pending` submitted jobs are unfinished, so a huge
+    list is streamed into the manager instead of queued all at once.
+
+    List files use the url_feed format: one URL per line, blank lines and
+    '#' comments ignored.
+    """
+
+    def __init__(self, inbox, manager, save_path=None, polling=False, poll_interval=POLL_INTERVAL,
+                 max_pending=MAX_PENDING):
+        """
+        :param inbox: Directory to watch; processing/, processed/ and failed/ are created inside.
+        :param manager: JobManager running the downloads.
+        :param save_path: Target directory, defaults to the manager's save path.
+        :param polling: Use PollingWatcher even where inotify is available.
+        :param poll_interval: Seconds between checks of the PollingWatcher.
+        :param max_pending: Unfinished jobs from the inbox at which reading pauses.
+        """
+        self.inbox = os.path.abspath(inbox)
+        self.manager = manager
+        self.save_path = save_path
+        self.polling = polling
+        self.poll_interval = poll_interval
+        self.max_pending = max(1, max_pending)
+        self.stats = {"files": 0, "urls": 0, "processed": 0, "failed": 0}
+        for name in (PROCESSING_DIR, PROCESSED_DIR, FAILED_DIR):
+            os.makedirs(os.path.join(self.inbox, name), exist_ok=True)
+        self._batches = {} # job ID -> [_Batch] (a deduplicated job can serve several lists)
+        self._lock = threading.Lock()
+        self._room = threading.Condition(self._lock) # Signalled when jobs finish or on stop
+        self._stopping = False
+        self._watcher = None
+        self._thread = None
+
+    @property
+    def mode(self):
+        """'inotify' or 'polling' once started."""
+        return "polling" if isinstance(self._watcher, PollingWatcher) else "inotify"
+
+    def start(self):
+        """Starts watching; files already in the inbox are taken right away."""
+        if not self.polling:
+            try:
+                self._watcher = InotifyWatcher(self.inbox)
+            except (OSError, AttributeError):
+                self._watcher = None
+        if self._watcher is None:
+            self._watcher = PollingWatcher(self.inbox, self.poll_interval)
+        self.manager.add_listener(self._on_job_event)
+        self._thread = threading.Thread(target=self._watch, name="watch-folder", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops watching. Lists whose jobs are unfinished stay in processing/."""
+        self.manager.remove_listener(self._on_job_event)
+        with self._room:
+            self._stopping = True
+            self._room.notify_all()
+        if self._watcher is not None:
+            self._watcher.close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _watch(self):
+        # Watching started before this listing, so nothing dropped meanwhile is missed
+        processing = os.path.join(self.inbox, PROCESSING_DIR)
+        for name in sorted(os.listdir(processing)):
+            self._ingest(name, os.path.join(processing, name))
+        names = sorted(os.listdir(self.inbox))
+        while names is not None:
+            for name in names:
+                if is_list_name(name):
+                    self._claim(name)
+            names = self._watcher.names()
+
+    def _claim(self, name):
+        """Moves a new list into processing/ and submits it; skips files gone already."""
+        source = os.path.join(self.inbox, name)
+        if not os.path.isfile(source):
+            return
+        target = _unique_path(os.path.join(self.inbox, PROCESSING_DIR), name)
+        try:
+            os.rename(source, target)
+        except FileNotFoundError:
+            return
+        self._ingest(name, target)
+
+    def _ingest(self, name, path):
+        batch = _Batch(name, path)
+        with self._lock:
+            self.stats["files"] += 1
+        try:
+            with open(path, "rb") as f:
+                for line in f:
+                    url = line.decode("utf-8", errors="replace").strip()
+                    if not url or url.startswith("#"):
+                        continue
+                    video_id = self.manager.downloader.video_id(url)
+                    if video_id is None:
+                        batch.failed.append((url, "Invalid URL"))
+                        continue
+                    with self._room:
+                        # self._batches holds one entry per unfinished job
+                        while len(self._batches) >= self.max_pending and not self._stopping:
+                            self._room.wait()
+                        if self._stopping:
+                            return # The list stays in processing/ for the next run
+                    job = self.manager.submit(f"https://www.youtube.com/watch?v={video_id}", self.save_path,
+                                              dedupe=True)
+                    batch.submitted += 1
+                    with self._lock:
+                        self.stats["urls"] += 1
+                        finished = job.done # Its finished event may have gone out already
+                        if finished:
+                            self._record(batch, job.to_dict())
+                        else:
+                            batch.pending.add(job.id)
+                            self._batches.setdefault(job.id, []).append(batch)
+                    if finished:
+                        self.manager.forget(job.id)
+        except OSError as e:
+            batch.failed.append((path, f"Cannot read list: {e}"))
+        except RuntimeError:
+            return # Manager shut down; the list stays in processing/ for the next run
+        with self._lock:
+            batch.parsed = True
+            finished = not batch.pending
+        if finished:
+            self._settle(batch)
+
+    def _on_job_event(self, event):
+        job = event["job"]
+        if event["type"] != "state" or job["state"] not in ("completed", "failed", "cancelled"):
+            return
+        with self._lock:
+            batches = self._batches.pop(job["id"], [])
+            if batches:
+                self._room.notify_all()
+            settled = []
+            for batch in batches:
+                batch.pending.discard(job["id"])
+                self._record(batch, job)
+                if batch.parsed and not batch.pending:
+                    settled.append(batch)
+        for batch in settled:
+            self._settle(batch)
+        if batches:
+            self.manager.forget(job["id"])
+
+    def _record(self, batch, job):
+        if job["state"] != "completed":
+            batch.failed.append((job["url"], job.get("error") or job["state"]))
+
+    def _settle(self, batch):
+        """Moves a list whose jobs are all finished out of processing/."""
+        if not batch.failed and not batch.submitted:
+            batch.failed.append((batch.name, "No URL in the list"))
+        failed = bool(batch.failed)
+        folder = os.path.join(self.inbox, FAILED_DIR if failed else PROCESSED_DIR)
+        target = _unique_path(folder, batch.name)
+        if failed:
+            report = target + ".errors"
+            with open(report + ".tmp", "w", encoding="utf-8") as f:
+                for url, error in batch.failed:
+                    f.write(f"{url}\t{error}\n")
+            os.replace(report + ".tmp", report)
+        os.rename(batch.path, target)
+        with self._lock: # Settled from the watcher and from job listener threads
+            self.stats["failed" if failed else "processed"] += 1
+
+
+def _unique_path(folder, name):
+    """`folder`/`name`, with a counter added when that exists already."""
+    path = os.path.join(folder, name)
+    counter = 1
+    while os.path.exists(path):
+        path = os.path.join(folder, f"{name}.{counter}")
+        counter += 1
+    return path
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the audio-only format selection and savings estimate
+against a fake format list, without network access.
+"""
+
+import yt_dlp
+from model.downloader import audio_format, estimate_video_size
+
+FORMATS = [ # yt-dlp order: worst to best
+    {"format_id": "139", "ext": "m4a", "acodec": "mp4a.40.5", "vcodec": "none", "abr": 48, "filesize": 1_000_000},
+    {"format_id": "251", "ext": "webm", "acodec": "opus", "vcodec": "none", "abr": 130, "filesize": 3_000_000},
+    {"format_id": "18", "ext": "mp4", "acodec": "mp4a.40.2", "vcodec": "avc1", "height": 360, "filesize": 20_000_000},
+    {"format_id": "22", "ext": "mp4", "acodec": "mp4a.40.2", "vcodec": "avc1", "height": 720, "filesize": 60_000_000},
+    {"format_id": "137", "ext": "mp4", "acodec": "none", "vcodec": "avc1", "height": 1080, "filesize": 90_000_000},
+    {"format_id": "140", "ext": "m4a", "acodec": "mp4a.40.2", "vcodec": "none", "abr": 256, "filesize": 6_000_000},
+]
+
+def _select(format_spec):
+    info = {"id": "dQw4w9WgXcQ", "title": "Video", "extractor": "youtube", "extractor_key": "Youtube",
+            "webpage_url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "formats": [dict(f, url=f"https://example.invalid/{f['format_id']}") for f in FORMATS]}
+    with yt_dlp.YoutubeDL({"format": format_spec, "quiet": True, "simulate": True}) as ydl:
+        return ydl.process_ie_result(info, download=False)["format_id"]
+
+def test_audio_format_respects_ceiling():
+    """The best audio-only stream under the ceiling wins; video is never picked."""
+    assert _select(audio_format(160)) == "251"
+    assert _select(audio_format(200)) == "251", "140 is over the ceiling"
+    assert _select(audio_format(300)) in ("251", "140"), "yt-dlp's own ranking among audio streams"
+    assert _select(audio_format(32)) == "139", "Nothing under the ceiling: smallest audio stream"
+    print("✓ Audio-only format selection")
+
+def test_estimate_video_size():
+    """Savings are measured against the combined format the video mode would fetch."""
+    assert estimate_video_size({"formats": FORMATS}) == 60_000_000
+    tbr_only = [{"vcodec": "avc1", "acodec": "mp4a", "height": 720, "tbr": 1000}]
+    assert estimate_video_size({"formats": tbr_only, "duration": 60}) == 7_500_000
+    assert estimate_video_size({"formats": FORMATS[:2]}) is None
+    print("✓ Video size estimated")
+
+if __name__ == "__main__":
+    test_audio_format_respects_ceiling()
+    test_estimate_video_size()
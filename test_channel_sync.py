@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script to verify incremental channel sync stops listing at the stored
+watermark, without network access.
+"""
+
+import os
+from model.channel_sync import ChannelSync, channel_key
+
+STORE = "test_watermarks.json"
+CHANNEL = "https://www.youtube.com/@example/videos"
+
+class FakeChannel:
+    """Upload list newest first; counts how many entries were pulled."""
+
+    def __init__(self, count):
+        self.uploads = [{"id": f"video{i:06d}", "upload_date": f"2024{i // 28 % 12 + 1:02d}{i % 28 + 1:02d}"}
+                        for i in range(count)][::-1]
+        self.pulled = 0
+
+    def __call__(self, channel_url):
+        assert channel_url == "https://www.youtube.com/@example"
+        for entry in self.uploads:
+            self.pulled += 1
+            yield entry
+
+def test_channel_key():
+    """Channel URLs normalize to one key; video URLs are rejected."""
+    for url in ("https://www.youtube.com/@example", "youtube.com/@example/videos", "https://m.youtube.com/@example/"):
+        assert channel_key(url) == "https://www.youtube.com/@example", url
+    assert channel_key("https://www.youtube.com/channel/UCuAXFkgsw1L7xaCfnd5JJOw/streams") == \
+        "https://www.youtube.com/channel/UCuAXFkgsw1L7xaCfnd5JJOw"
+    assert channel_key("https://youtu.be/dQw4w9WgXcQ") is None
+    print("✓ Channel URLs normalized")
+
+def test_second_sync_stops_at_watermark():
+    """After a full sync, two new uploads cost two entries of listing, not the whole channel."""
+    if os.path.exists(STORE):
+        os.remove(STORE)
+    channel = FakeChannel(300)
+    sync = ChannelSync(STORE, lister=channel)
+    first = sync.new_uploads(CHANNEL)
+    assert len(first) == 300 and first[0]["id"] == "video000000", "Oldest first"
+    sync.commit(CHANNEL, first, {entry["id"] for entry in first})
+    assert sync.watermark(CHANNEL)["video_id"] == "video000299"
+
+    channel.uploads[:0] = [{"id": "new2", "upload_date": "20250102"}, {"id": "new1", "upload_date": "20250101"}]
+    channel.pulled = 0
+    new = sync.new_uploads(CHANNEL)
+    assert [entry["id"] for entry in new] == ["new1", "new2"]
+    assert channel.pulled == 3, f"Listed {channel.pulled} entries"
+
+    # new1 failed: the watermark must not skip it
+    assert sync.commit(CHANNEL, new, {"new2"}) is None
+    assert [entry["id"] for entry in sync.new_uploads(CHANNEL)] == ["new1", "new2"]
+    os.remove(STORE)
+    print("✓ Sync stops at the watermark and keeps failed videos pending")
+
+def test_deleted_watermark_video_stops_at_date():
+    """If all recently handled videos disappeared, listing stops at the first older upload."""
+    if os.path.exists(STORE):
+        os.remove(STORE)
+    channel = FakeChannel(100)
+    sync = ChannelSync(STORE, lister=channel)
+    entries = sync.new_uploads(CHANNEL)
+    sync.commit(CHANNEL, entries, {entry["id"] for entry in entries})
+    del channel.uploads[:25] # More than the remembered recent IDs deleted
+    channel.uploads.insert(0, {"id": "fresh", "upload_date": "20250101"})
+    channel.pulled = 0
+    assert [entry["id"] for entry in sync.new_uploads(CHANNEL)] == ["fresh"]
+    assert channel.pulled == 2
+    os.remove(STORE)
+    print("✓ Deleted watermark video handled by upload date")
+
+def test_deleted_watermark_video_without_dates():
+    """Flat entries have no upload date: listing stops at the newest remaining known ID."""
+    if os.path.exists(STORE):
+        os.remove(STORE)
+    channel = FakeChannel(100)
+    for entry in channel.uploads:
+        del entry["upload_date"]
+    sync = ChannelSync(STORE, lister=channel)
+    entries = sync.new_uploads(CHANNEL)
+    sync.commit(CHANNEL, entries, {entry["id"] for entry in entries})
+    assert sync.watermark(CHANNEL)["recent_ids"][:2] == ["video000099", "video000098"]
+    del channel.uploads[:3] # The three newest videos deleted
+    channel.uploads.insert(0, {"id": "fresh"})
+    channel.pulled = 0
+    new = sync.new_uploads(CHANNEL)
+    assert [entry["id"] for entry in new] == ["fresh"] and channel.pulled == 2
+    sync.commit(CHANNEL, new, {"fresh"})
+    assert sync.watermark(CHANNEL)["recent_ids"][:2] == ["fresh", "video000099"]
+    assert len(sync.watermark(CHANNEL)["recent_ids"]) == 20
+    os.remove(STORE)
+    print("✓ Deleted watermark video handled by recent IDs")
+
+if __name__ == "__main__":
+    test_channel_key()
+    test_second_sync_stops_at_watermark()
+    test_deleted_watermark_video_stops_at_date()
+    test_deleted_watermark_video_without_dates()
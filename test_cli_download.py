@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the CLI waits on job completion events without network access.
+"""
+
+import os
+import shutil
+import time
+from cli_download import CLIDownloader
+from model.history import DownloadHistory
+
+HISTORY_DIR = "test_cli_history"
+
+def _history():
+    """A history of its own, so the tests never write to the user's state directory."""
+    shutil.rmtree(HISTORY_DIR, ignore_errors=True)
+    os.makedirs(HISTORY_DIR)
+    return DownloadHistory(os.path.join(HISTORY_DIR, "history.sqlite3"), flush_interval=0.05)
+
+def test_invalid_urls_fail_without_download():
+    """Invalid URLs are rejected up front and reported per URL."""
+    cli = CLIDownloader("test_downloads", jobs=2, history=_history())
+    results = cli.download_all(["not_a_url", "also_not_a_url", "not_a_url"])
+    assert results == [False, False, False], results
+    cli.close()
+    shutil.rmtree("test_downloads", ignore_errors=True)
+    shutil.rmtree(HISTORY_DIR, ignore_errors=True)
+    print("✓ Invalid URLs rejected")
+
+def test_in_process_completion_is_signalled():
+    """Finished jobs wake the CLI right away instead of on the next poll."""
+    history = _history()
+    cli = CLIDownloader("test_downloads", jobs=4, history=history)
+    start = time.perf_counter()
+    results = cli._download_in_process([f"not_a_url_{i}" for i in range(20)])
+    elapsed = time.perf_counter() - start
+    assert list(results.values()) == [False] * 20, results
+    assert elapsed < 1.0, f"20 jobs took {elapsed:.2f}s"
+    assert history.flush() and history.stats()["failed"] == 20, "Jobs go to the given history"
+    cli.close()
+    shutil.rmtree("test_downloads", ignore_errors=True)
+    shutil.rmtree(HISTORY_DIR, ignore_errors=True)
+    print(f"✓ 20 jobs finished in {elapsed * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    test_invalid_urls_fail_without_download()
+    test_in_process_completion_is_signalled()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script to verify clip window parsing and validation without network access.
+"""
+
+import shutil
+from model.downloader import VideoDownloader, check_clip, format_time, parse_time
+
+def test_parse_time():
+    """Seconds, MM:SS and HH:MM:SS are accepted; garbage is not."""
+    assert parse_time("90") == 90
+    assert parse_time("1:30") == 90
+    assert parse_time("1:02:03.5") == 3723.5
+    assert parse_time("90:00") == 5400, "The first part may be 60 or more"
+    for text in ("", "1::2", "a:10", "1:2:3:4", "-5", "1:-5", "-0:30", "1:75", "1:60:00", "1.5:30",
+                 "nan", "inf", "1e3", "+5"):
+        try:
+            parse_time(text)
+        except ValueError:
+            continue
+        raise AssertionError(f"{text!r} was accepted")
+    print("✓ Times parsed")
+
+def test_check_clip():
+    """Windows must be non-empty; an open end is allowed."""
+    assert check_clip(["30", 60]) == (30.0, 60.0)
+    assert check_clip((10, None)) == (10.0, None)
+    for clip in ((60, 30), (10, 10), (-1, 5), "30-60", None):
+        try:
+            check_clip(clip)
+        except ValueError:
+            continue
+        raise AssertionError(f"{clip!r} was accepted")
+    print("✓ Clip windows validated")
+
+def test_format_time():
+    """Times are rounded once to tenths, so a carry reaches the minutes and hours."""
+    assert format_time(3723.5) == "1:02:03.5" and format_time(30) == "0:00:30"
+    assert format_time(59.96) == "0:01:00"
+    assert format_time(3599.97) == "1:00:00"
+    assert format_time(0.04) == "0:00:00" and format_time(12.3) == "0:00:12.3"
+    print("✓ Times formatted")
+
+def test_clip_options():
+    """A clip job asks yt-dlp for just its window, without re-encoding, under a window-specific name."""
+    downloader = VideoDownloader("test_downloads")
+    context = downloader.create_context("https://youtu.be/dQw4w9WgXcQ", clip=(30, 60))
+    opts = downloader._ydl_options(context)
+    assert list(opts["download_ranges"]({"duration": 100}, None)) == [{"start_time": 30, "end_time": 60}]
+    assert opts["force_keyframes_at_cuts"] is False
+    assert opts["outtmpl"].endswith("%(title)s [%(section_start)s-%(section_end)s].%(ext)s")
+
+    context = downloader.create_context("https://youtu.be/dQw4w9WgXcQ", clip=(90, None))
+    ranges = list(downloader._ydl_options(context)["download_ranges"]({"duration": 100}, None))
+    assert ranges[0]["start_time"] == 90 and ranges[0]["end_time"] == float("inf"), ranges
+
+    opts = downloader._ydl_options(downloader.create_context("https://youtu.be/dQw4w9WgXcQ"))
+    assert "download_ranges" not in opts and opts["outtmpl"].endswith("%(title)s.%(ext)s")
+    shutil.rmtree("test_downloads", ignore_errors=True)
+    print("✓ Clip options built")
+
+def test_clip_without_ffmpeg_fails_early():
+    """Without ffmpeg a clip job fails before any network access."""
+    if shutil.which("ffmpeg"):
+        print("- ffmpeg installed, early failure not tested")
+        return
+    downloader = VideoDownloader("test_downloads")
+    results = []
+    context = downloader.create_context("https://youtu.be/dQw4w9WgXcQ", clip=(30, 60),
+                                        on_complete=lambda message, ok: results.append((message, ok)))
+    downloader.download_video(context.url, context)
+    assert results and not results[0][1] and context.error == "FFmpegNotFound", results
+    shutil.rmtree("test_downloads", ignore_errors=True)
+    print("✓ Clip without ffmpeg rejected")
+
+if __name__ == "__main__":
+    test_parse_time()
+    test_check_clip()
+    test_format_time()
+    test_clip_options()
+    test_clip_without_ffmpeg_fails_early()
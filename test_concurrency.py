@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the AIMD concurrency controller grows and shrinks its limits,
+and the fixed per-host and per-extractor limits.
+"""
+
+import functools
+import http.server
+import os
+import shutil
+import threading
+import time
+from model.concurrency import AIMDLimiter, ConcurrencyController, SemaphoreRegistry, classify_error, parse_limit
+from model.job_manager import COMPLETED, JobManager
+
+def test_additive_increase():
+    """A full window of healthy completions adds one slot."""
+    limiter = AIMDLimiter("test", initial=2, maximum=4)
+    for _ in range(2):
+        limiter.on_success(latency=1.0)
+    assert limiter.limit == 3, limiter.metrics()
+    for _ in range(20):
+        limiter.on_success(latency=1.0)
+    assert limiter.limit == 4, "Limit must not exceed the maximum"
+    print(f"✓ Additive increase capped at maximum: {limiter.metrics()}")
+
+def test_multiplicative_decrease():
+    """Overload signals halve the limit, once per cooldown window."""
+    limiter = AIMDLimiter("test", initial=8, minimum=1, cooldown=60)
+    limiter.on_overload("rate_limited")
+    limiter.on_overload("rate_limited") # Same congestion event, ignored
+    metrics = limiter.metrics()
+    assert metrics["limit"] == 4, metrics
+    assert metrics["rate_limited"] == 2, metrics
+    print(f"✓ Multiplicative decrease with cooldown: {metrics}")
+
+def test_latency_and_throughput_signals():
+    """Slow completions stop growth and collapsed throughput cuts the limit."""
+    limiter = AIMDLimiter("test", initial=2, cooldown=0)
+    limiter.on_success(latency=1.0, throughput=1000)
+    for _ in range(3): # The baseline catches up after that
+        limiter.on_success(latency=10.0)
+    assert limiter.limit == 2, "Unhealthy latency must not grow the limit"
+    limiter.on_success(latency=1.0, throughput=10)
+    assert limiter.limit == 1, limiter.metrics()
+    assert limiter.metrics()["collapse"] == 1
+    print("✓ Latency and throughput collapse signals handled")
+
+def test_baselines_recover():
+    """Lasting changes become the new baseline instead of pinning the limit."""
+    limiter = AIMDLimiter("test", initial=2, maximum=16, cooldown=0)
+    limiter.on_success(latency=2.0)
+    for _ in range(200):
+        limiter.on_success(latency=60.0) # Slower, but steadily so
+    assert limiter.limit > 2, limiter.metrics()
+
+    limiter = AIMDLimiter("test", initial=8, maximum=16, cooldown=0)
+    limiter.on_success(throughput=10_000_000)
+    for _ in range(50):
+        limiter.on_success(throughput=2_000_000) # The network got slower for good
+    metrics = limiter.metrics()
+    assert metrics["throughput_baseline"] < 3_000_000 and metrics["limit"] > 1, metrics
+
+    # Transfers are judged by throughput: a long download of a big file is not slow
+    limiter = AIMDLimiter("test", initial=2, maximum=16, cooldown=0)
+    for seconds, size in [(0.01, 10_000)] + [(0.05, 50_000)] * 20:
+        with limiter.slot() as slot:
+            slot.bytes = size
+            time.sleep(seconds)
+    assert limiter.metrics()["latency_baseline"] is None and limiter.limit > 2, limiter.metrics()
+    print("✓ Latency and throughput baselines recover")
+
+def test_slot_classifies_errors():
+    """Errors raised inside a slot are fed back into the limiter."""
+    limiter = AIMDLimiter("test", initial=4, cooldown=0)
+    try:
+        with limiter.slot():
+            raise Exception("ERROR: HTTP Error 429: Too Many Requests")
+    except Exception:
+        pass
+    assert limiter.limit == 2
+    assert limiter.in_flight == 0
+    assert classify_error(TimeoutError()) == "timeout"
+    assert classify_error(Exception("Video unavailable")) is None
+    print("✓ Slot errors classified and slot released")
+
+def test_limit_is_enforced():
+    """No more than `limit` threads hold a slot at the same time."""
+    limiter = AIMDLimiter("test", initial=2, maximum=2)
+    peak = {"value": 0}
+    lock = threading.Lock()
+    barrier = threading.Event()
+
+    def worker():
+        with limiter.slot():
+            with lock:
+                peak["value"] = max(peak["value"], limiter.in_flight)
+            barrier.wait(0.05)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak["value"] <= 2, peak
+    print(f"✓ Peak concurrency respected: {peak['value']}")
+
+def test_controller_metrics():
+    """Extraction and download stages are exposed separately."""
+    controller = ConcurrencyController()
+    metrics = controller.metrics()
+    assert set(metrics) == {"extraction", "download"}
+    print(f"✓ Controller metrics: {metrics}")
+
+def test_host_limits():
+    """A host limit covers its subdomains and caps parallel slots."""
+    registry = SemaphoreRegistry({"googlevideo.com": 3, "youtube.com": 4}, {})
+    assert registry.host_key("rr3---sn-abc.googlevideo.com") == "googlevideo.com"
+    assert registry.host_key("WWW.YouTube.com:443") == "youtube.com"
+    assert registry.host_key("notyoutube.com") is None and registry.host_key(None) is None
+    peak = {"value": 0}
+    lock = threading.Lock()
+
+    def worker(i):
+        with registry.slot(hosts=[f"rr{i}---sn-abc.googlevideo.com"]):
+            with lock:
+                peak["value"] = max(peak["value"], registry.metrics()["host:googlevideo.com"]["in_use"])
+            threading.Event().wait(0.02)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak["value"] == 3, peak
+    with registry.slot(hosts=["example.com"]): # Unconfigured hosts are not limited
+        assert "host:example.com" not in registry.metrics()
+    print(f"✓ Host limit enforced across subdomains: peak {peak['value']}")
+
+def test_extractor_limit_and_units():
+    """Extractions take one unit of their extractor; fragment fetches take several host units."""
+    registry = SemaphoreRegistry({"googlevideo.com": 8}, {"youtube": 1})
+    with registry.slot("youtube", ["www.youtube.com"]):
+        assert registry.metrics()["extractor:youtube"] == {"limit": 1, "in_use": 1, "waiting": 0}
+        waiting = threading.Thread(target=lambda: registry.slot("youtube").__enter__())
+        waiting.daemon = True
+        waiting.start()
+        waiting.join(0.1)
+        assert waiting.is_alive(), "Second extraction must wait"
+    waiting.join(1)
+    with registry.slot(hosts=["rr1---sn-abc.googlevideo.com"], units=100): # Capped at the limit
+        assert registry.metrics()["host:googlevideo.com"]["in_use"] == 8
+    assert parse_limit("GoogleVideo.com=32") == ("googlevideo.com", 32)
+    for text in ("youtube.com", "youtube.com=0", "=3"):
+        try:
+            parse_limit(text)
+            assert False, text
+        except ValueError:
+            pass
+    print("✓ Extractor limit and fragment units")
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+class _SlowHandler(_QuietHandler):
+    """Counts the transfers served at once; each takes long enough to overlap if not limited."""
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+        try:
+            time.sleep(0.3)
+            super().do_GET()
+        finally:
+            with cls.lock:
+                cls.active -= 1
+
+def test_downloads_use_registry():
+    """Media transfers count against the limit of the host they fetch from."""
+    os.makedirs("test_media", exist_ok=True)
+    with open(os.path.join("test_media", "18.mp4"), "wb") as f:
+        f.write(b"\0" * 50000)
+    handler = functools.partial(_SlowHandler, directory="test_media")
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    registry = SemaphoreRegistry({"127.0.0.1": 1}, {})
+    try:
+        manager = JobManager("test_downloads", max_workers=2, limits=registry,
+                             options={"quiet": True, "noprogress": True})
+        jobs = []
+        for video_id in ("dQw4w9WgXcQ", "jNQXAC9IVRw"):
+            fmt = {"format_id": "18", "url": f"http://127.0.0.1:{server.server_port}/18.mp4", "ext": "mp4",
+                   "vcodec": "avc1", "acodec": "mp4a", "protocol": "http", "filesize": 50000}
+            info = {"id": video_id, "title": video_id, "extractor": "youtube", "extractor_key": "Youtube",
+                    "webpage_url": f"https://www.youtube.com/watch?v={video_id}", "formats": [fmt], **fmt}
+            jobs.append(manager.submit(info["webpage_url"], info=info))
+        assert all(job.wait(30) and job.state == COMPLETED for job in jobs), [job.to_dict() for job in jobs]
+        assert registry.metrics()["host:127.0.0.1"] == {"limit": 1, "in_use": 0, "waiting": 0}
+        assert _SlowHandler.peak == 1, "The host limit of 1 must serialise the transfers"
+        manager.shutdown()
+    finally:
+        server.shutdown()
+        shutil.rmtree("test_media", ignore_errors=True)
+        shutil.rmtree("test_downloads", ignore_errors=True)
+    print("✓ Downloads limited by media host")
+
+def main():
+    """Run all tests."""
+    print("Concurrency Controller Test")
+    print("=" * 40)
+    test_additive_increase()
+    test_multiplicative_decrease()
+    test_latency_and_throughput_signals()
+    test_baselines_recover()
+    test_slot_classifies_errors()
+    test_limit_is_enforced()
+    test_controller_metrics()
+    test_host_limits()
+    test_extractor_limit_and_units()
+    test_downloads_use_registry()
+    print("=" * 40)
+    print("🎉 All concurrency tests passed!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the CLI event renderers and progress throttling.
+"""
+
+import io
+import json
+import shutil
+import sys
+from cli_download import CLIDownloader
+from view.console import ConsoleRenderer, JsonLinesRenderer
+
+class RecordingRenderer:
+    def __init__(self):
+        self.events = []
+
+    def start(self):
+        return self
+
+    def handle(self, event):
+        self.events.append(event)
+
+    def log(self, message):
+        self.events.append({"event": "log", "message": message})
+
+    def close(self):
+        pass
+
+def test_progress_events_are_throttled():
+    """Thousands of progress callbacks produce a handful of events plus the result."""
+    renderer = RecordingRenderer()
+    cli = CLIDownloader("test_downloads", renderer=renderer, progress_interval=0.5)
+    url = "https://youtu.be/dQw4w9WgXcQ"
+    for done in range(1, 10001):
+        cli.progress_callback(done * 100, 1000000, url)
+    cli.result_callback(url, True, "done", 1000000, 1000000, "video.mp4")
+    kinds = [event["event"] for event in renderer.events]
+    assert kinds.count("progress") <= 3, kinds # First, last (complete) and maybe one timed
+    result = renderer.events[-1]
+    assert result["event"] == "result" and result["path"] == "video.mp4" and result["error"] is None
+    shutil.rmtree("test_downloads", ignore_errors=True)
+    print(f"✓ 10000 progress callbacks -> {kinds.count('progress')} events")
+
+def test_json_lines_are_compact():
+    """Every event is one parseable line without extra whitespace."""
+    out = io.StringIO()
+    renderer = JsonLinesRenderer(out)
+    renderer.handle({"event": "result", "url": "u", "success": False, "error": "InvalidURL"})
+    line = out.getvalue()
+    assert line.endswith("\n") and line.count("\n") == 1 and ": " not in line
+    assert json.loads(line)["error"] == "InvalidURL"
+    print("✓ Compact JSON lines")
+
+def test_console_redraws_once_per_interval():
+    """Progress events between redraws are coalesced into one line."""
+    out = io.StringIO()
+    renderer = ConsoleRenderer(out, refresh_interval=60) # Timer never fires; redraw by hand
+    for done in range(1000):
+        renderer.handle({"event": "progress", "url": "u", "bytes": done, "total": 1000})
+    renderer.render()
+    renderer.render() # Nothing changed: no output
+    assert out.getvalue().count("\r") == 1, repr(out.getvalue())
+    renderer.handle({"event": "result", "url": "u", "success": True, "message": "Done"})
+    renderer.close()
+    assert out.getvalue().endswith("\n✅ Done\n"), repr(out.getvalue())
+    print("✓ Console output coalesced")
+
+def test_multi_bar_block_is_redrawn_in_place():
+    """One line per running download plus a total, rewritten over the previous block."""
+    out = io.StringIO()
+    renderer = ConsoleRenderer(out, refresh_interval=60, multiline=True)
+    for i in range(3):
+        renderer.handle({"event": "progress", "url": f"u{i}", "bytes": 512, "total": 1024, "speed": 100, "elapsed": 1})
+    renderer.render()
+    first = out.getvalue()
+    assert first.count("\n") == 4 and "\x1b[" not in first, repr(first)
+    assert first.splitlines()[-1].startswith("Total: 3 active"), first
+
+    renderer.handle({"event": "result", "url": "u0", "success": True, "message": "Done"})
+    renderer.render()
+    second = out.getvalue()[len(first):]
+    assert second.startswith("\x1b[4F\x1b[J✅ Done\n"), repr(second)
+    assert second.count("\n") == 4 # Result plus two bars and the total
+    print("✓ Multi-bar block redrawn in place")
+
+def test_log_goes_above_the_block():
+    """Status messages clear the block, print and redraw it, instead of landing inside it."""
+    out = io.StringIO()
+    renderer = ConsoleRenderer(out, refresh_interval=60, multiline=True)
+    for i in range(2):
+        renderer.handle({"event": "progress", "url": f"u{i}", "bytes": 512, "total": 1024, "speed": 100, "elapsed": 1})
+    renderer.render()
+    first = out.getvalue()
+    renderer.log("⚠️  Download daemon unavailable")
+    second = out.getvalue()[len(first):]
+    assert second.startswith("\x1b[3F\x1b[J⚠️  Download daemon unavailable\n"), repr(second)
+    assert second.splitlines()[-1].startswith("Total: 2 active"), "Block redrawn below the message"
+
+    out = io.StringIO()
+    renderer = ConsoleRenderer(out, refresh_interval=60)
+    renderer.handle({"event": "progress", "url": "u", "bytes": 5, "total": 10})
+    renderer.render()
+    renderer.log("🚀 Starting download...")
+    assert out.getvalue().endswith("\n🚀 Starting download...\n\rProgress: 50.0% (0.0/0.0 MB)"), \
+        repr(out.getvalue())
+
+    out, err = io.StringIO(), io.StringIO()
+    stderr, sys.stderr = sys.stderr, err
+    try:
+        JsonLinesRenderer(out).log("🔗 URL: u")
+    finally:
+        sys.stderr = stderr
+    assert out.getvalue() == "" and err.getvalue() == "🔗 URL: u\n", "JSON output stays parseable"
+
+    renderer = RecordingRenderer()
+    cli = CLIDownloader("test_downloads", renderer=renderer)
+    cli.download_all(["not a url"], use_daemon=False)
+    logs = [event["message"] for event in renderer.events if event["event"] == "log"]
+    assert any(message.startswith("🔗 URL: not a url") for message in logs), logs
+    shutil.rmtree("test_downloads", ignore_errors=True)
+    print("✓ Status messages printed above the progress display")
+
+if __name__ == "__main__":
+    test_progress_events_are_throttled()
+    test_json_lines_are_compact()
+    test_console_redraws_once_per_interval()
+    test_multi_bar_block_is_redrawn_in_place()
+    test_log_goes_above_the_block()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script to verify disk-space admission control without network access.
+"""
+
+import shutil
+import threading
+from types import SimpleNamespace
+from model.disk_space import DiskReservations, expected_bytes
+from model.job_manager import COMPLETED, FAILED, QUEUED, RUNNING, JobManager
+
+MB = 1024 * 1024
+
+def _wait_for(condition):
+    for _ in range(250):
+        if condition():
+            return True
+        threading.Event().wait(0.02)
+    return False
+
+def test_expected_bytes():
+    """Sizes come from filesize, filesize_approx or bitrate; merges count twice."""
+    assert expected_bytes({'filesize': 100 * MB}) == 100 * MB
+    merged = {'requested_formats': [{'filesize': 300 * MB}, {'filesize_approx': 20 * MB}]}
+    assert expected_bytes(merged) == 640 * MB
+    assert expected_bytes({'tbr': 800, 'duration': 100}) == 10_000_000
+    assert expected_bytes({'filesize': 100 * MB, 'duration': 100}, clip=(25, 75)) == 50 * MB
+    assert expected_bytes({'filesize': 100 * MB, 'duration': 100, 'section_start': 90, 'section_end': 100}) == 10 * MB
+    assert expected_bytes({'format_id': '18'}) is None
+    print("✓ Expected sizes estimated")
+
+def test_reservations():
+    """Reservations count until written or released."""
+    disk = DiskReservations(keep_free=100, disk_usage=lambda path: SimpleNamespace(free=1000))
+    first = disk.reserve(".", 600)
+    assert first is not None and disk.available(".") == 300
+    assert disk.reserve(".", 400) is None, "Must not overbook the disk"
+    disk.update(first, 200) # Written bytes are already gone from the free space
+    assert disk.outstanding() == 400
+    disk.release(first)
+    assert disk.reserve(".", 900) is not None
+    print("✓ Reservations booked and released")
+
+def _manager(free):
+    """JobManager on a fake disk whose downloads admit their size, then wait for a release."""
+    manager = JobManager("test_downloads", max_workers=4,
+                         disk_space=DiskReservations(keep_free=0, disk_usage=lambda path: SimpleNamespace(free=free)))
+    gates = {}
+
+    def download_video(url, context):
+        context.admit(expected_bytes(context.info or {'filesize': gates[url][1]}))
+        gates[url][0].wait(5)
+        context.report_complete("done", True)
+
+    manager.downloader.download_video = download_video
+    return manager, gates
+
+def test_jobs_held_until_space_frees():
+    """Jobs that don't fit wait in the queue and start when space is released."""
+    manager, gates = _manager(1000 * MB)
+    jobs = []
+    for i, size in enumerate((400, 400, 400)):
+        url = f"https://youtu.be/video{i:06d}"
+        gates[url] = (threading.Event(), size * MB)
+        jobs.append(manager.submit(url, info={'filesize': size * MB}))
+    admitted = [job._reservation is not None for job in jobs]
+    assert admitted == [True, True, False], "Third job must be held"
+    assert _wait_for(lambda: jobs[1].state == RUNNING) and jobs[2].state == QUEUED
+
+    gates[jobs[0].url][0].set()
+    assert _wait_for(lambda: jobs[2].state == RUNNING), jobs[2].to_dict()
+    for gate, _ in gates.values():
+        gate.set()
+    assert all(job.wait(5) and job.state == COMPLETED for job in jobs)
+    assert manager.disk_space.outstanding() == 0
+    manager.shutdown()
+    shutil.rmtree("test_downloads", ignore_errors=True)
+    print("✓ Jobs held until space was released")
+
+def test_deferred_after_extraction():
+    """A job whose size is known only after extraction goes back to the queue."""
+    manager, gates = _manager(1000 * MB)
+    gates["https://youtu.be/aaaaaaaaaaa"] = (threading.Event(), 600 * MB)
+    gates["https://youtu.be/bbbbbbbbbbb"] = (threading.Event(), 600 * MB)
+    first = manager.submit("https://youtu.be/aaaaaaaaaaa")
+    second = manager.submit("https://youtu.be/bbbbbbbbbbb")
+    # Both extract at once; whichever admits second is put back in the queue
+    assert _wait_for(lambda: any(job.state == QUEUED and job.message for job in (first, second)))
+    held = first if first.state == QUEUED else second
+    assert held.expected_bytes == 600 * MB and "disk space" in held.message, held.to_dict()
+
+    gates[first.url][0].set()
+    gates[second.url][0].set()
+    assert first.wait(5) and second.wait(5), held.to_dict()
+    assert first.state == second.state == COMPLETED
+    manager.shutdown()
+    shutil.rmtree("test_downloads", ignore_errors=True)
+    print("✓ Oversized job deferred and resumed")
+
+def test_job_larger_than_disk_fails():
+    """A job that can never fit fails instead of blocking the queue."""
+    manager, gates = _manager(100 * MB)
+    gates["https://youtu.be/ccccccccccc"] = (threading.Event(), 0)
+    job = manager.submit("https://youtu.be/ccccccccccc", info={'filesize': 200 * MB})
+    assert job.wait(5) and job.state == FAILED and job.error == "InsufficientDiskSpace", job.to_dict()
+    manager.shutdown()
+    shutil.rmtree("test_downloads", ignore_errors=True)
+    print(f"✓ Oversized job failed: {job.message}")
+
+if __name__ == "__main__":
+    test_expected_bytes()
+    test_reservations()
+    test_jobs_held_until_space_frees()
+    test_deferred_after_extraction()
+    test_job_larger_than_disk_fails()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the download daemon and its client over a temporary
+Unix socket, with a stubbed download instead of YouTube.
+"""
+
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from download_daemon import DaemonClient, DownloadDaemon
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def _state_dir():
+    """Keeps the daemon's history, lock and log files out of the user's state directory."""
+    directory = tempfile.mkdtemp(prefix="ytd-test-")
+    os.environ["YTD_STATE_DIR"] = directory
+    return directory
+
+def test_download_through_daemon():
+    """A download runs in the daemon; progress and the result come back over the socket."""
+    directory = _state_dir()
+    path = os.path.join(directory, "daemon.sock")
+    daemon = DownloadDaemon(path, save_path=os.path.join(directory, "downloads"), idle_timeout=1, prewarm=False)
+
+    def download_video(url, context):
+        for done in (1000, 2000):
+            context.report_progress(done, 2000)
+        context.filepath = os.path.join(context.save_path, "video.mp4")
+        context.digest = "sha256:abc"
+        context.report_complete("Successfully downloaded: \"video\"", True)
+
+    daemon.manager.downloader.download_video = download_video
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = DaemonClient(path, autostart=False)
+        assert _wait_for(lambda: client.connect() is not None)
+        progress, results = [], []
+        success = client.download("https://youtu.be/dQw4w9WgXcQ", os.path.join(directory, "downloads"),
+                                  on_progress=lambda done, total: progress.append(done), on_result=results.append)
+        assert success is True
+        assert progress[-1] == 2000, progress
+        assert results[0]["path"].endswith("video.mp4") and results[0]["digest"] == "sha256:abc"
+        thread.join(10) # Exits once idle
+        assert not thread.is_alive() and not os.path.exists(path)
+    finally:
+        os.environ.pop("YTD_STATE_DIR", None)
+        shutil.rmtree(directory, ignore_errors=True)
+    print("✓ Download through the daemon")
+
+def _fake_daemon(path, replies):
+    """Accepts one connection, reads the request, sends `replies` and hangs up."""
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(1)
+
+    def serve():
+        conn, _ = server.accept()
+        with conn:
+            conn.makefile("rb").readline()
+            conn.sendall(replies)
+        server.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+
+def test_fallback_and_disconnect():
+    """No daemon means fallback (None); a lost or garbled daemon after acceptance means failure."""
+    directory = tempfile.mkdtemp(prefix="ytd-test-")
+    try:
+        path = os.path.join(directory, "daemon.sock")
+        assert DaemonClient(path, autostart=False).download("https://youtu.be/dQw4w9WgXcQ", directory) is None
+
+        _fake_daemon(path, b"")
+        assert DaemonClient(path, autostart=False).download("https://youtu.be/dQw4w9WgXcQ", directory) is None
+        os.unlink(path)
+
+        for replies in (b'{"type": "accepted", "job_id": "1"}\n{"type": "progress", "bytes_downloaded": 5, '
+                        b'"total_bytes": 10}\n',
+                        b'{"type": "accepted", "job_id": "1"}\nnot json\n'):
+            _fake_daemon(path, replies)
+            completed, results = [], []
+            success = DaemonClient(path, autostart=False).download(
+                "https://youtu.be/dQw4w9WgXcQ", directory, on_complete=lambda *args: completed.append(args),
+                on_result=results.append)
+            assert success is False, replies
+            assert completed and completed[0][1] is False
+            assert results[0]["error"] == "DaemonDisconnected"
+            os.unlink(path)
+        assert results[0]["bytes_downloaded"] == 0
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    print("✓ Fallback only before the daemon accepted the job")
+
+def test_protocol_errors():
+    """Unknown commands and malformed requests get an answer, not a dropped daemon."""
+    directory = _state_dir()
+    path = os.path.join(directory, "daemon.sock")
+    daemon = DownloadDaemon(path, idle_timeout=1, prewarm=False, save_path=os.path.join(directory, "downloads"))
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = DaemonClient(path, autostart=False)
+        assert _wait_for(lambda: client.connect() is not None)
+        for request in (b'{"cmd": "ping"}\n', b'{"cmd": "nope"}\n'):
+            with client.connect() as sock:
+                sock.sendall(request)
+                reply = json.loads(sock.makefile("rb").readline())
+            assert reply["type"] in ("pong", "complete"), reply
+            assert reply["type"] == "pong" or reply["success"] is False
+        with client.connect() as sock:
+            sock.sendall(b"garbage\n")
+            assert sock.makefile("rb").readline() == b"" # Connection closed, daemon still up
+        assert client.connect() is not None
+        second = DownloadDaemon(path, idle_timeout=1, prewarm=False, save_path=os.path.join(directory, "downloads"))
+        assert second.manager is None, "A second daemon must not set anything up"
+        second.serve_forever() # Returns at once
+        assert client.connect() is not None
+        thread.join(10)
+    finally:
+        os.environ.pop("YTD_STATE_DIR", None)
+        shutil.rmtree(directory, ignore_errors=True)
+    print("✓ Protocol errors handled")
+
+if __name__ == "__main__":
+    test_download_through_daemon()
+    test_fallback_and_disconnect()
+    test_protocol_errors()
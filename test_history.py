@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the SQLite download history.
+"""
+
+import os
+import shutil
+from model.history import DownloadHistory
+from model.job_manager import FAILED, JobManager
+
+HISTORY_DIR = "test_history"
+
+def _job(index, state="completed", error=None, video_id=None):
+    return {"url": f"https://www.youtube.com/watch?v={video_id or index}", "title": f"Video {index}",
+            "state": state, "path": f"/tmp/{index}.mp4" if state == "completed" else None,
+            "started_at": 1000.0 + index, "finished_at": 1010.0 + index, "total_bytes": 5000,
+            "bytes_downloaded": 5000 if state == "completed" else 100, "error": error, "digest": None}
+
+def _history():
+    shutil.rmtree(HISTORY_DIR, ignore_errors=True)
+    os.makedirs(HISTORY_DIR)
+    return DownloadHistory(os.path.join(HISTORY_DIR, "history.sqlite3"), flush_interval=0.05)
+
+def test_keyset_paging():
+    """Pages follow each other by ID, newest first, in both directions."""
+    history = _history()
+    try:
+        for i in range(1, 251):
+            history.record(_job(i, *(("failed", "HTTPError") if i % 10 == 0 else ())), video_id=f"v{i % 7}")
+        assert history.flush()
+        assert history.last_id() == 250
+        first = history.page(limit=100)
+        assert [row["id"] for row in first] == list(range(250, 150, -1))
+        second = history.page(before_id=first[-1]["id"], limit=100)
+        assert second[0]["id"] == 150 and second[-1]["id"] == 51
+        back = history.page_after(second[0]["id"], limit=5)
+        assert [row["id"] for row in back] == [155, 154, 153, 152, 151]
+
+        failed = history.page(limit=50, state="failed")
+        assert len(failed) == 25 and all(row["error"] == "HTTPError" for row in failed)
+        assert all(row["video_id"] == "v3" for row in history.for_video("v3"))
+        stats = history.stats()
+        assert stats["count"] == 250 and stats["failed"] == 25 and stats["completed"] == 225
+        assert stats["bytes"] == 225 * 5000 + 25 * 100 and stats["average_speed"]
+        assert history.stats(since=1010.0 + 201)["count"] == 50
+        assert history.error_counts() == [("HTTPError", 25)]
+    finally:
+        history.close()
+        shutil.rmtree(HISTORY_DIR, ignore_errors=True)
+    print("✓ Keyset pages, filters and totals")
+
+def test_queries_use_indexes():
+    """No history query scans the whole table; the plans are of the SQL the methods really run."""
+    history = _history()
+    try:
+        db = history._connect()
+        queries = []
+        execute = history._execute
+        history._execute = lambda sql, params: queries.append((sql, params)) or execute(sql, params)
+        history.page(limit=50)
+        history.page(before_id=100, limit=50)
+        history.page(before_id=100, limit=50, state="failed")
+        history.page_after(100, limit=50)
+        history.page_after(100, limit=50, state="failed")
+        history.for_video("x", 10)
+        history.stats(since=0)
+        history.stats()
+        history.error_counts()
+        history.last_id()
+        assert len(queries) == 10
+        for sql, params in queries:
+            plan = " ".join(row[-1] for row in db.execute("EXPLAIN QUERY PLAN " + sql, params))
+            if "FROM totals" in sql:
+                continue
+            # The newest page walks the primary key backwards and stops at the LIMIT
+            newest_page = plan == "SCAN downloads" and sql.endswith("ORDER BY id DESC LIMIT ?")
+            assert "SEARCH downloads" in plan or newest_page, f"{sql}: {plan}"
+        assert "FROM totals" in queries[7][0], "All-time totals must not aggregate the rows"
+    finally:
+        history.close()
+        shutil.rmtree(HISTORY_DIR, ignore_errors=True)
+    print("✓ Queries go through indexes")
+
+def test_totals_of_existing_database():
+    """A database written before the totals table gets its totals summed up on open."""
+    history = _history()
+    path = history.path
+    try:
+        for i in range(1, 21):
+            history.record(_job(i, *(("failed", "HTTPError") if i % 4 == 0 else ())))
+        assert history.flush()
+        expected = history.stats()
+        db = history._connect()
+        with db:
+            db.execute("DROP TABLE totals")
+        history.close()
+        history = DownloadHistory(path, flush_interval=0.05)
+        assert history.stats() == expected, (history.stats(), expected)
+        history.record(_job(21))
+        assert history.flush() and history.stats()["count"] == 21
+        db = history._connect()
+        with db: # A row the totals don't know about: only a new backfill would count it
+            db.execute("INSERT INTO downloads (finished_at, url, state) VALUES (0, 'x', 'failed')")
+        history.close()
+        history = DownloadHistory(path, flush_interval=0.05)
+        assert history.stats()["count"] == 21, "Opening must not sum up the rows again"
+    finally:
+        history.close()
+        shutil.rmtree(HISTORY_DIR, ignore_errors=True)
+    print("✓ Totals summed up for existing databases")
+
+def test_record_after_close_is_reported():
+    """Rows recorded after close() are refused instead of queued for a stopped writer."""
+    history = _history()
+    try:
+        assert history.record(_job(1))
+        history.close()
+        history.close() # Idempotent
+        assert not history.record(_job(2))
+        reopened = DownloadHistory(history.path)
+        assert reopened.stats()["count"] == 1
+        reopened.close()
+    finally:
+        shutil.rmtree(HISTORY_DIR, ignore_errors=True)
+    print("✓ Record after close refused")
+
+def test_manager_records_finished_jobs():
+    """The JobManager writes each finished job once."""
+    history = _history()
+    try:
+        manager = JobManager("test_downloads", max_workers=1, history=history)
+        job = manager.submit("https://www.youtube.com/watch?v=")
+        assert job.wait(30) and job.state == FAILED
+        assert history.flush()
+        rows = history.page()
+        assert len(rows) == 1 and rows[0]["state"] == FAILED and rows[0]["url"] == job.url
+        assert rows[0]["error"] == job.error
+        manager.shutdown()
+    finally:
+        history.close()
+        shutil.rmtree(HISTORY_DIR, ignore_errors=True)
+        shutil.rmtree("test_downloads", ignore_errors=True)
+    print("✓ Finished jobs recorded")
+
+if __name__ == "__main__":
+    test_keyset_paging()
+    test_queries_use_indexes()
+    test_totals_of_existing_database()
+    test_record_after_close_is_reported()
+    test_manager_records_finished_jobs()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the history window's paging and reloads, on a stub
+Treeview and an in-memory source so no display or database is needed.
+"""
+
+from test_job_panel import MockScrollbar, MockTree
+from view.history_panel import HistoryWindow
+
+class FakeSource:
+    """DownloadHistory stand-in: rows with dense IDs, every tenth one failed."""
+
+    def __init__(self, count):
+        self.rows = [{"id": i, "finished_at": 0, "title": f"Video {i}", "url": "", "state":
+                      "failed" if i % 10 == 0 else "completed", "bytes": 0, "duration": None, "speed": None,
+                      "path": None, "error": None} for i in range(1, count + 1)]
+
+    def _select(self, state):
+        return [row for row in self.rows if state is None or row["state"] == state]
+
+    def last_id(self):
+        return len(self.rows)
+
+    def page(self, before_id=None, limit=50, state=None):
+        rows = [row for row in self._select(state) if before_id is None or row["id"] < before_id]
+        return rows[::-1][:limit]
+
+    def page_after(self, after_id, limit=50, state=None):
+        return [row for row in self._select(state) if row["id"] > after_id][:limit][::-1]
+
+class MockVar:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+class MockLabel:
+    def config(self, text):
+        self.text = text
+
+def _window(source, visible_rows=3):
+    """A HistoryWindow wired to stubs, in the state __init__ leaves it in."""
+    window = HistoryWindow.__new__(HistoryWindow)
+    window.source = source
+    window.visible_rows = visible_rows
+    window.failed_only = MockVar(False)
+    window.count_label = MockLabel()
+    window.tree = MockTree()
+    window.scrollbar = MockScrollbar()
+    blank = ("",) * len(HistoryWindow.COLUMNS)
+    window._slots = [window.tree.insert("", "end", values=blank) for _ in range(visible_rows)]
+    window._rows = []
+    window._last_id = 0
+    window.reload()
+    return window
+
+def _titles(window):
+    return [window.tree.values[slot][1] for slot in window._slots]
+
+def test_scrolling_keeps_window_at_the_ends():
+    """Scrolling past the oldest row keeps the last full window on screen."""
+    window = _window(FakeSource(5))
+    assert _titles(window) == ["Video 5", "Video 4", "Video 3"]
+    window._scroll(3)
+    assert _titles(window) == ["Video 2", "Video 1", ""]
+    window._scroll(3)
+    assert _titles(window) == ["Video 2", "Video 1", ""], "An empty page must not blank the window"
+    window._scroll(-3)
+    assert _titles(window) == ["Video 5", "Video 4", "Video 3"]
+    print("✓ Paging stops at the ends")
+
+def test_reload_replaces_rows_even_when_empty():
+    """Filtering to failed rows when there are none shows nothing, not the old rows."""
+    window = _window(FakeSource(5))
+    window.failed_only.value = True
+    window.reload()
+    assert _titles(window) == ["", "", ""] and window._rows == []
+    window.source.rows.extend(FakeSource(10).rows[5:])
+    window.reload()
+    assert _titles(window) == ["Video 10", "", ""]
+    print("✓ Reload replaces the rows")
+
+if __name__ == "__main__":
+    test_scrolling_keeps_window_at_the_ends()
+    test_reload_replaces_rows_even_when_empty()
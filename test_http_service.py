@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the HTTP service's request handling, routing and event stream.
+"""
+
+import asyncio
+import json
+import shutil
+from http_service import MAX_BODY_SIZE, DownloadService
+from model.job_manager import JobManager
+
+VIDEO_URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+async def _request(port, raw):
+    """Sends raw request bytes and returns (status, headers text, body bytes)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw)
+    await writer.drain()
+    response = await asyncio.wait_for(reader.read(), 10)
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), head.decode("latin-1"), body
+
+def _http(method, path, body=None):
+    data = json.dumps(body).encode() if body is not None else b""
+    return (f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(data)}\r\n\r\n").encode() + data
+
+async def _with_service(scenario):
+    # Paused manager: submitted jobs stay queued, nothing touches the network
+    manager = JobManager("test_downloads", max_workers=0, disk_space=False)
+    service = DownloadService(manager)
+    server = await asyncio.start_server(service._handle_connection, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        async with server:
+            await scenario(port, manager)
+    finally:
+        manager.shutdown()
+        shutil.rmtree("test_downloads", ignore_errors=True)
+
+def test_routing():
+    """Jobs are submitted, listed, fetched and cancelled; unknown routes get 404/405."""
+    async def scenario(port, manager):
+        status, _, body = await _request(port, _http("POST", "/jobs", {"url": VIDEO_URL}))
+        assert status == 202, body
+        job_id = json.loads(body)["jobs"][0]["id"]
+        status, _, body = await _request(port, _http("GET", "/jobs"))
+        assert status == 200 and [job["id"] for job in json.loads(body)["jobs"]] == [job_id]
+        status, _, body = await _request(port, _http("GET", f"/jobs/{job_id}/"))
+        assert status == 200 and json.loads(body)["state"] == "queued"
+        status, _, body = await _request(port, _http("DELETE", f"/jobs/{job_id}"))
+        assert status == 202 and manager.get(job_id).state == "cancelled"
+        assert (await _request(port, _http("GET", "/jobs/nope")))[0] == 404
+        assert (await _request(port, _http("GET", "/nowhere")))[0] == 404
+        assert (await _request(port, _http("PUT", "/jobs")))[0] == 405
+        assert (await _request(port, _http("POST", f"/jobs/{job_id}")))[0] == 405
+        status, _, body = await _request(port, _http("GET", "/metrics"))
+        assert status == 200 and "limits" in json.loads(body)
+    asyncio.run(_with_service(scenario))
+    print("✓ Routing, 404 and 405")
+
+def test_bad_requests():
+    """Malformed requests get a 400 or 413 response instead of a dropped connection."""
+    async def scenario(port, manager):
+        bad_bodies = [b"not json", b"[1, 2]", json.dumps({"url": "https://example.com/x"}).encode(),
+                      json.dumps({"url": VIDEO_URL, "max_abr": True}).encode(),
+                      json.dumps({"url": VIDEO_URL, "max_abr": -1}).encode(),
+                      json.dumps({"url": VIDEO_URL, "clip": [30, 10]}).encode(),
+                      json.dumps({"url": VIDEO_URL, "save_path": 5}).encode(), b"{}"]
+        for data in bad_bodies:
+            raw = f"POST /jobs HTTP/1.1\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data
+            status, _, body = await _request(port, raw)
+            assert status == 400, (data, body)
+        for length in ("abc", "-5"):
+            status, _, body = await _request(port, f"POST /jobs HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+            assert status == 400 and b"Content-Length" in body, body
+        assert (await _request(port, b"garbage\r\n\r\n"))[0] == 400
+        raw = f"POST /jobs HTTP/1.1\r\nContent-Length: {MAX_BODY_SIZE + 1}\r\n\r\n".encode()
+        assert (await _request(port, raw))[0] == 413
+        assert not manager.jobs()
+    asyncio.run(_with_service(scenario))
+    print("✓ 400 and 413 responses")
+
+def test_server_errors_get_a_response():
+    """Failures past validation get a JSON 503/500 and a closed connection, never a hang."""
+    async def scenario(port, manager):
+        manager.shutdown(wait=False)
+        status, _, body = await _request(port, _http("POST", "/jobs", {"url": VIDEO_URL}))
+        assert status == 503 and "error" in json.loads(body), body
+
+        def broken(*args, **kwargs):
+            raise TypeError("unexpected")
+
+        manager.submit_batch = broken
+        status, _, body = await _request(port, _http("POST", "/jobs", {"url": VIDEO_URL}))
+        assert status == 500 and json.loads(body) == {"error": "Internal server error."}, body
+    asyncio.run(_with_service(scenario))
+    print("✓ 500 and 503 responses")
+
+def test_event_stream():
+    """A job's event stream starts with its state and ends with its final state."""
+    async def scenario(port, manager):
+        job = manager.submit(VIDEO_URL)
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(_http("GET", f"/events?job={job.id}"))
+        await writer.drain()
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 10)
+        assert b"200 OK" in head and b"text/event-stream" in head
+        first = await asyncio.wait_for(reader.readuntil(b"\n\n"), 10)
+        assert first.startswith(b"event: state") and b'"queued"' in first
+        manager.cancel(job.id)
+        rest = await asyncio.wait_for(reader.read(), 10) # Stream closes after the final state
+        assert b'"cancelled"' in rest, rest
+        writer.close()
+        assert (await _request(port, _http("GET", "/events?job=nope")))[0] == 404
+    asyncio.run(_with_service(scenario))
+    print("✓ Server-Sent Events stream")
+
+if __name__ == "__main__":
+    test_routing()
+    test_bad_requests()
+    test_server_errors_get_a_response()
+    test_event_stream()
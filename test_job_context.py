@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Test script to verify per-job contexts keep concurrent downloads apart.
+"""
+
+import shutil
+import threading
+from model.downloader import VideoDownloader
+
+def test_contexts_keep_callbacks_apart():
+    """Each job reports through its own callbacks on a shared downloader."""
+    downloader = VideoDownloader("test_downloads")
+    results = {}
+    threads = []
+    for index in range(8):
+        context = downloader.create_context(
+            f"not_a_url_{index}",
+            on_complete=lambda message, ok, index=index: results.setdefault(index, []).append(ok)
+        )
+        threads.append(threading.Thread(target=downloader.download_video, args=(context.url, context)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {index: [False] for index in range(8)}, results
+    shutil.rmtree("test_downloads", ignore_errors=True)
+    print("✓ 8 parallel jobs each reported once to their own callback")
+
+def test_context_captures_save_path():
+    """Changing the downloader's save path doesn't move jobs already created."""
+    downloader = VideoDownloader("test_downloads")
+    context = downloader.create_context("https://youtu.be/dQw4w9WgXcQ")
+    downloader.save_path = "test_downloads/other"
+    assert context.save_path == "test_downloads"
+    assert downloader.create_context(context.url).save_path == "test_downloads/other"
+    shutil.rmtree("test_downloads", ignore_errors=True)
+    print("✓ Save path captured per job")
+
+if __name__ == "__main__":
+    test_contexts_keep_callbacks_apart()
+    test_context_captures_save_path()
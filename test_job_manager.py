@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the JobManager tracks job state without network access.
+"""
+
+import os
+import shutil
+import time
+from model.job_manager import CANCELLED, COMPLETED, FAILED, INFO_MAX_AGE, QUEUED, JobManager
+
+def test_invalid_url_fails():
+    """An invalid URL ends in the failed state and notifies listeners."""
+    manager = JobManager("test_downloads", max_workers=1)
+    events = []
+    manager.add_listener(events.append)
+
+    job = manager.submit("not_a_url")
+    assert job.wait(5), "Job did not finish"
+    assert job.state == FAILED, job.to_dict()
+    assert "Invalid" in job.message
+    states = [event["job"]["state"] for event in events if event["type"] == "state"]
+    assert states == ["queued", "running", "failed"], states
+    manager.shutdown()
+    shutil.rmtree("test_downloads", ignore_errors=True)
+    print(f"✓ Invalid URL failed with: {job.message}")
+
+def test_cancel_queued_job():
+    """A queued job can be cancelled before a worker picks it up."""
+    manager = JobManager("test_downloads", max_workers=0) # Paused queue
+
+    job = manager.submit("not_a_url")
+    assert manager.cancel(job.id)
+    assert job.done and job.state == CANCELLED
+    assert not manager.cancel(job.id), "Finished jobs can't be cancelled again"
+    manager.max_workers = 1
+    manager.shutdown()
+    assert job.state == CANCELLED, "Cancelled job must not run"
+    shutil.rmtree("test_downloads", ignore_errors=True)
+    print("✓ Queued job cancelled")
+
+def test_bounded_queue_and_dedupe():
+    """Jobs wait for a free slot and duplicate videos are not queued twice."""
+    manager = JobManager("test_downloads", max_workers=0)
+    first = manager.submit("https://youtu.be/dQw4w9WgXcQ")
+    again = manager.submit("https://www.youtube.com/watch?v=dQw4w9WgXcQ", dedupe=True)
+    other = manager.submit("https://youtu.be/jrCMnbcRa9s", dedupe=True)
+    assert again is first, "Duplicate video must return the unfinished job"
+    assert other is not first
+    assert [job.state for job in manager.jobs()] == [QUEUED, QUEUED], "Nothing may start while paused"
+
+    manager.save_jobs("test_pending.json", manager.unfinished_jobs())
+    manager.shutdown(wait=False)
+    assert first.state == CANCELLED
+
+    restored = JobManager("test_downloads", max_workers=0)
+    jobs = restored.restore_jobs("test_pending.json")
+    assert [job.url for job in jobs] == [first.url, other.url]
+    assert not os.path.exists("test_pending.json")
+    restored.shutdown(wait=False)
+    shutil.rmtree("test_downloads", ignore_errors=True)
+    print("✓ Paused queue, duplicate suppression and job persistence")
+
+def test_dedupe_is_indexed():
+    """Dedupe looks jobs up by video instead of scanning them, and finished jobs leave the index."""
+    manager = JobManager("test_downloads", max_workers=0, disk_space=False)
+    start = time.perf_counter()
+    for i in range(5000):
+        manager.submit(f"https://youtu.be/{i:011d}", dedupe=True)
+    elapsed = time.perf_counter() - start
+    assert elapsed < 3, f"5000 dedupe submits took {elapsed:.1f}s"
+
+    first = manager.submit("https://youtu.be/dQw4w9WgXcQ")
+    second = manager.submit("https://youtu.be/dQw4w9WgXcQ") # Duplicate queued on purpose
+    manager.cancel(first.id)
+    assert manager.find_unfinished("https://www.youtube.com/watch?v=dQw4w9WgXcQ") is second
+    manager.cancel(second.id)
+    assert manager.find_unfinished("https://youtu.be/dQw4w9WgXcQ") is None
+    assert manager.submit("https://youtu.be/dQw4w9WgXcQ", dedupe=True) not in (first, second)
+    manager.shutdown(wait=False)
+    assert not manager._unfinished, "Cancelled jobs must leave the index"
+    shutil.rmtree("test_downloads", ignore_errors=True)
+    print(f"✓ 5000 dedupe submits in {elapsed * 1000:.0f} ms")
+
+def test_stale_info_dropped_at_start():
+    """Pre-extracted info that aged past INFO_MAX_AGE in the queue is not used."""
+    manager = JobManager("test_downloads", max_workers=0, disk_space=False)
+    seen = {}
+
+    def download_video(url, context):
+        seen[url] = context.info
+        context.report_complete("Done", True)
+
+    manager.downloader.download_video = download_video
+    stale = manager.submit("https://youtu.be/dQw4w9WgXcQ", info={"title": "Stale"},
+                           info_time=time.monotonic() - INFO_MAX_AGE - 1)
+    fresh = manager.submit("https://youtu.be/jrCMnbcRa9s", info={"title": "Fresh"})
+    manager.max_workers = 1
+    assert stale.wait(5) and fresh.wait(5), "Jobs did not finish"
+    assert stale.state == fresh.state == COMPLETED
+    assert seen[stale.url] is None, "Expired info must be extracted again"
+    assert seen[fresh.url] == {"title": "Fresh"}
+    manager.shutdown()
+    shutil.rmtree("test_downloads", ignore_errors=True)
+    print("✓ Expired info dropped when the job starts")
+
+def main():
+    """Run all tests."""
+    print("Job Manager Test")
+    print("=" * 40)
+    test_invalid_url_fails()
+    test_cancel_queued_job()
+    test_bounded_queue_and_dedupe()
+    test_dedupe_is_indexed()
+    test_stale_info_dropped_at_start()
+    print("=" * 40)
+    print("🎉 All job manager tests passed!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the slim job metadata record, using a local HTTP server instead of YouTube.
+"""
+
+import functools
+import http.server
+import os
+import shutil
+import threading
+from model.downloader import slim_info
+from model.job_manager import COMPLETED, JobManager
+from model.job_metadata import JobMetadata
+
+FORMATS = [
+    {"format_id": "137", "url": "https://example.invalid/137", "vcodec": "avc1", "acodec": "none", "height": 1080},
+    {"format_id": "140", "url": "https://example.invalid/140", "vcodec": "none", "acodec": "mp4a"},
+    {"format_id": "18", "url": "https://example.invalid/18", "vcodec": "avc1", "acodec": "mp4a", "height": 360,
+     "filesize": 5000},
+]
+
+def test_keeps_selected_formats_only():
+    """Only the chosen format(s) and the listed fields survive."""
+    info = {"id": "dQw4w9WgXcQ", "title": "Title", "duration": 60, "thumbnails": [{}] * 40,
+            "automatic_captions": {"en": []}, "formats": FORMATS, "format_id": "18"}
+    meta = slim_info(info)
+    assert [f["format_id"] for f in meta.formats] == ["18"]
+    assert meta.get("title") == "Title" and meta.get("thumbnails", "gone") == "gone"
+    assert meta.full_size == 5000
+    assert not hasattr(meta, "__dict__"), "Must stay a __slots__ record"
+
+    merged = JobMetadata.from_info(dict(info, format_id="137+140", requested_formats=FORMATS[:2]))
+    rebuilt = merged.to_info()
+    assert [f["format_id"] for f in rebuilt["formats"]] == ["137", "140"]
+    assert rebuilt["id"] == "dQw4w9WgXcQ" and "automatic_captions" not in rebuilt
+    print("✓ Only the selected formats kept")
+
+def test_download_from_slim_record():
+    """A queued job keeps the slim record and yt-dlp downloads from it."""
+    os.makedirs("test_media", exist_ok=True)
+    with open(os.path.join("test_media", "18.mp4"), "wb") as f:
+        f.write(b"\0" * 50000)
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory="test_media")
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.RequestHandlerClass.log_message = lambda *args: None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        fmt = {"format_id": "18", "url": f"http://127.0.0.1:{server.server_port}/18.mp4", "ext": "mp4",
+               "vcodec": "avc1", "acodec": "mp4a", "height": 360, "protocol": "http", "filesize": 50000}
+        info = {"id": "dQw4w9WgXcQ", "title": "Local video", "extractor": "youtube", "extractor_key": "Youtube",
+                "webpage_url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "formats": [fmt], **fmt}
+
+        manager = JobManager("test_downloads", max_workers=0, options={"quiet": True, "noprogress": True})
+        job = manager.submit(info["webpage_url"], info=info)
+        assert isinstance(job.info, JobMetadata), "Queued job must not hold the full info dict"
+        manager.max_workers = 1
+        assert job.wait(30) and job.state == COMPLETED, job.to_dict()
+        assert os.path.getsize(job.path) == 50000 and job.digest
+        manager.shutdown()
+    finally:
+        server.shutdown()
+        shutil.rmtree("test_media", ignore_errors=True)
+        shutil.rmtree("test_downloads", ignore_errors=True)
+    print("✓ Downloaded from the slim record")
+
+if __name__ == "__main__":
+    test_keeps_selected_formats_only()
+    test_download_from_slim_record()
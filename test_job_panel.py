@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the virtualized job panel: row formatting, scrolling and
+slot reuse, on a stub Treeview so no display is needed.
+"""
+
+from view.job_panel import JobPanel, format_duration, format_speed
+
+class MockTree:
+    """Stub Treeview recording item writes and scheduled idle callbacks."""
+
+    def __init__(self):
+        self.values = {}
+        self.writes = 0
+        self.idle = []
+
+    def insert(self, parent, index, values):
+        slot = f"I{len(self.values):03d}"
+        self.values[slot] = values
+        return slot
+
+    def item(self, slot, values):
+        self.values[slot] = values
+        self.writes += 1
+
+    def after_idle(self, callback):
+        self.idle.append(callback)
+
+class MockScrollbar:
+    def __init__(self):
+        self.position = None
+
+    def set(self, first, last):
+        self.position = (first, last)
+
+def _panel(visible_rows=3):
+    """A JobPanel wired to stubs, in the state __init__ leaves it in."""
+    panel = JobPanel.__new__(JobPanel)
+    panel.visible_rows = visible_rows
+    panel.tree = MockTree()
+    panel.scrollbar = MockScrollbar()
+    blank = ("",) * len(JobPanel.COLUMNS)
+    panel._slots = [panel.tree.insert("", "end", values=blank) for _ in range(visible_rows)]
+    panel._shown = [blank] * visible_rows
+    panel._order = []
+    panel._rows = {}
+    panel._offset = 0
+    panel._refresh_pending = False
+    panel._refresh()
+    return panel
+
+def _job(index, state="queued", **fields):
+    job = {"id": f"job{index}", "url": f"https://youtu.be/{index:011d}", "title": None, "state": state,
+           "bytes_downloaded": 0, "total_bytes": 0, "speed": None, "eta": None}
+    job.update(fields)
+    return job
+
+def _shown(panel):
+    return [panel.tree.values[slot][0] for slot in panel._slots]
+
+def test_format_helpers():
+    """Speeds pick a unit, durations drop the hours when there are none."""
+    assert format_speed(None) == "" and format_speed(0) == ""
+    assert format_speed(512) == "512 B/s"
+    assert format_speed(1536) == "1.5 KB/s"
+    assert format_speed(1.4 * 1024 ** 2) == "1.4 MB/s"
+    assert format_speed(3 * 1024 ** 3) == "3.0 GB/s"
+    assert format_duration(None) == "" and format_duration(0) == "0:00"
+    assert format_duration(75.9) == "1:15"
+    assert format_duration(3723) == "1:02:03"
+    print("✓ Speed and duration formatted")
+
+def test_format_row():
+    """Running jobs show speed and ETA; others only state and progress."""
+    panel = _panel()
+    running = _job(1, "running", title="Video", bytes_downloaded=250, total_bytes=1000, speed=2048, eta=90)
+    assert panel._format_row(running) == ("Video", "running", "25.0%", "2.0 KB/s", "1:30")
+    finished = dict(running, state="completed", bytes_downloaded=1000)
+    assert panel._format_row(finished) == ("Video", "completed", "100.0%", "", "")
+    assert panel._format_row(_job(2)) == ("https://youtu.be/00000000002", "queued", "", "", "")
+    print("✓ Rows formatted")
+
+def test_updates_batched_and_slots_reused():
+    """Many updates cost one idle refresh; only changed slots are written."""
+    panel = _panel(visible_rows=3)
+    for i in range(100):
+        panel.update_job(_job(i))
+    assert len(panel.tree.idle) == 1, "One refresh per idle cycle"
+    writes = panel.tree.writes
+    panel.tree.idle.pop()()
+    assert len(panel.tree.values) == 3, "Only visible_rows items ever exist"
+    assert _shown(panel) == [f"https://youtu.be/{i:011d}" for i in range(3)]
+    assert panel.tree.writes - writes == 3
+    assert panel.scrollbar.position == (0, 0.03)
+
+    writes = panel.tree.writes
+    panel.update_job(_job(50, "running")) # Off screen
+    panel.update_job(_job(1, "running"))
+    panel.tree.idle.pop()()
+    assert panel.tree.writes - writes == 1, "Only the changed visible slot is redrawn"
+    assert panel.tree.values[panel._slots[1]][1] == "running"
+    print("✓ Updates batched, slots reused")
+
+def test_scroll_to():
+    """Scrolling is clamped to the list and refills the same slots."""
+    panel = _panel(visible_rows=3)
+    for i in range(10):
+        panel.update_job(_job(i))
+    panel.tree.idle.pop()()
+    panel._scroll_to(5)
+    assert panel._offset == 5 and _shown(panel) == [f"https://youtu.be/{i:011d}" for i in (5, 6, 7)]
+    panel._scroll_to(100)
+    assert panel._offset == 7 and panel.scrollbar.position == (0.7, 1.0)
+    panel._scroll_to(-4)
+    assert panel._offset == 0
+    writes = panel.tree.writes
+    panel._scroll_to(0) # No change, no redraw
+    assert panel.tree.writes == writes
+    panel._on_scrollbar("scroll", "1", "pages")
+    assert panel._offset == 3
+    panel._on_scrollbar("moveto", "0.5")
+    assert panel._offset == 5
+
+    short = _panel(visible_rows=3)
+    short.update_job(_job(1))
+    short.tree.idle.pop()()
+    short._scroll_to(2)
+    assert short._offset == 0 and _shown(short) == ["https://youtu.be/00000000001", "", ""]
+    assert short.scrollbar.position == (0, 1)
+    print("✓ Scrolling clamped and slots refilled")
+
+if __name__ == "__main__":
+    test_format_helpers()
+    test_format_row()
+    test_updates_batched_and_slots_reused()
+    test_scroll_to()
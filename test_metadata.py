@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the metadata export keeps only the selected fields
+and writes JSON lines plus a columnar file, without network access.
+"""
+
+import csv
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from metadata_export import MetadataExporter
+from model.metadata import select_fields
+
+INFO = {
+    "id": "dQw4w9WgXcQ", "title": "Video", "duration": 212, "filesize_approx": 12345,
+    "formats": [{"format_id": "18"}, {"format_id": "22"}], "thumbnails": [{"url": "x"}] * 50,
+}
+
+def test_select_fields():
+    """Known, derived and missing fields are reduced to scalars."""
+    row = select_fields(INFO, ["id", "duration", "filesize", "format_count", "formats", "uploader"])
+    assert row == {"id": "dQw4w9WgXcQ", "duration": 212, "filesize": 12345, "format_count": 2,
+                   "formats": "18,22", "uploader": None}, row
+    print("✓ Fields selected")
+
+def _export(file_format):
+    os.makedirs("test_metadata", exist_ok=True)
+    exporter = MetadataExporter("test_metadata/out", ["id", "title", "duration"], file_format, max_concurrency=4)
+
+    def extract_info(url):
+        if url.endswith("jrCMnbcRa9s"):
+            raise ValueError("Video unavailable")
+        return dict(INFO, id=url[-11:])
+
+    exporter.downloader.extract_info = extract_info
+    urls = b"https://youtu.be/dQw4w9WgXcQ\nnot_a_url\nhttps://youtu.be/jrCMnbcRa9s\nhttps://youtu.be/dQw4w9WgXcQ\n"
+    counts = exporter.run(io.BytesIO(urls))
+    assert counts == {"exported": 1, "failed": 1}, counts
+    with open("test_metadata/out.jsonl", encoding="utf-8") as f:
+        rows = sorted((json.loads(line) for line in f), key=lambda row: row["url"])
+    assert rows[0] == {"url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "id": "dQw4w9WgXcQ",
+                       "title": "Video", "duration": 212, "error": None}, rows[0]
+    assert rows[1]["error"] == "ValueError" and rows[1]["title"] is None
+    return exporter.columnar.path
+
+def test_export_csv():
+    """Without pyarrow (or when asked) the columnar file is CSV."""
+    path = _export("csv")
+    with open(path, encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["id"] for row in sorted(rows, key=lambda row: row["url"])] == ["dQw4w9WgXcQ", ""]
+    shutil.rmtree("test_metadata", ignore_errors=True)
+    print("✓ JSON lines and CSV written")
+
+def test_export_parquet():
+    """With pyarrow installed the columnar file is Parquet with typed columns."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("- pyarrow not installed, Parquet export not tested")
+        return
+    path = _export("parquet")
+    table = pq.read_table(path)
+    assert table.column_names == ["url", "id", "title", "duration", "error"]
+    assert str(table.schema.field("duration").type) == "int64"
+    assert sorted(table.column("duration").to_pylist(), key=str) == [212, None]
+    shutil.rmtree("test_metadata", ignore_errors=True)
+    print("✓ JSON lines and Parquet written")
+
+def test_extraction_limits_follow_max_concurrency():
+    """--max-concurrency is not capped by the process-wide per-host and per-extractor limits."""
+    exporter = MetadataExporter("test_metadata/out", ["id"], "csv", max_concurrency=8)
+    try:
+        peak = {"value": 0, "now": 0}
+        lock = threading.Lock()
+        all_in = threading.Barrier(8, timeout=5)
+
+        def extraction():
+            with exporter.downloader.limits.slot("youtube", ["www.youtube.com"]):
+                with lock:
+                    peak["now"] += 1
+                    peak["value"] = max(peak["value"], peak["now"])
+                all_in.wait() # Breaks (raises) if fewer than 8 can be inside at once
+                with lock:
+                    peak["now"] -= 1
+
+        threads = [threading.Thread(target=extraction) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert peak["value"] == 8 and not all_in.broken, peak
+    finally:
+        exporter.jsonl.close()
+        exporter.columnar.close()
+        shutil.rmtree("test_metadata", ignore_errors=True)
+    print("✓ Extraction limits sized from --max-concurrency")
+
+def test_unknown_fields_rejected():
+    """A typo in --fields stops the export with a usage error before anything is written."""
+    for fields, error in (("id,titel", "unknown field(s) titel"), (" , ", "needs at least one field")):
+        result = subprocess.run([sys.executable, "metadata_export.py", "-o", "test_metadata/out", "--fields", fields,
+                                 "https://youtu.be/dQw4w9WgXcQ"], capture_output=True, text=True)
+        assert result.returncode == 2, result.stderr
+        assert error in result.stderr, result.stderr
+    assert not os.path.exists("test_metadata")
+    print("✓ Unknown fields rejected")
+
+if __name__ == "__main__":
+    test_select_fields()
+    test_export_csv()
+    test_export_parquet()
+    test_extraction_limits_follow_max_concurrency()
+    test_unknown_fields_rejected()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the managed player cache without network access.
+"""
+
+import os
+import tempfile
+import time
+from model.downloader import VideoDownloader
+from model.player_cache import PlayerCache
+
+def _write(cache, section, name, size, age):
+    path = os.path.join(cache.directory, section, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"x" * size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+def test_stats_per_section():
+    """Files are counted per yt-dlp cache section."""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = PlayerCache(directory)
+        _write(cache, "youtube-sigfuncs", "a.json", 100, 0)
+        _write(cache, "youtube-nsig", "b.json", 300, 0)
+        _write(cache, "youtube-nsig", "c.json", 200, 0)
+        stats = cache.stats()
+        assert stats["files"] == 3 and stats["bytes"] == 600
+        assert stats["sections"]["youtube-nsig"] == {"files": 2, "bytes": 500}
+        assert cache.options() == {"cachedir": directory}
+        print("✓ Cache stats reported per section")
+
+def test_trim_evicts_oldest():
+    """Over the cap the oldest files go first, down to 90% of the cap."""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = PlayerCache(directory, max_bytes=1000)
+        oldest = _write(cache, "youtube-nsig", "old.json", 400, 300)
+        older = _write(cache, "youtube-nsig", "older.json", 400, 200)
+        newest = _write(cache, "youtube-sigfuncs", "new.json", 400, 100)
+        _write(cache, "youtube-nsig", "small.json", 150, 150)
+        assert cache.trim(force=True) == 2 # 1350 bytes -> 550, the first size under 900
+        assert not os.path.exists(oldest) and not os.path.exists(older) and os.path.exists(newest)
+        assert cache.trim() == 0 # Throttled
+        cache.clear()
+        assert cache.stats()["files"] == 0
+        print("✓ Oldest cache files evicted")
+
+def test_downloader_uses_cache():
+    """Downloaders share the process-wide cache unless given one."""
+    with tempfile.TemporaryDirectory() as directory:
+        cache = PlayerCache(directory)
+        assert VideoDownloader(directory, player_cache=cache).player_cache is cache
+        assert VideoDownloader(directory).player_cache is VideoDownloader(directory).player_cache
+        print("✓ Downloaders share the player cache")
+
+if __name__ == "__main__":
+    test_stats_per_section()
+    test_trim_evicts_oldest()
+    test_downloader_uses_cache()
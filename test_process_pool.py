@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the process pool: extraction in warm workers, whole jobs
+with streamed progress and their results, and shutdown.
+"""
+
+import functools
+import http.server
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+from model.downloader import VideoDownloader
+from model.process_pool import ProcessPool
+
+STEPS = 5
+TOTAL = 5000
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+def _fake_download(self, url, context):
+    """Stands in for VideoDownloader.download_video in the workers: no network, paced progress."""
+    for step in range(1, STEPS + 1):
+        time.sleep(0.12) # Past the pool's progress throttle, so every step is sent
+        context.report_progress(TOTAL * step // STEPS, TOTAL)
+    context.filepath = os.path.join(context.save_path, f"{url[-11:]}.mp4")
+    context.saved_bytes = 123
+    context.digest = "sha256:abc"
+    context.report_complete("done", True)
+
+def test_extract_in_worker():
+    """Extraction runs in a worker and returns a picklable info dict."""
+    os.makedirs("test_media", exist_ok=True)
+    with open(os.path.join("test_media", "clip.mp4"), "wb") as f:
+        f.write(b"\0" * 1000)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_QuietHandler, directory="test_media"))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    pool = ProcessPool(max_workers=2)
+    try:
+        pool.prewarm()
+        url = f"http://127.0.0.1:{server.server_port}/clip.mp4"
+        infos = [future.result(60) for future in [pool.extract(url), pool.extract(url)]]
+        assert all(info["url"] == url and info["ext"] == "mp4" for info in infos), infos
+    finally:
+        pool.shutdown()
+        server.shutdown()
+        shutil.rmtree("test_media", ignore_errors=True)
+    print("✓ Extraction in warm workers")
+
+def test_run_job_streams_progress_and_result():
+    """Every progress event arrives before the job resolves, and the result carries the context fields."""
+    if multiprocessing.get_start_method() != "fork":
+        print("- Skipped: the fake download reaches the workers only through fork")
+        return
+    original = VideoDownloader.download_video
+    VideoDownloader.download_video = _fake_download # Inherited by the forked workers
+    pool = ProcessPool(max_workers=2)
+    try:
+        progress = {1: [], 2: []}
+        completed = {}
+        futures = {}
+        for n in (1, 2):
+            futures[n] = pool.run_job(f"https://youtu.be/video{n:06d}", "test_downloads",
+                                      on_progress=lambda done, total, n=n: progress[n].append(done),
+                                      on_complete=lambda message, ok, n=n: completed.setdefault(n, list(progress[n])))
+        for n, future in futures.items():
+            result = future.result(60)
+            assert result["success"] and result["message"] == "done", result
+            assert result["filepath"] == os.path.join("test_downloads", f"video{n:06d}.mp4")
+            assert result["saved_bytes"] == 123 and result["digest"] == "sha256:abc" and result["error"] is None
+            assert progress[n] == [TOTAL * step // STEPS for step in range(1, STEPS + 1)], progress[n]
+            assert completed[n] == progress[n], "on_complete ran before the last progress event"
+        assert not pool._jobs, "Finished jobs must be dropped"
+    finally:
+        VideoDownloader.download_video = original
+        pool.shutdown()
+    print("✓ Progress streamed and results returned")
+
+def test_downloader_copies_pool_result():
+    """With process_jobs the context gets the worker's path, digest and saved bytes."""
+    if multiprocessing.get_start_method() != "fork":
+        print("- Skipped: the fake download reaches the workers only through fork")
+        return
+    original = VideoDownloader.download_video
+    VideoDownloader.download_video = _fake_download
+    pool = ProcessPool(max_workers=2)
+    try:
+        downloader = VideoDownloader("test_downloads", process_pool=pool, process_jobs=True)
+        context = downloader.create_context("https://youtu.be/dQw4w9WgXcQ")
+        original(downloader, context.url, context) # The parent runs the real method
+        assert context.filepath == os.path.join("test_downloads", "dQw4w9WgXcQ.mp4")
+        assert context.digest == "sha256:abc" and context.saved_bytes == 123
+    finally:
+        VideoDownloader.download_video = original
+        pool.shutdown()
+        shutil.rmtree("test_downloads", ignore_errors=True)
+    print("✓ Pool results copied onto the job context")
+
+def test_shutdown_stops_pump():
+    """Shutdown stops the workers and the event pump thread."""
+    pool = ProcessPool(max_workers=2)
+    pool.prewarm()
+    pool.shutdown()
+    pool._pump.join(5)
+    assert not pool._pump.is_alive()
+    print("✓ Shutdown")
+
+if __name__ == "__main__":
+    test_extract_in_worker()
+    test_run_job_streams_progress_and_result()
+    test_downloader_copies_pool_result()
+    test_shutdown_stops_pump()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the ProgressPoller collapses updates to the latest per key.
+"""
+
+from view.progress_poller import ProgressPoller
+
+class MockRoot:
+    """Mock Tk root recording scheduled callbacks."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback, *args):
+        self.scheduled.append((ms, callback))
+        return len(self.scheduled)
+
+    def after_cancel(self, after_id):
+        self.scheduled[after_id - 1] = None
+
+def test_latest_update_per_key():
+    """Only the last update per key is applied, in arrival order."""
+    poller = ProgressPoller(MockRoot())
+    applied = []
+    for value in range(1000):
+        poller.push("job-1", applied.append, ("job-1", value))
+    poller.push("status", applied.append, ("status", "done"))
+    poller.push("job-2", applied.append, ("job-2", 5))
+    poller.push("job-1", applied.append, ("job-1", "reset"))
+
+    assert poller.drain() == 3
+    assert applied == [("status", "done"), ("job-2", 5), ("job-1", "reset")], applied
+    assert poller.drain() == 0, "Queue must be empty after a drain"
+    print("✓ 1003 pushes collapsed into 3 UI updates")
+
+def test_fixed_interval_timer():
+    """The poller reschedules itself on the configured interval."""
+    root = MockRoot()
+    poller = ProgressPoller(root, interval_ms=50)
+    poller.start()
+    poller.start() # Idempotent
+    assert len(root.scheduled) == 1 and root.scheduled[0][0] == 50
+    root.scheduled[0][1]() # Fire the timer
+    assert len(root.scheduled) == 2 and root.scheduled[1][0] == 50
+    poller.stop()
+    assert root.scheduled[1] is None
+    print("✓ Poller drains on a fixed 50 ms timer")
+
+if __name__ == "__main__":
+    test_latest_update_per_key()
+    test_fixed_interval_timer()
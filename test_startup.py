@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the entry points don't import heavy dependencies at start-up.
+"""
+
+import subprocess
+import sys
+
+ENTRY_POINTS = ["cli_download", "yt_dlp_downloader", "main", "http_service", "metadata_export",
+               "download_daemon"]
+LAZY_MODULES = ["yt_dlp", "PIL", "requests", "pyarrow"]
+
+def test_entry_points_import_lazily():
+    """Importing an entry point must not load yt_dlp, PIL, requests or pyarrow."""
+    for module in ENTRY_POINTS:
+        check = f"import sys, {module}; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+        result = subprocess.run([sys.executable, "-c", check], capture_output=True, text=True, check=True)
+        eager = result.stdout.strip()
+        assert not eager, f"{module} imports {eager} at start-up"
+        print(f"✓ {module} starts without heavy imports")
+
+if __name__ == "__main__":
+    test_entry_points_import_lazily()
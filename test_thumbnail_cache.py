@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the thumbnail disk cache: writes, size accounting and LRU eviction.
+The disk level needs neither PIL nor the network.
+"""
+
+import os
+import shutil
+from view.thumbnail_cache import ThumbnailCache
+
+CACHE_DIR = "test_thumbnails"
+
+def _cache(max_disk_bytes):
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    return ThumbnailCache(CACHE_DIR, max_disk_bytes=max_disk_bytes)
+
+def _age(cache, key, mtime):
+    os.utime(cache._path(key), (mtime, mtime))
+
+def test_write_and_read():
+    """Written thumbnails are read back and counted once, even when replaced."""
+    cache = _cache(10_000)
+    try:
+        assert cache._read_disk("missing") is None
+        cache._write_disk("a", b"x" * 300)
+        cache._write_disk("a", b"y" * 200) # Replaced, not added
+        assert cache._read_disk("a") == b"y" * 200
+        assert cache._disk_usage == 200
+        assert not [name for name in os.listdir(CACHE_DIR) if name.endswith(".tmp")]
+        assert ThumbnailCache(CACHE_DIR)._disk_usage == 200, "Usage must be measured on start"
+    finally:
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    print("✓ Thumbnails written, replaced and read back")
+
+def test_evicts_least_recently_used():
+    """Going over the cap removes the least recently used files down to 90%."""
+    cache = _cache(1000)
+    try:
+        for i, key in enumerate("abc"):
+            cache._write_disk(key, b"x" * 300)
+            _age(cache, key, 1000 + i)
+        cache._read_disk("a") # Now the most recently used
+        _age(cache, "b", 1001)
+        _age(cache, "c", 1002)
+        cache._write_disk("d", b"x" * 300) # 1200 bytes > 1000
+        remaining = sorted(name[0] for name in os.listdir(CACHE_DIR))
+        assert remaining == ["a", "c", "d"], remaining
+        assert cache._disk_usage == 900
+    finally:
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+    print("✓ Least recently used thumbnails evicted")
+
+if __name__ == "__main__":
+    test_write_and_read()
+    test_evicts_least_recently_used()
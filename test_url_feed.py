@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script to verify streaming URL ingestion: validation, de-duplication,
+backpressure and checkpoint resume.
+"""
+
+import io
+import os
+import time
+from model.downloader import VideoDownloader
+from model.url_feed import UrlFeed
+
+VIDEO_ID = VideoDownloader("test_downloads").video_id
+URLS = [f"https://youtu.be/{i:011d}" for i in range(100)]
+
+def _drain(feed, limit=None):
+    entries = []
+    while limit is None or len(entries) < limit:
+        entry = feed.get()
+        if entry is None:
+            break
+        entries.append(entry)
+    return entries
+
+def test_normalizes_and_dedupes():
+    """Invalid lines and repeated videos are dropped, URLs normalized."""
+    data = b"\n".join([b"# comment", b"https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=10", b"",
+                       b"not_a_url", b"https://youtu.be/dQw4w9WgXcQ", b"https://youtube.com/shorts/jrCMnbcRa9s"])
+    feed = UrlFeed(io.BytesIO(data), VIDEO_ID).start()
+    entries = _drain(feed)
+    assert [entry.url for entry in entries] == [
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "https://www.youtube.com/watch?v=jrCMnbcRa9s"]
+    assert feed.stats == {"lines": 6, "accepted": 2, "invalid": 1, "duplicates": 1}, feed.stats
+    print("✓ URLs validated, normalized and de-duplicated")
+
+def test_dedupe_window():
+    """Only the `max_seen` most recent IDs are remembered; 0 turns de-duplication off."""
+    lines = [URLS[0], URLS[1], URLS[0], URLS[2], URLS[1], URLS[0]]
+    data = "\n".join(lines).encode()
+    feed = UrlFeed(io.BytesIO(data), VIDEO_ID, max_seen=2).start()
+    # The repeated 0 is a duplicate and becomes the most recent; 2 pushes out 1,
+    # so 1 is accepted again and pushes out 0, which is accepted again too
+    assert [entry.video_id for entry in _drain(feed)] == [f"{i:011d}" for i in (0, 1, 2, 1, 0)]
+    assert len(feed._seen) == 2 and feed.stats["duplicates"] == 1, feed.stats
+    feed = UrlFeed(io.BytesIO(data), VIDEO_ID, max_seen=0).start()
+    assert len(_drain(feed)) == 6 and not feed._seen
+    feed = UrlFeed(io.BytesIO(data), VIDEO_ID, max_seen=None).start()
+    assert len(_drain(feed)) == 3
+    print("✓ De-duplication window bounded")
+
+def test_reader_blocks_when_queue_is_full():
+    """The reader stays at most `max_pending` entries ahead of the consumers."""
+    feed = UrlFeed(io.BytesIO("\n".join(URLS).encode()), VIDEO_ID, max_pending=5).start()
+    time.sleep(0.2)
+    assert feed.stats["accepted"] <= 6, feed.stats # Queue plus the entry waiting to be put
+    assert len(_drain(feed)) == 100
+    print("✓ Bounded queue applies backpressure")
+
+def test_resume_from_checkpoint():
+    """An interrupted run resumes after the last contiguous finished entry."""
+    checkpoint = "test_feed_checkpoint.json"
+    data = "\n".join(URLS).encode()
+    feed = UrlFeed(io.BytesIO(data), VIDEO_ID, max_pending=10, checkpoint_path=checkpoint).start()
+    entries = _drain(feed, limit=10)
+    for entry in entries[:5] + entries[6:]: # Entry 5 never finished
+        feed.mark_done(entry)
+    assert not feed.close()
+    assert os.path.exists(checkpoint)
+
+    resumed = UrlFeed(io.BytesIO(data), VIDEO_ID, checkpoint_path=checkpoint).start()
+    rest = _drain(resumed)
+    assert rest[0].url == entries[5].url and len(rest) == 95, (rest[0].url, len(rest))
+    for entry in rest:
+        resumed.mark_done(entry)
+    assert resumed.close(), "Fully handled input must report completion"
+    assert not os.path.exists(checkpoint), "Checkpoint is removed after a complete run"
+    print("✓ Checkpoint resumes at the first unfinished entry")
+
+if __name__ == "__main__":
+    test_normalizes_and_dedupes()
+    test_dedupe_window()
+    test_reader_blocks_when_queue_is_full()
+    test_resume_from_checkpoint()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the watch-folder ingestion, with a fake download instead of YouTube.
+"""
+
+import os
+import shutil
+import threading
+import time
+from model.job_manager import JobManager
+from model.watch_folder import FAILED_DIR, PROCESSED_DIR, PROCESSING_DIR, InotifyWatcher, WatchFolder
+
+INBOX = "test_inbox"
+FAILING_ID = "failing0000"
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def _manager():
+    """JobManager whose downloads succeed at once, except for FAILING_ID."""
+    manager = JobManager("test_downloads", max_workers=4, disk_space=False)
+
+    def download_video(url, context):
+        context.error = "HTTPError" if FAILING_ID in url else None
+        context.report_complete("done", FAILING_ID not in url)
+
+    manager.downloader.download_video = download_video
+    return manager
+
+def _drop(name, lines):
+    """Writes a list the way producers should: under a temporary name, then renamed."""
+    with open(os.path.join(INBOX, name + ".tmp"), "w") as f:
+        f.write("\n".join(lines) + "\n")
+    os.rename(os.path.join(INBOX, name + ".tmp"), os.path.join(INBOX, name))
+
+def _run(polling):
+    shutil.rmtree(INBOX, ignore_errors=True)
+    os.makedirs(INBOX)
+    _drop("early.txt", ["https://youtu.be/dQw4w9WgXcQ"]) # Dropped before the daemon started
+    manager = _manager()
+    watch = WatchFolder(INBOX, manager, polling=polling, poll_interval=0.05).start()
+    try:
+        assert _wait_for(lambda: os.path.exists(os.path.join(INBOX, PROCESSED_DIR, "early.txt")))
+        submitted = len(manager.jobs())
+
+        start = time.perf_counter()
+        _drop("good.txt", ["# list", "", "https://www.youtube.com/watch?v=jrCMnbcRa9s",
+                           "https://youtu.be/jNQXAC9IVRw"])
+        assert _wait_for(lambda: watch.stats["urls"] == 3)
+        latency = time.perf_counter() - start
+        _drop("bad.txt", ["https://youtu.be/jNQXAC9IVRx", f"https://youtu.be/{FAILING_ID}", "not a url"])
+        _drop("empty.txt", ["# nothing"])
+        assert _wait_for(lambda: watch.stats["processed"] + watch.stats["failed"] == 4), watch.stats
+
+        assert sorted(os.listdir(os.path.join(INBOX, PROCESSED_DIR))) == ["early.txt", "good.txt"]
+        assert sorted(os.listdir(os.path.join(INBOX, FAILED_DIR))) == [
+            "bad.txt", "bad.txt.errors", "empty.txt", "empty.txt.errors"]
+        with open(os.path.join(INBOX, FAILED_DIR, "bad.txt.errors")) as f:
+            report = f.read()
+        assert FAILING_ID in report and "HTTPError" in report and "not a url\tInvalid URL" in report
+        assert "jNQXAC9IVRx" not in report
+        assert not os.listdir(os.path.join(INBOX, PROCESSING_DIR))
+        assert len(manager.jobs()) <= submitted, "Finished watch-folder jobs must be forgotten"
+        return watch.mode, latency
+    finally:
+        watch.stop()
+        watch.stop() # A second stop (e.g. signal handler plus shutdown) is harmless
+        manager.shutdown()
+        shutil.rmtree(INBOX, ignore_errors=True)
+        shutil.rmtree("test_downloads", ignore_errors=True)
+
+def test_inotify_close_is_idempotent():
+    """Closing twice wakes names() once and never writes to the released pipe."""
+    os.makedirs(INBOX, exist_ok=True)
+    try:
+        watcher = InotifyWatcher(INBOX)
+    except (OSError, AttributeError):
+        shutil.rmtree(INBOX, ignore_errors=True)
+        print("- inotify unavailable, not tested")
+        return
+    results = []
+    thread = threading.Thread(target=lambda: results.append(watcher.names()))
+    thread.start()
+    watcher.close()
+    thread.join(5)
+    watcher.close()
+    watcher.close()
+    assert results == [None] and not thread.is_alive()
+    shutil.rmtree(INBOX, ignore_errors=True)
+    print("✓ inotify watcher closed twice")
+
+def test_inotify():
+    """New lists are picked up within milliseconds and sorted by outcome."""
+    mode, latency = _run(polling=False)
+    assert mode == "inotify"
+    assert latency < 0.5, latency
+    print(f"✓ inotify: list ingested in {latency * 1000:.1f} ms")
+
+def test_polling_fallback():
+    """Without inotify the same lists end up in the same places."""
+    mode, latency = _run(polling=True)
+    assert mode == "polling"
+    print(f"✓ Polling fallback: list ingested in {latency * 1000:.1f} ms")
+
+def test_reading_pauses_at_max_pending():
+    """A long list is read only as fast as its jobs finish."""
+    shutil.rmtree(INBOX, ignore_errors=True)
+    os.makedirs(INBOX)
+    manager = _manager()
+    manager.max_workers = 0 # Paused: nothing finishes until resumed
+    watch = WatchFolder(INBOX, manager, polling=True, poll_interval=0.05, max_pending=5).start()
+    try:
+        _drop("long.txt", [f"https://youtu.be/{i:011d}" for i in range(50)])
+        assert _wait_for(lambda: watch.stats["urls"] == 5)
+        time.sleep(0.2)
+        assert watch.stats["urls"] == 5 and len(manager.unfinished_jobs()) == 5, watch.stats
+        manager.max_workers = 2
+        assert _wait_for(lambda: os.path.exists(os.path.join(INBOX, PROCESSED_DIR, "long.txt")))
+        assert watch.stats["urls"] == 50
+    finally:
+        watch.stop()
+        manager.shutdown()
+        shutil.rmtree(INBOX, ignore_errors=True)
+        shutil.rmtree("test_downloads", ignore_errors=True)
+    print("✓ Reading paused at max_pending")
+
+def test_stop_while_paused():
+    """Stopping wakes a paused reader and leaves its list in processing/."""
+    shutil.rmtree(INBOX, ignore_errors=True)
+    os.makedirs(INBOX)
+    manager = _manager()
+    manager.max_workers = 0
+    watch = WatchFolder(INBOX, manager, polling=True, poll_interval=0.05, max_pending=2).start()
+    try:
+        _drop("long.txt", [f"https://youtu.be/{i:011d}" for i in range(10)])
+        assert _wait_for(lambda: watch.stats["urls"] == 2)
+        watch.stop()
+        assert not watch._thread.is_alive()
+        assert os.listdir(os.path.join(INBOX, PROCESSING_DIR)) == ["long.txt"]
+    finally:
+        manager.shutdown(wait=False)
+        shutil.rmtree(INBOX, ignore_errors=True)
+        shutil.rmtree("test_downloads", ignore_errors=True)
+    print("✓ Paused reader stopped")
+
+def test_resumes_claimed_lists():
+    """Lists left in processing/ by a previous run are submitted again."""
+    shutil.rmtree(INBOX, ignore_errors=True)
+    os.makedirs(os.path.join(INBOX, PROCESSING_DIR))
+    with open(os.path.join(INBOX, PROCESSING_DIR, "left.txt"), "w") as f:
+        f.write("https://youtu.be/dQw4w9WgXcQ\n")
+    manager = _manager()
+    watch = WatchFolder(INBOX, manager).start()
+    try:
+        assert _wait_for(lambda: os.path.exists(os.path.join(INBOX, PROCESSED_DIR, "left.txt")))
+    finally:
+        watch.stop()
+        manager.shutdown()
+        shutil.rmtree(INBOX, ignore_errors=True)
+        shutil.rmtree("test_downloads", ignore_errors=True)
+    print("✓ Unfinished lists resumed")
+
+if __name__ == "__main__":
+    test_inotify()
+    test_polling_fallback()
+    test_inotify_close_is_idempotent()
+    test_reading_pauses_at_max_pending()
+    test_stop_while_paused()
+    test_resumes_claimed_lists()
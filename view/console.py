@@ -0,0 +1,210 @@
+# view/console.py
+import json
+import shutil
+import sys
+import threading
+
+MB = 1024 * 1024
+
+
+class JsonLinesRenderer:
+    """
+    Writes every CLI event as one compact JSON object per line, for
+    orchestrators that parse the output:
+        {"event":"progress","url":...,"bytes":n,"total":n,"speed":bps,"elapsed":s}
+        {"event":"result","url":...,"success":true,"message":...,"bytes":n,
+         "total":n,"duration":s,"speed":bps,"path":...,"error":null,"saved_bytes":null,
+         "digest":"sha256:..."}
+    """
+
+    def __init__(self, stream=None):
+        """
+        :param stream: Text stream receiving the lines, defaults to stdout.
+        """
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Nothing to start: every event is written as it arrives."""
+        return self
+
+    def handle(self, event):
+        """Writes one event. Safe to call from any thread."""
+        line = json.dumps(event, separators=(",", ":")) + "\n"
+        with self._lock:
+            self.stream.write(line)
+            self.stream.flush()
+
+    def log(self, message):
+        """Writes a status message to stderr, keeping the stream JSON only."""
+        print(message, file=sys.stderr, flush=True)
+
+    def close(self):
+        """Nothing is buffered."""
+
+
+class ConsoleRenderer:
+    """
+    Human-readable output rendered from the same events. Events only update
+    shared state; a timer redraws the screen every `refresh_interval` seconds,
+    so terminal I/O stays constant no matter how many events arrive.
+
+    On a terminal the redraw is a block with one bar per active download and an
+    aggregate throughput line, rewritten in place with ANSI cursor movement.
+    Elsewhere (pipes, log files) a single carriage-return progress line is used.
+    Results are printed above the block on the next redraw; status messages
+    go through log(), which prints them above the block right away.
+    """
+
+    BAR_WIDTH = 20
+
+    def __init__(self, stream=None, refresh_interval=0.125, multiline=None):
+        """
+        :param stream: Text stream to draw on, defaults to stdout.
+        :param refresh_interval: Seconds between redraws (0.125 = 8 fps).
+        :param multiline: Draw one line per download; defaults to whether the stream is a terminal.
+        """
+        self.stream = stream or sys.stdout
+        self.refresh_interval = refresh_interval
+        if multiline is None:
+            multiline = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self.multiline = multiline
+        self._progress = {} # URL -> [latest progress event, smoothed bytes/s]
+        self._pending = [] # Result and log lines not printed yet
+        self._succeeded = 0
+        self._failed = 0
+        self._dirty = False
+        self._line_open = False # Single-line mode: a progress line without a newline is on screen
+        self._line_width = 0
+        self._block_height = 0 # Multi-line mode: lines of the block drawn last time
+        self._lock = threading.Lock()
+        self._draw_lock = threading.Lock() # log() redraws from the caller's thread
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="console-renderer", daemon=True)
+
+    def start(self):
+        """Starts the redraw timer."""
+        self._thread.start()
+        return self
+
+    def handle(self, event):
+        """Records an event for the next redraw. Safe to call from any thread."""
+        with self._lock:
+            url = event["url"]
+            if event["event"] == "progress":
+                previous = self._progress.get(url)
+                rate = event.get("speed", 0)
+                if previous is not None:
+                    elapsed = event.get("elapsed", 0) - previous[0].get("elapsed", 0)
+                    if elapsed > 0:
+                        sample = max(0, event["bytes"] - previous[0]["bytes"]) / elapsed
+                        rate = 0.7 * previous[1] + 0.3 * sample
+                self._progress[url] = [event, rate]
+            else:
+                self._progress.pop(url, None)
+                self._pending.append(self._result_line(event))
+                if event["success"]:
+                    self._succeeded += 1
+                else:
+                    self._failed += 1
+            self._dirty = True
+
+    def log(self, message):
+        """
+        Prints a status message. Writing to the stream directly would land
+        inside the progress display, so the block is cleared, the message
+        printed and the block redrawn below it. Safe to call from any thread.
+        """
+        with self._lock:
+            self._pending.append(message)
+            self._dirty = True
+        self.render()
+
+    def close(self):
+        """Stops the timer and draws whatever is pending."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.render()
+        if self._line_open:
+            self.stream.write("\n")
+            self._line_open = False
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_interval):
+            self.render()
+
+    def render(self):
+        """Prints pending results and redraws the progress display."""
+        with self._draw_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                lines, self._pending = self._pending, []
+                running = [(entry[0], entry[1]) for entry in self._progress.values()]
+                counts = (self._succeeded, self._failed)
+                self._dirty = False
+            if self.multiline:
+                text = self._render_block(lines, running, counts)
+            else:
+                text = self._render_line(lines, running)
+            self.stream.write(text)
+            self.stream.flush()
+
+    def _render_line(self, lines, running):
+        out = []
+        if lines and self._line_open:
+            out.append("\n")
+            self._line_open = False
+        out.extend(line + "\n" for line in lines)
+        if running:
+            downloaded = sum(event["bytes"] for event, _ in running)
+            total = sum(event["total"] for event, _ in running)
+            percentage = downloaded / total * 100 if total else 0.0
+            prefix = f"{len(running)} downloads, " if len(running) > 1 else ""
+            line = f"Progress: {prefix}{percentage:.1f}% ({downloaded / MB:.1f}/{total / MB:.1f} MB)"
+            # Pad to overwrite the rest of a longer previous line
+            out.append("\r" + line.ljust(self._line_width))
+            self._line_width = len(line)
+            self._line_open = True
+        return "".join(out)
+
+    def _render_block(self, printed, running, counts):
+        columns, rows = shutil.get_terminal_size()
+        width = max(20, columns - 1) # Never wrap, or moving the cursor up would miss lines
+        out = []
+        if self._block_height:
+            # Back to the first line of the previous block, then clear it
+            out.append(f"\x1b[{self._block_height}F\x1b[J")
+        out.extend(line[:width] + "\n" for line in printed)
+
+        lines = []
+        if running:
+            shown = running[:max(1, rows - 3)]
+            lines.extend(self._job_line(event, rate, width) for event, rate in shown)
+            if len(running) > len(shown):
+                lines.append(f"  ... and {len(running) - len(shown)} more")
+            downloaded = sum(event["bytes"] for event, _ in running)
+            speed = sum(rate for _, rate in running)
+            succeeded, failed = counts
+            total_line = (f"Total: {len(running)} active, {downloaded / MB:.1f} MB, {speed / MB:.1f} MB/s"
+                          f" | {succeeded} done, {failed} failed")
+            lines.append(total_line[:width])
+        out.extend(line + "\n" for line in lines)
+        self._block_height = len(lines)
+        return "".join(out)
+
+    def _job_line(self, event, rate, width):
+        total = event["total"]
+        fraction = min(1.0, event["bytes"] / total) if total else 0.0
+        filled = int(fraction * self.BAR_WIDTH)
+        bar = "#" * filled + "-" * (self.BAR_WIDTH - filled)
+        stats = f" [{bar}] {fraction * 100:5.1f}% {event['bytes'] / MB:7.1f}/{total / MB:.1f} MB {rate / MB:5.1f} MB/s"
+        label_width = max(10, width - len(stats))
+        label = event["url"]
+        if len(label) > label_width:
+            label = "…" + label[-(label_width - 1):]
+        return (label.ljust(label_width) + stats)[:width]
+
+    def _result_line(self, event):
+        return f"{'✅' if event['success'] else '❌'} {event['message']}"
@@ -1,13 +1,10 @@
 # view/gui.py
 import tkinter as tk
 from tkinter import ttk
-from tkinter import filedialog, messagebox, scrolledtext
-from PIL import Image, ImageTk
-import requests
-from io import BytesIO
-import json
+from tkinter import filedialog, messagebox
 import os
-from datetime import datetime
+from view.job_panel import JobPanel
+from view.preview import PreviewPane
 
 class YouTubeDownloaderGUI:
     def __init__(self, root):
@@ -17,8 +14,8 @@ class YouTubeDownloaderGUI:
         """
         self.root = root
         self.root.title("YouTube Downloader")
-        self.root.geometry("600x300") # Increased size for better layout
-        self.root.resizable(False, False) # Prevent resizing for now
+        self.root.geometry("700x740") # Room for the preview and the download queue panel
+        self.root.minsize(600, 640)
 
         self.save_path = tk.StringVar() # To store the chosen save path
         self.save_path.set("downloads") # Default save path
@@ -40,9 +37,14 @@ class YouTubeDownloaderGUI:
         self.url_label = ttk.Label(url_frame, text="Enter YouTube Video URL:")
         self.url_label.pack(side=tk.LEFT, padx=5, pady=5)
 
-        self.url_entry = ttk.Entry(url_frame, width=50)
+        self.video_url = tk.StringVar()
+        self.url_entry = ttk.Entry(url_frame, width=50, textvariable=self.video_url)
         self.url_entry.pack(side=tk.LEFT, padx=5, pady=5, fill=tk.X, expand=True)
 
+        # Thumbnail, title and duration of the entered video
+        self.preview = PreviewPane(main_frame)
+        self.preview.pack(pady=5, fill=tk.X)
+
         # Save Path Section
         path_frame = ttk.LabelFrame(main_frame, text="Save Location", padding="10")
         path_frame.pack(pady=10, fill=tk.X)
@@ -53,11 +55,23 @@ class YouTubeDownloaderGUI:
         self.browse_button = ttk.Button(path_frame, text="Browse", command=self._select_save_path)
         self.browse_button.pack(side=tk.LEFT, padx=5, pady=5)
 
-        # Download Button
-        self.download_button = ttk.Button(main_frame, text="Download")
-        self.download_button.pack(pady=10)
+        # Download Button and parallel download limit
+        action_frame = ttk.Frame(main_frame)
+        action_frame.pack(pady=10)
+
+        self.download_button = ttk.Button(action_frame, text="Download")
+        self.download_button.pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(action_frame, text="Parallel downloads:").pack(side=tk.LEFT, padx=(20, 5))
+        self.max_parallel = tk.IntVar(value=3)
+        self.parallel_spinbox = ttk.Spinbox(action_frame, from_=1, to=16, width=4,
+                                            textvariable=self.max_parallel, state="readonly")
+        self.parallel_spinbox.pack(side=tk.LEFT)
 
-        # Progress Bar
+        self.history_button = ttk.Button(action_frame, text="History")
+        self.history_button.pack(side=tk.LEFT, padx=(20, 5))
+
+        # Progress Bar (overall progress of all running downloads)
         self.progress_bar = ttk.Progressbar(main_frame, orient="horizontal", length=400, mode="determinate")
         self.progress_bar.pack(pady=10)
 
@@ -65,6 +79,10 @@ class YouTubeDownloaderGUI:
         self.status_label = ttk.Label(main_frame, text="", foreground="blue", wraplength=550)
         self.status_label.pack(pady=5)
 
+        # Download queue: one row per job
+        self.job_panel = JobPanel(main_frame)
+        self.job_panel.pack(pady=5, fill=tk.BOTH, expand=True)
+
     def _select_save_path(self):
         """
         Opens a directory chooser dialog and sets the chosen path.
@@ -80,6 +98,13 @@ class YouTubeDownloaderGUI:
         """
         return self.url_entry.get()
 
+    def set_url_change_callback(self, callback):
+        """
+        Calls `callback` whenever the URL entry changes (typing or pasting).
+        :param callback: Function without arguments.
+        """
+        self.video_url.trace_add("write", lambda *args: callback())
+
     def get_save_path(self):
         """
         Retrieves the selected save path.
@@ -103,15 +128,41 @@ class YouTubeDownloaderGUI:
         """
         if total_bytes > 0:
             percentage = (current_bytes / total_bytes) * 100
-            self.progress_bar['value'] = percentage
-            self.root.update_idletasks() # Update GUI immediately
+            self.progress_bar['value'] = percentage # Redrawn by the main loop when idle
+
+    def update_job(self, job):
+        """
+        Adds or updates a job's row in the download queue panel.
+        :param job: Job dictionary as returned by Job.to_dict().
+        """
+        self.job_panel.update_job(job)
 
     def reset_progress(self):
         """
         Resets the progress bar to 0.
         """
         self.progress_bar['value'] = 0
-        self.root.update_idletasks()
+
+    def get_max_parallel(self):
+        """
+        Retrieves the selected number of parallel downloads.
+        :return: The limit as an int.
+        """
+        return self.max_parallel.get()
+
+    def set_parallel_callback(self, callback):
+        """
+        Calls `callback` whenever the parallel download limit changes.
+        :param callback: Function without arguments.
+        """
+        self.max_parallel.trace_add("write", lambda *args: callback())
+
+    def set_close_callback(self, callback):
+        """
+        Replaces the default window close behaviour.
+        :param callback: Called when the user closes the window; must destroy the root.
+        """
+        self.root.protocol("WM_DELETE_WINDOW", callback)
 
     def set_download_callback(self, callback):
         """
@@ -120,6 +171,13 @@ class YouTubeDownloaderGUI:
         """
         self.download_button.config(command=callback)
 
+    def set_history_callback(self, callback):
+        """
+        Connects the History button to a controller method.
+        :param callback: Function without arguments.
+        """
+        self.history_button.config(command=callback)
+
 
 
 
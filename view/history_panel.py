@@ -0,0 +1,148 @@
+# view/history_panel.py
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from view.job_panel import format_duration, format_speed
+
+
+def format_size(size):
+    """Formats a byte count for display, e.g. '12.3 MB'."""
+    if not size:
+        return ""
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+class HistoryWindow:
+    """
+    Window listing the download history, newest first.
+
+    Like the JobPanel it only holds `visible_rows` Treeview items, but the rows
+    are never all loaded: the window is the `visible_rows` rows from a top row
+    ID, fetched from the source with an indexed query on every scroll. Row IDs
+    grow by one per download, so the scrollbar maps its position to an ID and
+    jumps there directly, whether the history has a hundred rows or millions.
+    """
+
+    COLUMNS = (
+        ("finished", "Finished", 120),
+        ("video", "Video", 260),
+        ("state", "State", 75),
+        ("size", "Size", 70),
+        ("time", "Time", 55),
+        ("speed", "Speed", 75),
+        ("result", "Path / Error", 200),
+    )
+
+    def __init__(self, parent, source, visible_rows=20):
+        """
+        :param parent: Parent widget.
+        :param source: DownloadHistory (page, page_after and last_id are used).
+        :param visible_rows: Number of rows shown.
+        """
+        self.source = source
+        self.visible_rows = visible_rows
+        self.window = tk.Toplevel(parent)
+        self.window.title("Download History")
+        self.window.geometry("900x480")
+
+        controls = ttk.Frame(self.window, padding="5")
+        controls.pack(fill=tk.X)
+        self.failed_only = tk.BooleanVar(value=False)
+        ttk.Checkbutton(controls, text="Failed only", variable=self.failed_only,
+                        command=self.reload).pack(side=tk.LEFT)
+        ttk.Button(controls, text="Refresh", command=self.reload).pack(side=tk.LEFT, padx=10)
+        self.count_label = ttk.Label(controls, text="")
+        self.count_label.pack(side=tk.RIGHT)
+
+        body = ttk.Frame(self.window, padding="5")
+        body.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(body, columns=[name for name, _, _ in self.COLUMNS],
+                                 show="headings", height=visible_rows, selectmode="browse")
+        for name, heading, width in self.COLUMNS:
+            self.tree.heading(name, text=heading)
+            self.tree.column(name, width=width, stretch=(name in ("video", "result")))
+        self.scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        blank = ("",) * len(self.COLUMNS)
+        self._slots = [self.tree.insert("", "end", values=blank) for _ in range(visible_rows)]
+        self._rows = [] # Rows currently shown, newest first
+        self._last_id = 0
+
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self._on_mousewheel)
+        self.reload()
+
+    @property
+    def _state(self):
+        return "failed" if self.failed_only.get() else None
+
+    def reload(self):
+        """Shows the newest rows again, e.g. after new downloads finished."""
+        self._last_id = self.source.last_id()
+        self.count_label.config(text=f"~{self._last_id:,} downloads recorded")
+        self._show(self.source.page(limit=self.visible_rows, state=self._state))
+
+    def _show(self, rows, paging=False):
+        """
+        Fills the slots with `rows`.
+        :param paging: The rows come from scrolling; an empty page means it went
+                       past either end, so the current window stays. A reload
+                       always replaces it, even with nothing.
+        """
+        if paging and not rows and self._rows:
+            return
+        self._rows = rows
+        blank = ("",) * len(self.COLUMNS)
+        for index, slot in enumerate(self._slots):
+            self.tree.item(slot, values=self._format_row(rows[index]) if index < len(rows) else blank)
+        if self._rows and self._last_id > self.visible_rows:
+            top = (self._last_id - self._rows[0]["id"]) / self._last_id
+            self.scrollbar.set(top, min(1.0, top + self.visible_rows / self._last_id))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _format_row(self, row):
+        return (
+            time.strftime("%Y-%m-%d %H:%M", time.localtime(row["finished_at"])),
+            row["title"] or row["url"],
+            row["state"],
+            format_size(row["bytes"]),
+            format_duration(row["duration"]),
+            format_speed(row["speed"]),
+            row["path"] or row["error"] or "",
+        )
+
+    def _scroll(self, lines):
+        """Moves the window by `lines` rows (positive: older)."""
+        if not self._rows:
+            return
+        if lines > 0:
+            # Re-fetch from the row `lines` further down (or just past the bottom)
+            anchor = self._rows[min(lines, len(self._rows)) - 1]["id"]
+            self._show(self.source.page(before_id=anchor, limit=self.visible_rows, state=self._state), paging=True)
+        else:
+            newer = self.source.page_after(self._rows[0]["id"], limit=-lines, state=self._state)
+            if newer:
+                self._show(self.source.page(before_id=newer[0]["id"] + 1, limit=self.visible_rows,
+                                            state=self._state), paging=True)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            # IDs are dense, so a position maps straight to the top row's ID
+            top_id = self._last_id - int(float(amount) * self._last_id)
+            rows = self.source.page(before_id=max(top_id, self.visible_rows) + 1, limit=self.visible_rows,
+                                    state=self._state)
+            self._show(rows, paging=True)
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self._scroll(int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self._scroll(-3)
+        else:
+            self._scroll(3)
+        return "break"
@@ -0,0 +1,139 @@
+# view/job_panel.py
+import tkinter as tk
+from tkinter import ttk
+
+
+def format_speed(bytes_per_second):
+    """Formats a transfer rate for display, e.g. '1.4 MB/s'."""
+    if not bytes_per_second:
+        return ""
+    for unit in ("B/s", "KB/s", "MB/s"):
+        if bytes_per_second < 1024:
+            return f"{bytes_per_second:.0f} {unit}" if unit == "B/s" else f"{bytes_per_second:.1f} {unit}"
+        bytes_per_second /= 1024
+    return f"{bytes_per_second:.1f} GB/s"
+
+
+def format_duration(seconds):
+    """Formats a number of seconds (ETA, video length) as m:ss or h:mm:ss."""
+    if seconds is None:
+        return ""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+class JobPanel:
+    """
+    Download queue panel: one row per job with state, progress, speed and ETA.
+
+    The Treeview is virtualized: it only ever holds `visible_rows` items, which
+    are re-filled from the job list when scrolling. Updates only touch the
+    model; one refresh per idle cycle redraws the visible rows that changed, so
+    10k queued jobs cost no more to render than a dozen.
+    """
+
+    COLUMNS = (
+        ("video", "Video", 280),
+        ("state", "State", 80),
+        ("progress", "Progress", 70),
+        ("speed", "Speed", 80),
+        ("eta", "ETA", 60),
+    )
+
+    def __init__(self, parent, visible_rows=10):
+        """
+        :param parent: Parent widget.
+        :param visible_rows: Number of rows shown (and Treeview items created).
+        """
+        self.frame = ttk.LabelFrame(parent, text="Downloads", padding="5")
+        self.visible_rows = visible_rows
+
+        self.tree = ttk.Treeview(self.frame, columns=[name for name, _, _ in self.COLUMNS],
+                                 show="headings", height=visible_rows, selectmode="none")
+        for name, heading, width in self.COLUMNS:
+            self.tree.heading(name, text=heading)
+            self.tree.column(name, width=width, stretch=(name == "video"))
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        blank = ("",) * len(self.COLUMNS)
+        self._slots = [self.tree.insert("", "end", values=blank) for _ in range(visible_rows)]
+        self._shown = [blank] * visible_rows # Values currently in each slot, to skip no-op redraws
+        self._order = [] # Job IDs in display order
+        self._rows = {} # Job ID -> row values
+        self._offset = 0
+        self._refresh_pending = False
+
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self._on_mousewheel)
+        self._refresh()
+
+    def pack(self, **kwargs):
+        """Packs the panel's frame."""
+        self.frame.pack(**kwargs)
+
+    def update_job(self, job):
+        """
+        Adds or updates a row. Cheap: the redraw happens once per idle cycle.
+        :param job: Job dictionary as returned by Job.to_dict().
+        """
+        if job["id"] not in self._rows:
+            self._order.append(job["id"])
+        self._rows[job["id"]] = self._format_row(job)
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.tree.after_idle(self._refresh)
+
+    def _format_row(self, job):
+        progress = ""
+        if job["total_bytes"]:
+            progress = f"{job['bytes_downloaded'] / job['total_bytes'] * 100:.1f}%"
+        running = job["state"] == "running"
+        return (
+            job.get("title") or job["url"],
+            job["state"],
+            progress,
+            format_speed(job["speed"]) if running else "",
+            format_duration(job["eta"]) if running else "",
+        )
+
+    def _max_offset(self):
+        return max(0, len(self._order) - self.visible_rows)
+
+    def _scroll_to(self, offset):
+        offset = max(0, min(int(offset), self._max_offset()))
+        if offset != self._offset:
+            self._offset = offset
+            self._refresh()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(float(amount) * len(self._order))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self._scroll_to(self._offset + int(amount) * step)
+
+    def _on_mousewheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self._scroll_to(self._offset - 3)
+        else:
+            self._scroll_to(self._offset + 3)
+        return "break"
+
+    def _refresh(self):
+        """Writes the visible window of the job list into the Treeview slots."""
+        self._refresh_pending = False
+        blank = ("",) * len(self.COLUMNS)
+        for index, slot in enumerate(self._slots):
+            position = self._offset + index
+            values = self._rows[self._order[position]] if position < len(self._order) else blank
+            if values != self._shown[index]:
+                self.tree.item(slot, values=values)
+                self._shown[index] = values
+        total = len(self._order)
+        if total > self.visible_rows:
+            self.scrollbar.set(self._offset / total, (self._offset + self.visible_rows) / total)
+        else:
+            self.scrollbar.set(0, 1)
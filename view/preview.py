@@ -0,0 +1,69 @@
+# view/preview.py
+import tkinter as tk
+from tkinter import ttk
+
+from view.job_panel import format_duration
+from view.thumbnail_cache import THUMBNAIL_SIZE
+
+
+class PreviewPane:
+    """
+    Shows thumbnail, title and duration of the pasted video. All data is
+    loaded by the controller off the Tk thread; these methods only draw.
+    """
+
+    def __init__(self, parent):
+        """
+        :param parent: Parent widget.
+        """
+        self.frame = ttk.LabelFrame(parent, text="Preview", padding="5")
+
+        # Fixed-size placeholder so the layout doesn't jump when the image arrives
+        # (width/height are in pixels only while the label shows an image)
+        self._placeholder = tk.PhotoImage(width=1, height=1)
+        self.image_label = tk.Label(self.frame, width=THUMBNAIL_SIZE[0], height=THUMBNAIL_SIZE[1],
+                                    background="#ddd", image=self._placeholder)
+        self.image_label.pack(side=tk.LEFT, padx=5)
+
+        text_frame = ttk.Frame(self.frame)
+        text_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
+        self.title_label = ttk.Label(text_frame, text="", wraplength=420, font=("TkDefaultFont", 10, "bold"))
+        self.title_label.pack(anchor=tk.W)
+        self.details_label = ttk.Label(text_frame, text="", foreground="grey")
+        self.details_label.pack(anchor=tk.W)
+
+    def pack(self, **kwargs):
+        """Packs the pane's frame."""
+        self.frame.pack(**kwargs)
+
+    def show_loading(self):
+        """Clears the pane and shows a loading hint."""
+        self.clear()
+        self.details_label.config(text="Loading preview...")
+
+    def show_info(self, title, duration=None, uploader=None):
+        """
+        Shows the video's title and details.
+        :param duration: Length in seconds.
+        """
+        self.title_label.config(text=title)
+        details = [part for part in (uploader, format_duration(duration) if duration else None) if part]
+        self.details_label.config(text="  •  ".join(details))
+
+    def show_error(self, message):
+        """Shows why the preview could not be loaded."""
+        self.clear()
+        self.details_label.config(text=message)
+
+    def show_image(self, photo):
+        """
+        Shows the thumbnail.
+        :param photo: A PhotoImage; the caller must keep a reference (the cache does).
+        """
+        self.image_label.config(image=photo)
+
+    def clear(self):
+        """Removes title, details and thumbnail."""
+        self.image_label.config(image=self._placeholder)
+        self.title_label.config(text="")
+        self.details_label.config(text="")
@@ -0,0 +1,64 @@
+# view/progress_poller.py
+import queue
+
+
+class ProgressPoller:
+    """
+    Collects UI updates from download threads and applies them on the Tk main
+    loop at a fixed rate. Instead of scheduling one `root.after(0, ...)` per
+    progress event, threads push into a queue and every `interval_ms` the Tk
+    thread drains it, keeping only the latest update per key (e.g. per job),
+    so the event queue never grows with the download speed.
+    """
+
+    def __init__(self, root, interval_ms=50):
+        """
+        :param root: Tk root (anything with `after` and `after_cancel`).
+        :param interval_ms: Drain period in milliseconds.
+        """
+        self.root = root
+        self.interval_ms = interval_ms
+        self._queue = queue.SimpleQueue()
+        self._after_id = None
+
+    def push(self, key, callback, *args):
+        """
+        Schedules `callback(*args)` on the Tk thread. Safe to call from any thread.
+        A later push with the same key replaces an update not applied yet.
+        """
+        self._queue.put((key, callback, args))
+
+    def start(self):
+        """Starts draining on the Tk main loop. Call from the Tk thread."""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._drain)
+
+    def stop(self):
+        """Stops draining; pending updates are dropped."""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def drain(self):
+        """
+        Applies all pending updates now, collapsed to the latest per key.
+        :return: Number of updates applied.
+        """
+        latest = {}
+        while True:
+            try:
+                key, callback, args = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            latest.pop(key, None) # Re-insert so updates keep their arrival order
+            latest[key] = (callback, args)
+        for callback, args in latest.values():
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"UI update failed: {e}")
+        return len(latest)
+
+    def _drain(self):
+        self.drain()
+        self._after_id = self.root.after(self.interval_ms, self._drain)
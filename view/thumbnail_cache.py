@@ -0,0 +1,120 @@
+# view/thumbnail_cache.py
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+THUMBNAIL_SIZE = (160, 90)
+JPEG_QUALITY = 85
+
+
+class ThumbnailCache:
+    """
+    Two-level thumbnail cache for the preview pane:
+    - memory: LRU of decoded PhotoImages (Tk thread only),
+    - disk: size-capped directory of resized JPEGs, evicting least recently used.
+    PIL and requests are imported on first use so they don't slow down start-up.
+    """
+
+    def __init__(self, directory, max_disk_bytes=50 * 1024 * 1024, max_photos=64):
+        """
+        :param directory: Directory for the resized JPEGs.
+        :param max_disk_bytes: Size cap of the disk cache.
+        :param max_photos: Number of decoded PhotoImages kept in memory.
+        """
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.max_photos = max_photos
+        self._photos = OrderedDict()
+        self._disk_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._disk_usage = sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+
+    def get_photo(self, key):
+        """
+        Looks up a decoded PhotoImage in memory. Call from the Tk thread.
+        :return: The PhotoImage, or None.
+        """
+        photo = self._photos.get(key)
+        if photo is not None:
+            self._photos.move_to_end(key)
+        return photo
+
+    def put_photo(self, key, image):
+        """
+        Converts a PIL image into a PhotoImage and keeps it in memory. Call from the Tk thread.
+        :return: The PhotoImage.
+        """
+        from PIL import ImageTk
+
+        photo = ImageTk.PhotoImage(image)
+        self._photos[key] = photo
+        self._photos.move_to_end(key)
+        while len(self._photos) > self.max_photos:
+            self._photos.popitem(last=False)
+        return photo
+
+    def load_image(self, key, url):
+        """
+        Returns the resized thumbnail as a decoded PIL image, from disk if cached
+        or downloaded and resized otherwise. Call from a worker thread.
+        :param key: Cache key, e.g. the video ID.
+        :param url: Thumbnail URL used on a cache miss.
+        """
+        from PIL import Image
+
+        data = self._read_disk(key)
+        if data is None:
+            import requests
+
+            response = requests.get(url, timeout=10)
+            response.raise_for_status()
+            image = Image.open(BytesIO(response.content))
+            image.thumbnail(THUMBNAIL_SIZE)
+            buffer = BytesIO()
+            image.convert("RGB").save(buffer, format="JPEG", quality=JPEG_QUALITY)
+            data = buffer.getvalue()
+            self._write_disk(key, data)
+        image = Image.open(BytesIO(data))
+        image.load() # Decode here, not on the Tk thread
+        return image
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.jpg")
+
+    def _read_disk(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        os.utime(path) # Mark as recently used for eviction
+        return data
+
+    def _write_disk(self, key, data):
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        with self._disk_lock:
+            if os.path.exists(path):
+                self._disk_usage -= os.path.getsize(path)
+            os.replace(tmp_path, path)
+            self._disk_usage += len(data)
+            if self._disk_usage > self.max_disk_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Removes least recently used files until the cache is under 90% of its cap."""
+        entries = sorted((entry for entry in os.scandir(self.directory) if entry.name.endswith(".jpg")),
+                         key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            if self._disk_usage <= self.max_disk_bytes * 0.9:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                self._disk_usage -= size
+            except OSError:
+                pass
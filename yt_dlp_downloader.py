@@ -6,7 +6,6 @@ yt-dlp is generally more reliable and up-to-date.
 
 import sys
 import os
-import yt_dlp
 from pathlib import Path
 
 class YtDlpDownloader:
@@ -32,6 +31,8 @@ class YtDlpDownloader:
     
     def download_video(self, url):
         """Download video using yt-dlp."""
+        import yt_dlp # Imported on first use so usage errors print instantly
+
         try:
             # Configure yt-dlp options
             ydl_opts = {